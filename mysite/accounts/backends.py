@@ -0,0 +1,76 @@
+from functools import partial
+
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend, UserModel
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+# 로그인한 사용자 정보 캐시 시간 (요청마다 auth_user를 조회하지 않음)
+USER_CACHE_TIMEOUT = getattr(settings, 'ACCOUNTS_USER_CACHE_TIMEOUT', 60 * 15)
+# 캐시에 저장하지 않는 필드 (공유 캐시에 비밀번호 해시를 두지 않음, 필요하면 데이터베이스에서 지연 로딩)
+UNCACHED_FIELDS = {'password'}
+
+
+def user_cache_key(user_id):
+    return f'accounts:user:{user_id}'
+
+
+# 사용자 정보가 바뀌면 캐시 삭제 (트랜잭션 안이면 커밋 후에도 한 번 더 삭제해서 이전 값이 다시 캐시되지 않게 함)
+def invalidate_user(user_id):
+    key = user_cache_key(user_id)
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+# 캐시에 저장할 값: 비밀번호를 뺀 필드 값과 세션 검증 값 (비밀번호 해시의 HMAC, SECRET_KEY 없이는 쓸 수 없음)
+def dump_user(user):
+    fields = {
+        field.attname: getattr(user, field.attname)
+        for field in user._meta.concrete_fields if field.attname not in UNCACHED_FIELDS
+    }
+    return {'fields': fields, 'session_auth_hashes': [user.get_session_auth_hash(), *user.get_session_auth_fallback_hash()]}
+
+
+# 캐시 값으로 사용자 복원 (비밀번호는 처음 읽을 때 데이터베이스에서 가져옴)
+# 세션 검증은 캐시한 값으로 하고, 세션 값과 다르면 캐시를 지워서 이후 요청은 데이터베이스에서 다시 읽음
+def load_user(data):
+    fields = data['fields']
+    user = UserModel.from_db(DEFAULT_DB_ALIAS, list(fields), list(fields.values()))
+    session_auth_hash, *fallback_hashes = data['session_auth_hashes']
+    user.get_session_auth_hash = lambda: session_auth_hash
+    user.get_session_auth_fallback_hash = partial(session_hash_mismatch, user.pk, fallback_hashes)
+    return user
+
+
+# 세션 값이 현재 SECRET_KEY로 만든 값과 다를 때 호출됨 (비밀번호가 바뀌었거나 캐시가 오래됨)
+def session_hash_mismatch(user_id, fallback_hashes):
+    cache.delete(user_cache_key(user_id))
+    yield from fallback_hashes
+
+
+# 요청마다 세션의 사용자 id로 사용자를 조회하는 부분(get_user)만 캐시하는 ModelBackend
+# 로그인(authenticate)과 권한 조회는 그대로 데이터베이스 사용
+class CachedModelBackend(ModelBackend):
+    def get_user(self, user_id):
+        key = user_cache_key(user_id)
+        data = cache.get(key)
+        if data is None:
+            user = super().get_user(user_id)
+            if user is None:
+                return None
+            cache.set(key, dump_user(user), USER_CACHE_TIMEOUT)
+        else:
+            user = load_user(data)
+        return user if self.user_can_authenticate(user) else None
+
+    async def aget_user(self, user_id):
+        key = user_cache_key(user_id)
+        data = await cache.aget(key)
+        if data is None:
+            user = await super().aget_user(user_id)
+            if user is None:
+                return None
+            await cache.aset(key, dump_user(user), USER_CACHE_TIMEOUT)
+        else:
+            user = load_user(data)
+        return user if self.user_can_authenticate(user) else None
@@ -0,0 +1,33 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.checks import Error, Tags, register
+
+# 세션/사용자 캐시는 로그아웃, 비밀번호 변경, 탈퇴 때 캐시를 삭제해서 무효화하므로
+# 프로세스마다 따로 있는 캐시(locmem)에서는 다른 작업자 프로세스가 이전 세션과 사용자를 계속 사용함
+CACHED_SESSION_ENGINES = {
+    'django.contrib.sessions.backends.cache',
+    'django.contrib.sessions.backends.cached_db',
+}
+
+
+def is_process_local(alias):
+    return isinstance(caches[alias], LocMemCache)
+
+
+@register(Tags.security)
+def check_shared_cache(app_configs, **kwargs):
+    errors = []
+    if settings.SESSION_ENGINE in CACHED_SESSION_ENGINES and is_process_local(getattr(settings, 'SESSION_CACHE_ALIAS', 'default')):
+        errors.append(Error(
+            f'{settings.SESSION_ENGINE} 세션은 공유 캐시(Redis, Memcached)가 필요합니다.',
+            hint='DJANGO_CACHE_BACKEND를 redis 또는 memcached로 지정하거나 SESSION_ENGINE을 db로 바꾸세요.',
+            id='accounts.E001',
+        ))
+    if 'accounts.backends.CachedModelBackend' in settings.AUTHENTICATION_BACKENDS and is_process_local('default'):
+        errors.append(Error(
+            'CachedModelBackend는 공유 캐시(Redis, Memcached)가 필요합니다.',
+            hint='DJANGO_CACHE_BACKEND를 redis 또는 memcached로 지정하거나 ModelBackend를 사용하세요.',
+            id='accounts.E002',
+        ))
+    return errors
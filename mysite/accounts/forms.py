@@ -1,9 +1,10 @@
-import re
 from django import forms
 from django.contrib.auth.models import User
 
+from . import validation
+
 # 회원가입 폼
-class RegisterForm(forms.ModelForm):
+class RegisterForm(validation.UniqueUserFieldsMixin, forms.ModelForm):
     username = forms.CharField(required=False)
     password1 = forms.CharField(required=False)
     password2 = forms.CharField(required=False)
@@ -21,29 +22,11 @@ class RegisterForm(forms.ModelForm):
         if len(username) < 6:
             raise forms.ValidationError("아이디는 최소 6글자 이상 입력해주세요.")
         if len(username) > 20:
-            raise forms.ValidationError("아이디는 최대 20글자 이하로 입력해주세요.")        
-        if User.objects.filter(username=username).exists():
-            raise forms.ValidationError("이미 사용중인 아이디입니다.")
+            raise forms.ValidationError("아이디는 최대 20글자 이하로 입력해주세요.")
         return username
 
     def clean_password1(self):
-        password1 = self.cleaned_data.get("password1")
-        if not password1:
-            raise forms.ValidationError("비밀번호를 입력해주세요.")
-        if len(password1) < 8:
-            raise forms.ValidationError("비밀번호는 최소 8글자 이상 입력해주세요.")
-        
-        # 비밀번호 복잡성 검증
-        if not any(char.isdigit() for char in password1):
-            raise forms.ValidationError("비밀번호는 최소 1개의 숫자를 포함해야 합니다.")
-        if not any(char.isupper() for char in password1):
-            raise forms.ValidationError("비밀번호는 최소 1개의 대문자를 포함해야 합니다.")
-        if not any(char.islower() for char in password1):
-            raise forms.ValidationError("비밀번호는 최소 1개의 소문자를 포함해야 합니다.")
-        if not any(char in "!@#$%^&*()_+-=[]{}|;:,.<>?" for char in password1):
-            raise forms.ValidationError("비밀번호는 최소 1개의 특수문자를 포함해야 합니다.")
-        
-        return password1
+        return validation.validate_password(self.cleaned_data.get("password1"))
 
     def clean_password2(self):
         password1 = self.cleaned_data.get("password1")
@@ -65,16 +48,7 @@ class RegisterForm(forms.ModelForm):
         return first_name 
 
     def clean_email(self):
-        email = self.cleaned_data.get("email")
-        if not email:
-            raise forms.ValidationError("이메일을 입력해주세요.")
-        if User.objects.filter(email=email).exists():
-            raise forms.ValidationError("이미 사용중인 이메일입니다.")
-        if len(email) > 50:
-            raise forms.ValidationError("이메일은 최대 50글자 이하로 입력해주세요.")
-        if not re.match(r'^[a-zA-Z0-9+-_.]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$', email):
-            raise forms.ValidationError("이메일 형식이 올바르지 않습니다.")
-        return email
+        return validation.validate_email(self.cleaned_data.get("email"))
 
 # 로그인 폼
 class LoginForm(forms.Form):
@@ -98,7 +72,7 @@ class LoginForm(forms.Form):
         return password
 
 # 프로필 수정 폼
-class UpdateProfileForm(forms.ModelForm):
+class UpdateProfileForm(validation.UniqueUserFieldsMixin, forms.ModelForm):
     first_name = forms.CharField(required=False)
     email = forms.EmailField(required=False)
     
@@ -117,17 +91,7 @@ class UpdateProfileForm(forms.ModelForm):
         return first_name 
 
     def clean_email(self):
-        email = self.cleaned_data.get("email")
-        if not email:
-            raise forms.ValidationError("이메일을 입력해주세요.")
-        print(self.instance.id)
-        if User.objects.filter(email=email).exclude(id=self.instance.id).exists():
-            raise forms.ValidationError("이미 사용중인 이메일입니다.")
-        if len(email) > 50:
-            raise forms.ValidationError("이메일은 최대 50글자 이하로 입력해주세요.")
-        if not re.match(r'^[a-zA-Z0-9+-_.]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$', email):
-            raise forms.ValidationError("이메일 형식이 올바르지 않습니다.")
-        return email
+        return validation.validate_email(self.cleaned_data.get("email"))
     
 # 비밀번호 수정 폼
 class UpdatePasswordForm(forms.Form):
@@ -146,23 +110,7 @@ class UpdatePasswordForm(forms.Form):
         return password
 
     def clean_password1(self):
-        password1 = self.cleaned_data.get("password1")
-        if not password1:
-            raise forms.ValidationError("비밀번호를 입력해주세요.")
-        if len(password1) < 8:
-            raise forms.ValidationError("비밀번호는 최소 8글자 이상 입력해주세요.")
-        
-        # 비밀번호 복잡성 검증
-        if not any(char.isdigit() for char in password1):
-            raise forms.ValidationError("비밀번호는 최소 1개의 숫자를 포함해야 합니다.")
-        if not any(char.isupper() for char in password1):
-            raise forms.ValidationError("비밀번호는 최소 1개의 대문자를 포함해야 합니다.")
-        if not any(char.islower() for char in password1):
-            raise forms.ValidationError("비밀번호는 최소 1개의 소문자를 포함해야 합니다.")
-        if not any(char in "!@#$%^&*()_+-=[]{}|;:,.<>?" for char in password1):
-            raise forms.ValidationError("비밀번호는 최소 1개의 특수문자를 포함해야 합니다.")
-        
-        return password1
+        return validation.validate_password(self.cleaned_data.get("password1"))
 
     def clean_password2(self):
         password1 = self.cleaned_data.get("password1")
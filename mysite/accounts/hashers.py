@@ -0,0 +1,18 @@
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, ScryptPasswordHasher
+
+# 비밀번호 해시 비용 설정 (설정을 바꾸면 다음 로그인 때 새 비용으로 다시 저장됨)
+# 비용을 낮추면 로그인 처리량이 늘고, 높이면 유출된 해시를 풀기 어려워짐
+PBKDF2_ITERATIONS = getattr(settings, 'ACCOUNTS_PBKDF2_ITERATIONS', None)
+SCRYPT_WORK_FACTOR = getattr(settings, 'ACCOUNTS_SCRYPT_WORK_FACTOR', None)
+
+
+# 반복 횟수를 설정할 수 있는 PBKDF2 (알고리즘 이름이 같으므로 기존 해시도 그대로 확인)
+# 저장된 반복 횟수가 설정과 다르면 must_update가 True가 되어 로그인 성공 시 다시 해시
+class ConfigurablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    iterations = PBKDF2_ITERATIONS or PBKDF2PasswordHasher.iterations
+
+
+# 작업량(N)을 설정할 수 있는 scrypt
+class ConfigurableScryptPasswordHasher(ScryptPasswordHasher):
+    work_factor = SCRYPT_WORK_FACTOR or ScryptPasswordHasher.work_factor
@@ -0,0 +1,94 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.contrib.auth.hashers import get_hasher
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.hashers import ConfigurablePBKDF2PasswordHasher, ConfigurableScryptPasswordHasher
+from posts import benchmarks
+
+# 해시 방식 → (해시 클래스, 비용 속성, 기본으로 측정할 비용)
+HASHERS = {
+    'pbkdf2': (ConfigurablePBKDF2PasswordHasher, 'iterations', [100_000, 300_000, 600_000, 1_000_000]),
+    'scrypt': (ConfigurableScryptPasswordHasher, 'work_factor', [2 ** 13, 2 ** 14, 2 ** 15]),
+}
+
+
+def make_hasher(algorithm, cost):
+    hasher_class, attribute, _ = HASHERS[algorithm]
+    hasher = hasher_class()
+    setattr(hasher, attribute, cost)
+    return hasher
+
+
+# 정해진 시간 동안 비밀번호 확인 반복 (작업자 프로세스에서도 실행하므로 모듈 함수)
+def verify_loop(algorithm, cost, encoded, password, duration):
+    hasher = make_hasher(algorithm, cost)
+    count = 0
+    started = time.perf_counter()
+    while True:
+        hasher.verify(password, encoded)
+        count += 1
+        elapsed = time.perf_counter() - started
+        if elapsed >= duration:
+            return count, elapsed
+
+
+# 로그인 처리량의 대부분을 차지하는 비밀번호 해시 확인 속도를 비용별로 측정 (단일 프로세스, 코어 수만큼 병렬)
+class Command(BaseCommand):
+    help = '비밀번호 해시 비용별로 코어당 초당 로그인(비밀번호 확인) 수를 측정합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hasher', choices=sorted(HASHERS), default='pbkdf2', help='해시 방식')
+        parser.add_argument('--costs', type=int, nargs='+', metavar='COST', help='측정할 비용 (PBKDF2 반복 횟수, scrypt N)')
+        parser.add_argument('--duration', type=float, default=3, help='비용별 측정 시간 (초)')
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='병렬 측정 프로세스 수 (0이면 병렬 측정 안 함)')
+        parser.add_argument('--output', help='결과를 저장할 JSON 파일')
+
+    def handle(self, *args, **options):
+        algorithm = options['hasher']
+        hasher_class, attribute, default_costs = HASHERS[algorithm]
+        costs = options['costs'] or default_costs
+        if any(cost <= 0 for cost in costs):
+            raise CommandError('비용은 1 이상이어야 합니다.')
+        current = get_hasher()
+        current_cost = getattr(current, attribute, None) if isinstance(current, hasher_class) else None
+
+        results = {}
+        for cost in costs:
+            hasher = make_hasher(algorithm, cost)
+            encoded = hasher.encode(benchmarks.DEFAULT_PASSWORD, hasher.salt())
+            args = (algorithm, cost, encoded, benchmarks.DEFAULT_PASSWORD, options['duration'])
+            count, elapsed = verify_loop(*args)
+            result = {
+                'cost': cost,
+                'verify_ms': elapsed / count * 1000,
+                'logins_per_sec': count / elapsed,
+            }
+            if options['workers'] > 0:
+                with ProcessPoolExecutor(options['workers']) as executor:
+                    counts = list(executor.map(verify_loop, *zip(*[args] * options['workers'])))
+                total = sum(count / elapsed for count, elapsed in counts)
+                result.update({
+                    'workers': options['workers'],
+                    'parallel_logins_per_sec': total,
+                    'per_core_logins_per_sec': total / options['workers'],
+                })
+            results[f'{algorithm}_{cost}'] = result
+
+        if options['output']:
+            recorded = {'hasher': algorithm, 'costs': costs, 'duration': options['duration'], 'workers': options['workers']}
+            benchmarks.save_results(options['output'], 'bench_login', recorded, results)
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f'== {algorithm} ({attribute}), 현재 설정: {current.algorithm}' + (f' {current_cost}' if current_cost else '')))
+        for name, result in results.items():
+            line = f'{name:<18} 확인 {result["verify_ms"]:8.1f}ms  단일 {result["logins_per_sec"]:8.1f}건/초'
+            if 'workers' in result:
+                line += (
+                    f'  병렬({result["workers"]}) {result["parallel_logins_per_sec"]:8.1f}건/초'
+                    f'  코어당 {result["per_core_logins_per_sec"]:8.1f}건/초'
+                )
+            self.stdout.write(line + ('  ← 현재 설정' if result['cost'] == current_cost else ''))
+        if options['output']:
+            self.stdout.write(self.style.SUCCESS(f'결과를 {options["output"]}에 저장했습니다.'))
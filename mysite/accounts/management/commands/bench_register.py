@@ -0,0 +1,127 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+
+from accounts.forms import RegisterForm
+from posts import benchmarks
+
+PASSWORD = 'Bench-passw0rd!'
+
+
+# 회원가입 벤치마크 (가입이 몰릴 때): 기존 사용자가 많은 임시 데이터베이스에서 폼 검증과 가입 요청을 반복
+# bench_views와 같이 별도 프로세스에서 실행하고 결과를 JSON으로 저장해서 커밋별로 비교
+class Command(BaseCommand):
+    help = '기존 사용자가 많은 상태에서 회원가입 검증과 가입 처리 속도를 측정하고 결과를 JSON으로 저장합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10000, help='미리 만들 사용자 수')
+        parser.add_argument('--registrations', type=int, default=500, help='측정할 가입 요청 수')
+        parser.add_argument('--pbkdf2-iterations', type=int, help='측정 중 PBKDF2 반복 횟수 (낮추면 해시 계산을 빼고 검증/저장 비용만 볼 수 있음)')
+        parser.add_argument('--seed', type=int, default=0, help='데이터 생성 시드')
+        parser.add_argument('--output', help='결과를 저장할 JSON 파일')
+        parser.add_argument('--compare', metavar='JSON', help='이전 결과 파일과 비교')
+        parser.add_argument('--child', action='store_true', help='(내부용) 현재 데이터베이스로 측정')
+
+    def handle(self, *args, **options):
+        if options['child']:
+            self.stdout.write(json.dumps(self.measure(options)))
+            return
+
+        results = self.run_child(options)
+        if options['output']:
+            recorded = {key: options[key] for key in ('users', 'registrations', 'pbkdf2_iterations', 'seed')}
+            benchmarks.save_results(options['output'], 'bench_register', recorded, results)
+
+        for name, result in results.items():
+            self.stdout.write(
+                f'{name:<16} p50 {result["p50_ms"]:8.2f}ms  p95 {result["p95_ms"]:8.2f}ms  '
+                f'{result["requests_per_sec"]:8.1f}건/초  쿼리 {result["queries"]:3}개  오류 {result["errors"]}건'
+            )
+        if options['compare']:
+            previous = benchmarks.load_results(options['compare'])
+            self.stdout.write(self.style.MIGRATE_HEADING(f'== {previous.get("revision") or "이전 결과"} 대비'))
+            for name, before, after, changes in benchmarks.compare(previous['results'], results):
+                if changes['p50_ms'] is not None:
+                    self.stdout.write(f'{name:<16} p50 {before["p50_ms"]:8.2f}ms → {after["p50_ms"]:8.2f}ms  ({changes["p50_ms"]:+.1f}%)')
+        if options['output']:
+            self.stdout.write(self.style.SUCCESS(f'결과를 {options["output"]}에 저장했습니다.'))
+
+    def run_child(self, options):
+        manage_py = str(settings.BASE_DIR / 'manage.py')
+        with tempfile.TemporaryDirectory() as tmp:
+            env = dict(os.environ, DJANGO_DB_NAME=os.path.join(tmp, 'bench.sqlite3'))
+            if options['pbkdf2_iterations']:
+                env['DJANGO_PBKDF2_ITERATIONS'] = str(options['pbkdf2_iterations'])
+            subprocess.run([sys.executable, manage_py, 'migrate', '--verbosity', '0'], env=env, check=True)
+            command = [
+                sys.executable, manage_py, 'bench_register', '--child',
+                '--users', str(options['users']), '--registrations', str(options['registrations']),
+                '--seed', str(options['seed']),
+            ]
+            completed = subprocess.run(command, env=env, check=True, capture_output=True, text=True)
+
+        try:
+            return json.loads(completed.stdout.strip().splitlines()[-1])
+        except (IndexError, ValueError) as e:
+            raise CommandError(f'측정 결과를 읽지 못했습니다: {completed.stdout}{completed.stderr}') from e
+
+    def measure(self, options):
+        benchmarks.generate(users=options['users'], posts=0, seed=options['seed'])
+        count = options['registrations']
+        client = Client(HTTP_HOST=self.host())
+
+        # 새 사용자 (아이디 6~20글자, 이름 2~4글자)
+        def new_user(prefix, index):
+            return {
+                'username': f'{prefix}{index:06}', 'password1': PASSWORD, 'password2': PASSWORD,
+                'first_name': '가입자', 'email': f'{prefix}{index:06}@example.com',
+            }
+
+        # 이미 있는 아이디/이메일 (bench_seed와 같은 규칙)
+        def taken_user(index):
+            number = index % options['users'] + 1
+            return {
+                'username': f'{benchmarks.USERNAME_PREFIX}{number}', 'password1': PASSWORD, 'password2': PASSWORD,
+                'first_name': '가입자', 'email': f'{benchmarks.USERNAME_PREFIX}{number}@example.com',
+            }
+
+        return {
+            'validate_new': self.run(lambda index: RegisterForm(new_user('valid', index)).is_valid(), count),
+            'validate_taken': self.run(lambda index: not RegisterForm(taken_user(index)).is_valid(), count),
+            'register': self.run(lambda index: self.is_redirect(client.post('/auth/register/', new_user('signup', index))), count),
+            'register_taken': self.run(lambda index: not self.is_redirect(client.post('/auth/register/', taken_user(index))), count),
+        }
+
+    def is_redirect(self, response):
+        return response.status_code == 302
+
+    def host(self):
+        hosts = [host for host in settings.ALLOWED_HOSTS if host != '*' and not host.startswith('.')]
+        return hosts[0] if hosts else 'localhost'
+
+    # request(index)가 기대한 결과면 True
+    def run(self, request, iterations):
+        queries = []
+
+        def count(execute, sql, params, many, context):
+            queries[-1] += 1
+            return execute(sql, params, many, context)
+
+        latencies, errors = [], 0
+        with connection.execute_wrapper(count):
+            for index in range(iterations):
+                queries.append(0)
+                started = time.perf_counter()
+                ok = request(index)
+                latencies.append(time.perf_counter() - started)
+                if not ok:
+                    errors += 1
+        return benchmarks.summarize(latencies, errors, queries=max(queries, default=0))
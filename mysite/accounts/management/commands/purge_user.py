@@ -0,0 +1,38 @@
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts import purge
+from posts.writes import run_serialized
+
+
+# 회원 게시글을 묶음 단위로 삭제한 뒤 계정 삭제 (탈퇴 작업을 기다리지 않고 바로 정리할 때)
+class Command(BaseCommand):
+    help = '회원의 게시글을 묶음 단위로 삭제하고 계정을 삭제합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('username')
+        parser.add_argument('--batch-size', type=int, default=purge.BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        user = User.objects.filter(username=options['username']).first()
+        if user is None:
+            raise CommandError(f'사용자를 찾을 수 없습니다: {options["username"]}')
+        if user.is_active:
+            purge.withdraw(user)
+
+        started = time.perf_counter()
+        total = 0
+        while True:
+            count = run_serialized(purge.purge_batch, user.id, options['batch_size'])
+            if not count:
+                break
+            total += count
+            self.stdout.write(f'{total}개 정리...')
+        run_serialized(purge.delete_user, user.id)
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'{options["username"]}: 게시글 {total}개 정리, 계정 삭제 완료 ({elapsed:.1f}초)'
+        ))
@@ -0,0 +1,33 @@
+from django.db import migrations, models
+
+# 아이디 찾기 (이름, 이메일), 비밀번호 초기화 (이름, 아이디, 이메일) 조회용 인덱스
+# auth_user 테이블은 auth 앱 소유이므로 모델 대신 스키마 편집기로 직접 추가
+USER_INDEXES = [
+    models.Index(fields=['first_name', 'email'], name='auth_user_name_email_idx'),
+    models.Index(fields=['first_name', 'username', 'email'], name='auth_user_name_user_email_idx'),
+]
+
+
+def add_user_indexes(apps, schema_editor):
+    User = apps.get_model('auth', 'User')
+    for index in USER_INDEXES:
+        schema_editor.add_index(User, index)
+
+
+def remove_user_indexes(apps, schema_editor):
+    User = apps.get_model('auth', 'User')
+    for index in USER_INDEXES:
+        schema_editor.remove_index(User, index)
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_user_indexes, remove_user_indexes),
+    ]
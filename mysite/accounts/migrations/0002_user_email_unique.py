@@ -0,0 +1,36 @@
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+# 이메일 중복을 데이터베이스에서도 막는 고유 인덱스 (동시에 가입해서 폼 검증을 함께 통과해도 하나만 저장됨)
+# 이메일 없이 만든 계정(createsuperuser 등)이 여러 개일 수 있으므로 빈 값은 제외
+# auth_user 테이블은 auth 앱 소유이므로 0001과 같이 스키마 편집기로 직접 추가
+EMAIL_CONSTRAINT = models.UniqueConstraint(
+    fields=['email'], condition=~Q(email=''), name='auth_user_email_uniq',
+)
+
+
+def add_email_constraint(apps, schema_editor):
+    User = apps.get_model('auth', 'User')
+    duplicates = list(
+        User.objects.using(schema_editor.connection.alias).exclude(email='')
+        .values('email').annotate(count=Count('id')).filter(count__gt=1).values_list('email', flat=True)[:10]
+    )
+    if duplicates:
+        raise RuntimeError(f'이메일이 중복된 계정이 있어 고유 인덱스를 만들 수 없습니다. 먼저 정리하세요: {", ".join(duplicates)}')
+    schema_editor.add_constraint(User, EMAIL_CONSTRAINT)
+
+
+def remove_email_constraint(apps, schema_editor):
+    User = apps.get_model('auth', 'User')
+    schema_editor.remove_constraint(User, EMAIL_CONSTRAINT)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_email_constraint, remove_email_constraint),
+    ]
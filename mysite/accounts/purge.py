@@ -0,0 +1,46 @@
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import transaction
+
+from posts.models import Posts
+
+from . import tasks
+
+# 한 번에 삭제할 게시글 수 (묶음마다 하나의 짧은 트랜잭션)
+BATCH_SIZE = getattr(settings, 'ACCOUNTS_PURGE_BATCH_SIZE', 500)
+
+
+# 회원 탈퇴: 바로 로그인할 수 없게 막고, 게시글과 계정 삭제는 백그라운드 작업에서 묶음 단위로 처리
+# (user.delete()는 모든 게시글을 메모리에 모아서 하나의 트랜잭션으로 삭제하므로 게시글이 많으면 DB를 오래 잠금)
+def withdraw(user):
+    with transaction.atomic():
+        user.is_active = False
+        user.set_unusable_password()
+        user.save(update_fields=['is_active', 'password'])
+        tasks.purge_user(user.id)
+
+
+# 게시글 한 묶음 삭제 (삭제 시그널이 검색 색인, 보기 캐시, 첨부 파일 정리 작업을 추가)
+# 작성한 게시글을 모두 삭제한 뒤에는 다른 회원 게시글의 수정자 정보를 비움
+def purge_batch(user_id, batch_size=BATCH_SIZE):
+    ids = list(
+        Posts.objects.filter(created_by_id=user_id).order_by('id').values_list('id', flat=True)[:batch_size]
+    )
+    if ids:
+        Posts.objects.filter(id__in=ids).delete()
+        return len(ids)
+
+    ids = list(Posts.objects.filter(updated_by_id=user_id).values_list('id', flat=True)[:batch_size])
+    if ids:
+        Posts.objects.filter(id__in=ids).update(updated_by=None)
+    return len(ids)
+
+
+# 게시글을 모두 정리한 뒤 계정 삭제
+def delete_user(user_id):
+    User.objects.filter(id=user_id).delete()
+
+
+# 탈퇴한(비활성) 회원인지 확인 (작업이 잘못된 회원을 삭제하지 않도록)
+def is_withdrawn(user_id):
+    return User.objects.filter(id=user_id, is_active=False).exists()
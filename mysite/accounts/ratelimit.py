@@ -0,0 +1,156 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.shortcuts import render
+
+# 로그인/비밀번호 확인 요청 제한 (토큰 버킷: 용량만큼 연속 요청 가능, 초당 rate개씩 다시 채워짐)
+# 비밀번호 해시 계산 전에 막아서 대량 로그인 시도가 CPU를 모두 쓰지 않게 함
+RATELIMIT_ENABLED = getattr(settings, 'ACCOUNTS_RATELIMIT_ENABLED', True)
+# 'local': 프로세스 메모리 (프로세스마다 따로 계산), 'cache': 공유 캐시 (모든 프로세스가 같은 버킷 사용)
+RATELIMIT_BACKEND = getattr(settings, 'ACCOUNTS_RATELIMIT_BACKEND', 'local')
+RATELIMIT_CACHE_ALIAS = getattr(settings, 'ACCOUNTS_RATELIMIT_CACHE_ALIAS', 'default')
+# (용량, 초당 채워지는 개수)
+IP_RATE = getattr(settings, 'ACCOUNTS_RATELIMIT_IP', (20, 10 / 60))
+USERNAME_RATE = getattr(settings, 'ACCOUNTS_RATELIMIT_USERNAME', (5, 1 / 60))
+# 프록시 뒤에서 실행할 때 클라이언트 주소를 읽을 헤더 (예: 'HTTP_X_REAL_IP'), 없으면 REMOTE_ADDR
+IP_HEADER = getattr(settings, 'ACCOUNTS_RATELIMIT_IP_HEADER', None)
+# 로컬 버킷 최대 개수 (오래 사용하지 않은 버킷부터 삭제)
+LOCAL_MAX_BUCKETS = 10000
+
+
+# 버킷 상태 (남은 토큰, 마지막 갱신 시각)에서 지금 남은 토큰
+def refill(state, now, capacity, rate):
+    tokens, updated = state if state else (capacity, now)
+    return min(capacity, tokens + (now - updated) * rate)
+
+
+# 토큰 하나 사용
+# 반환: (허용 여부, 새 상태, 다시 시도할 수 있을 때까지 남은 초)
+def take(state, now, capacity, rate):
+    tokens = refill(state, now, capacity, rate)
+    if tokens >= 1:
+        return True, (tokens - 1, now), 0
+    return False, (tokens, now), (1 - tokens) / rate
+
+
+# 토큰을 사용하지 않고 확인만 (다시 시도할 수 있을 때까지 남은 초, 토큰이 있으면 0)
+def wait(state, now, capacity, rate):
+    tokens = refill(state, now, capacity, rate)
+    return 0 if tokens >= 1 else (1 - tokens) / rate
+
+
+# 프로세스 메모리 버킷
+class LocalBuckets:
+    def __init__(self, max_buckets=LOCAL_MAX_BUCKETS):
+        self.max_buckets = max_buckets
+        self.buckets = OrderedDict()
+        self.lock = threading.Lock()
+
+    def take(self, key, capacity, rate):
+        with self.lock:
+            allowed, state, retry_after = take(self.buckets.get(key), time.monotonic(), capacity, rate)
+            self.buckets[key] = state
+            self.buckets.move_to_end(key)
+            while len(self.buckets) > self.max_buckets:
+                self.buckets.popitem(last=False)
+        return allowed, retry_after
+
+    def wait(self, key, capacity, rate):
+        with self.lock:
+            return wait(self.buckets.get(key), time.monotonic(), capacity, rate)
+
+    def clear(self):
+        with self.lock:
+            self.buckets.clear()
+
+
+# 공유 캐시 버킷 (읽고 쓰는 사이에 다른 프로세스 요청이 끼어들면 약간 더 허용될 수 있음)
+class CacheBuckets:
+    def __init__(self, alias=RATELIMIT_CACHE_ALIAS):
+        self.alias = alias
+
+    def take(self, key, capacity, rate):
+        cache = caches[self.alias]
+        cache_key = f'accounts:ratelimit:{key}'
+        allowed, state, retry_after = take(cache.get(cache_key), time.time(), capacity, rate)
+        # 가득 찰 때까지 걸리는 시간이 지나면 버킷을 지워도 같음
+        cache.set(cache_key, state, math.ceil(capacity / rate))
+        return allowed, retry_after
+
+    def wait(self, key, capacity, rate):
+        return wait(caches[self.alias].get(f'accounts:ratelimit:{key}'), time.time(), capacity, rate)
+
+    def clear(self):
+        pass
+
+
+_buckets = CacheBuckets() if RATELIMIT_BACKEND == 'cache' else LocalBuckets()
+
+
+def get_buckets():
+    return _buckets
+
+
+def client_ip(request):
+    if IP_HEADER and request.META.get(IP_HEADER):
+        return request.META[IP_HEADER].split(',')[0].strip()
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def username_key(username):
+    return f'username:{username.strip().lower()}'
+
+
+# 주소별 버킷에서 토큰을 사용하고, 아이디별 버킷은 남은 토큰만 확인 (둘 중 하나라도 부족하면 제한)
+# 아이디별 버킷은 인증에 실패했을 때만 사용(login_failed)하므로 성공한 로그인은 차감하지 않음
+# 반환: 다시 시도할 수 있을 때까지 남은 초, 제한하지 않으면 None
+def check(request, username=None):
+    buckets = get_buckets()
+    allowed, retry_after = buckets.take(f'ip:{client_ip(request)}', *IP_RATE)
+    if allowed and username:
+        retry_after = buckets.wait(username_key(username), *USERNAME_RATE)
+        allowed = not retry_after
+    return None if allowed else retry_after
+
+
+# 인증 실패: 아이디별 버킷에서 토큰 사용 (user_login_failed 시그널에서 호출, 주소와 관계없이 계정마다 제한)
+def login_failed(username):
+    if RATELIMIT_ENABLED and username:
+        get_buckets().take(username_key(username), *USERNAME_RATE)
+
+
+def posted_username(request):
+    return request.POST.get('username')
+
+
+def current_username(request):
+    return request.user.username if request.user.is_authenticated else None
+
+
+# POST 요청에만 적용하는 화면 데코레이터 (get_username: 요청에서 확인할 아이디)
+def limit_password_checks(get_username):
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if RATELIMIT_ENABLED and request.method == 'POST':
+                retry_after = check(request, get_username(request))
+                if retry_after is not None:
+                    return rate_limited(request, retry_after)
+            return view(request, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def rate_limited(request, retry_after):
+    seconds = max(math.ceil(retry_after), 1)
+    response = render(request, 'accounts/rate_limited.html', {
+        'retry_after': seconds,
+        'message_class': 'col-4 mx-auto',
+    }, status=429)
+    response['Retry-After'] = str(seconds)
+    return response
@@ -0,0 +1,23 @@
+from django.contrib.auth.models import User
+from django.contrib.auth.signals import user_login_failed
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import backends, ratelimit
+
+
+# 프로필/비밀번호 수정, 로그인 시각 갱신, 탈퇴 처리 등 사용자 정보가 바뀌면 사용자 캐시 삭제
+@receiver(post_save, sender=User)
+def invalidate_user_on_save(sender, instance, **kwargs):
+    backends.invalidate_user(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def invalidate_user_on_delete(sender, instance, **kwargs):
+    backends.invalidate_user(instance.pk)
+
+
+# 로그인, 비밀번호 수정, 탈퇴에서 비밀번호가 틀리면 아이디별 요청 제한 버킷 차감
+@receiver(user_login_failed)
+def charge_failed_login(sender, credentials, **kwargs):
+    ratelimit.login_failed(credentials.get('username'))
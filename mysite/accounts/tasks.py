@@ -0,0 +1,33 @@
+import logging
+
+from jobs.queue import enqueue, task
+
+from . import purge
+
+logger = logging.getLogger(__name__)
+
+# 탈퇴 회원 정리 (백그라운드 작업, manage.py jobs_worker가 실행)
+# 작업 하나가 게시글 한 묶음을 삭제하고 남은 게시글이 있으면 다음 작업을 추가
+
+
+def purge_user(user_id, deleted=0):
+    enqueue(
+        'accounts.purge_user',
+        {'user_id': user_id, 'deleted': deleted},
+        key=f'accounts.purge_user:{user_id}:{deleted}',
+    )
+
+
+@task('accounts.purge_user')
+def purge_user_task(user_id, deleted=0):
+    if not purge.is_withdrawn(user_id):
+        return
+
+    count = purge.purge_batch(user_id)
+    if count:
+        deleted += count
+        logger.info('탈퇴 회원 #%s: 게시글 %s개 정리', user_id, deleted)
+        purge_user(user_id, deleted)
+    else:
+        purge.delete_user(user_id)
+        logger.info('탈퇴 회원 #%s: 게시글 %s개 정리, 계정 삭제 완료', user_id, deleted)
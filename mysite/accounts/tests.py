@@ -1,3 +1,273 @@
-from django.test import TestCase
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import RequestFactory, TestCase, override_settings
+
+from accounts import backends, purge, ratelimit, tasks, validation
+from accounts.forms import RegisterForm, UpdateProfileForm
+from jobs.models import Job
+from jobs.queue import run_pending
+from mysite.testing import query_budget
+from posts.models import Posts
+
+PASSWORD = 'Passw0rd!'
+
+
+# 로그인 요청 제한: 주소별 버킷은 모든 POST에서, 아이디별 버킷은 비밀번호가 틀렸을 때만 차감
+class RateLimitTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('tester1', password=PASSWORD, first_name='홍길동', email='tester1@example.com')
+
+    def setUp(self):
+        ratelimit.get_buckets().clear()
+        self.addCleanup(ratelimit.get_buckets().clear)
+
+    def login(self, password, username='tester1', ip='10.0.0.1'):
+        return self.client.post('/auth/login/', {'username': username, 'password': password}, REMOTE_ADDR=ip)
+
+    def test_rate_limited_response(self):
+        capacity = ratelimit.USERNAME_RATE[0]
+        for _ in range(capacity):
+            self.assertEqual(self.login('wrong').status_code, 302)
+
+        response = self.login('wrong')
+        self.assertContains(response, '요청이 너무 많습니다', status_code=429)
+        retry_after = int(response['Retry-After'])
+        self.assertGreaterEqual(retry_after, 1)
+        self.assertLessEqual(retry_after, 60)
+        # 맞는 비밀번호도 버킷이 찰 때까지 제한, 화면 조회(GET)는 제한하지 않음
+        self.assertEqual(self.login(PASSWORD).status_code, 429)
+        self.assertEqual(self.client.get('/auth/login/').status_code, 200)
+
+    # 여러 주소에서 한 계정을 추측해도 계정마다 제한, 다른 계정은 영향 없음
+    def test_username_bucket_across_ips(self):
+        for index in range(ratelimit.USERNAME_RATE[0]):
+            self.login('wrong', ip=f'10.0.1.{index}')
+        self.assertEqual(self.login('wrong', ip='10.0.2.1').status_code, 429)
+        self.assertEqual(self.login('wrong', username='other', ip='10.0.2.1').status_code, 302)
+        # 대소문자와 앞뒤 공백은 같은 아이디로 봄
+        self.assertEqual(self.login('wrong', username=' TESTER1 ', ip='10.0.2.2').status_code, 429)
+
+    def test_successful_login_not_charged(self):
+        for _ in range(ratelimit.USERNAME_RATE[0] + 2):
+            response = self.login(PASSWORD)
+            self.assertRedirects(response, '/auth/profile/', fetch_redirect_response=False)
+            self.client.logout()
+
+    def test_ip_bucket(self):
+        with mock.patch.object(ratelimit, 'IP_RATE', (3, 1 / 60)):
+            for index in range(3):
+                self.assertEqual(self.login('wrong', username=f'user{index}').status_code, 302)
+            self.assertEqual(self.login(PASSWORD).status_code, 429)
+            self.assertEqual(self.login(PASSWORD, ip='10.0.0.2').status_code, 302)
+
+    # 실패한 만큼 시간이 지나면 다시 채워짐 (기본 1분마다 1회)
+    def test_refill(self):
+        request = RequestFactory().post('/auth/login/', REMOTE_ADDR='10.0.0.1')
+        capacity, rate = ratelimit.USERNAME_RATE
+        with mock.patch.object(ratelimit.time, 'monotonic', return_value=1000.0) as monotonic:
+            for _ in range(capacity):
+                self.assertIsNone(ratelimit.check(request, 'tester1'))
+                ratelimit.login_failed('tester1')
+            self.assertAlmostEqual(ratelimit.check(request, 'tester1'), 1 / rate)
+
+            monotonic.return_value = 1000.0 + 0.5 / rate
+            self.assertAlmostEqual(ratelimit.check(request, 'tester1'), 0.5 / rate)
+
+            monotonic.return_value = 1000.0 + 1 / rate
+            self.assertIsNone(ratelimit.check(request, 'tester1'))
+            ratelimit.login_failed('tester1')
+            self.assertIsNotNone(ratelimit.check(request, 'tester1'))
+
+    def test_take(self):
+        allowed, state, retry_after = ratelimit.take(None, 0, 2, 0.5)
+        self.assertEqual((allowed, state, retry_after), (True, (1, 0), 0))
+        allowed, state, retry_after = ratelimit.take(state, 0, 2, 0.5)
+        self.assertEqual((allowed, state), (True, (0, 0)))
+        allowed, state, retry_after = ratelimit.take(state, 1, 2, 0.5)
+        self.assertEqual((allowed, state, retry_after), (False, (0.5, 1), 1))
+        # 용량 이상으로는 채워지지 않음
+        self.assertEqual(ratelimit.take(state, 100, 2, 0.5)[1], (1, 100))
+
+
+# 회원 탈퇴: 게시글을 묶음 단위로 삭제한 뒤 다른 회원 게시글의 수정자 정보를 비우고 계정 삭제
+class PurgeTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('tester1', password=PASSWORD, first_name='홍길동', email='tester1@example.com')
+        cls.other = User.objects.create_user('tester2', password=PASSWORD, first_name='김철수', email='tester2@example.com')
+        for index in range(5):
+            Posts.objects.create(title=f'글 {index}', content='x', created_by=cls.user)
+        cls.edited = Posts.objects.create(title='다른 회원 글', content='x', created_by=cls.other, updated_by=cls.user)
+
+    def test_purge_batch(self):
+        self.assertEqual([purge.purge_batch(self.user.id, batch_size=2) for _ in range(5)], [2, 2, 1, 1, 0])
+        self.assertEqual(list(Posts.objects.values_list('id', 'updated_by')), [(self.edited.id, None)])
+
+    def test_withdraw(self):
+        purge.withdraw(self.user)
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.is_active)
+        self.assertFalse(self.user.has_usable_password())
+        self.assertEqual(Posts.objects.filter(created_by=self.user).count(), 5)
+
+        purge_batch = purge.purge_batch
+        with mock.patch.object(purge, 'purge_batch', lambda user_id: purge_batch(user_id, batch_size=2)):
+            while run_pending():
+                pass
+        self.assertFalse(User.objects.filter(id=self.user.id).exists())
+        self.assertEqual(list(Posts.objects.values_list('id', 'updated_by')), [(self.edited.id, None)])
+        # 묶음마다 다음 작업을 추가 (게시글 2, 2, 1개 → 수정자 정보 1개 → 계정 삭제)
+        self.assertEqual(Job.objects.filter(name='accounts.purge_user', status='done').count(), 5)
+
+    # 다시 가입해서 활성 상태인 회원은 작업이 삭제하지 않음
+    def test_active_user_not_purged(self):
+        tasks.purge_user(self.user.id)
+        run_pending()
+        self.assertEqual(Posts.objects.filter(created_by=self.user).count(), 5)
+        self.assertTrue(User.objects.filter(id=self.user.id).exists())
+
+    def test_purge_user_command(self):
+        output = StringIO()
+        call_command('purge_user', 'tester1', '--batch-size', '2', stdout=output)
+        self.assertIn('tester1: 게시글 6개 정리, 계정 삭제 완료', output.getvalue())
+        self.assertFalse(User.objects.filter(username='tester1').exists())
+        self.assertEqual(Posts.objects.get().updated_by, None)
+
+
+# 회원가입/프로필 수정 중복 확인: 아이디와 이메일을 쿼리 하나로 확인, 확인 뒤 먼저 가입한 요청이 있으면 고유 인덱스 오류를 폼 오류로
+class UniqueFieldsTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('tester1', password=PASSWORD, first_name='홍길동', email='tester1@example.com')
+
+    def register_data(self, username='tester2', email='tester2@example.com'):
+        return {
+            'username': username, 'password1': PASSWORD, 'password2': PASSWORD, 'first_name': '김철수', 'email': email,
+        }
+
+    def test_single_query(self):
+        form = RegisterForm(self.register_data('tester1', 'tester1@example.com'))
+        with query_budget(1):
+            self.assertFalse(form.is_valid())
+        self.assertEqual(form.errors['username'], [validation.UNIQUE_MESSAGES['username']])
+        self.assertEqual(form.errors['email'], [validation.UNIQUE_MESSAGES['email']])
+
+        form = RegisterForm(self.register_data('tester2', 'tester1@example.com'))
+        with query_budget(1):
+            self.assertFalse(form.is_valid())
+        self.assertEqual(list(form.errors), ['email'])
+
+        with query_budget(1):
+            self.assertTrue(RegisterForm(self.register_data()).is_valid())
+
+    # 본인 계정은 중복으로 보지 않음
+    def test_update_profile_excludes_self(self):
+        other = User.objects.create_user('tester2', password=PASSWORD, email='tester2@example.com')
+        form = UpdateProfileForm({'first_name': '홍길동', 'email': 'tester1@example.com'}, instance=self.user)
+        with query_budget(1):
+            self.assertTrue(form.is_valid())
+        form = UpdateProfileForm({'first_name': '홍길동', 'email': 'tester1@example.com'}, instance=other)
+        self.assertEqual(form.errors['email'], [validation.UNIQUE_MESSAGES['email']])
+
+    def test_taken_fields_ignores_empty(self):
+        with query_budget(0):
+            self.assertEqual(validation.taken_fields({'username': '', 'email': None}), [])
+
+    # 폼 검증과 저장 사이에 같은 아이디로 먼저 가입한 경우 (첫 번째 중복 확인이 통과하도록 대체)
+    def test_integrity_error_fallback(self):
+        taken_fields = validation.taken_fields
+        calls = []
+
+        def taken_after_check(values, exclude_id=None):
+            calls.append(values)
+            return [] if len(calls) == 1 else taken_fields(values, exclude_id)
+
+        with mock.patch.object(validation, 'taken_fields', taken_after_check):
+            response = self.client.post('/auth/register/', self.register_data('tester1'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(calls), 2)
+        self.assertContains(response, validation.UNIQUE_MESSAGES['username'])
+        self.assertContains(response, '회원가입에 실패했습니다.')
+        self.assertEqual(User.objects.filter(username='tester1').count(), 1)
+        self.assertFalse(User.objects.filter(email='tester2@example.com').exists())
+
+        response = self.client.post('/auth/register/', self.register_data())
+        self.assertRedirects(response, '/auth/login/', fetch_redirect_response=False)
+
+
+# 사용자 캐시: 비밀번호 해시는 캐시에 두지 않고 세션 검증 값만 저장, 세션 값과 다르면 캐시를 지우고 데이터베이스에서 다시 읽음
+@override_settings(
+    SESSION_ENGINE='django.contrib.sessions.backends.cached_db',
+    AUTHENTICATION_BACKENDS=['accounts.backends.CachedModelBackend'],
+)
+class CachedModelBackendTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('tester1', password=PASSWORD, first_name='홍길동', email='tester1@example.com')
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.key = backends.user_cache_key(self.user.id)
+        self.client.login(username='tester1', password=PASSWORD)
+
+    def test_password_not_cached(self):
+        self.assertEqual(self.client.get('/auth/profile/').status_code, 200)
+        data = cache.get(self.key)
+        self.assertNotIn('password', data['fields'])
+        self.assertNotIn(self.user.password, str(data))
+        self.assertEqual(data['fields']['username'], 'tester1')
+
+        # 캐시에서 복원하면 쿼리 없이 세션 검증, 비밀번호는 읽을 때 데이터베이스에서 가져옴
+        with self.assertNumQueries(0):
+            user = backends.CachedModelBackend().get_user(self.user.id)
+            self.assertEqual(user.get_session_auth_hash(), self.user.get_session_auth_hash())
+        self.assertEqual(user.get_deferred_fields(), {'password'})
+        with self.assertNumQueries(1):
+            self.assertTrue(user.check_password(PASSWORD))
+
+        with self.assertNumQueries(0):
+            response = self.client.get('/auth/profile/')
+        self.assertContains(response, '홍길동')
+
+    # 캐시가 오래되었으면(시그널 없이 비밀번호 변경) 세션을 끊고 캐시를 지워서 다음 로그인은 데이터베이스 값 사용
+    def test_session_hash_mismatch(self):
+        self.client.get('/auth/profile/')
+        User.objects.filter(id=self.user.id).update(password='stale')
+        self.assertIsNotNone(cache.get(self.key))
+
+        client = self.client_class()
+        client.force_login(User.objects.get(id=self.user.id))
+        cache.set(self.key, backends.dump_user(self.user))
+        self.assertRedirects(client.get('/posts/'), '/auth/login/?next=/posts/', fetch_redirect_response=False)
+        self.assertIsNone(cache.get(self.key))
+
+        client.force_login(User.objects.get(id=self.user.id))
+        self.assertEqual(client.get('/auth/profile/').status_code, 200)
+        self.assertEqual(client.get('/auth/profile/').status_code, 200)
+        self.assertNotEqual(cache.get(self.key)['session_auth_hashes'], backends.dump_user(self.user)['session_auth_hashes'])
+
+    # 비밀번호를 바꾸면 다른 세션은 로그아웃
+    def test_password_change_logs_out(self):
+        self.client.get('/auth/profile/')
+        user = User.objects.get(id=self.user.id)
+        user.set_password('Other-Passw0rd!')
+        user.save()
+        self.assertRedirects(self.client.get('/posts/'), '/auth/login/?next=/posts/', fetch_redirect_response=False)
+
+    # 캐시에서 복원한 사용자로 프로필을 수정해도 비밀번호는 그대로
+    def test_update_profile_keeps_password(self):
+        self.client.get('/auth/profile/')
+        response = self.client.post('/auth/update_profile/', {'first_name': '김철수', 'email': 'tester1@example.com'})
+        self.assertRedirects(response, '/auth/profile/', fetch_redirect_response=False)
+        self.assertTrue(User.objects.get(id=self.user.id).check_password(PASSWORD))
+        self.assertContains(self.client.get('/auth/profile/'), '김철수')
@@ -0,0 +1,86 @@
+import re
+
+from django import forms
+from django.contrib.auth.models import User
+from django.db.models import Q
+
+# 회원가입/프로필 수정 폼이 함께 쓰는 검증 (패턴은 모듈을 불러올 때 한 번만 컴파일)
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9+-_.]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$')
+DIGIT_PATTERN = re.compile(r'\d')
+SPECIAL_PATTERN = re.compile(r'[!@#$%^&*()_+\-=\[\]{}|;:,.<>?]')
+
+EMAIL_MAX_LENGTH = 50
+PASSWORD_MIN_LENGTH = 8
+
+# 중복을 확인하는 필드 → 오류 메시지 (데이터베이스 고유 인덱스와 같은 필드)
+UNIQUE_MESSAGES = {
+    'username': '이미 사용중인 아이디입니다.',
+    'email': '이미 사용중인 이메일입니다.',
+}
+
+
+def validate_email(email):
+    if not email:
+        raise forms.ValidationError("이메일을 입력해주세요.")
+    if len(email) > EMAIL_MAX_LENGTH:
+        raise forms.ValidationError(f"이메일은 최대 {EMAIL_MAX_LENGTH}글자 이하로 입력해주세요.")
+    if not EMAIL_PATTERN.match(email):
+        raise forms.ValidationError("이메일 형식이 올바르지 않습니다.")
+    return email
+
+
+# 비밀번호 복잡성 검증 (대/소문자는 문자열 단위 변환으로 확인해서 글자마다 파이썬 코드를 실행하지 않음)
+def validate_password(password):
+    if not password:
+        raise forms.ValidationError("비밀번호를 입력해주세요.")
+    if len(password) < PASSWORD_MIN_LENGTH:
+        raise forms.ValidationError(f"비밀번호는 최소 {PASSWORD_MIN_LENGTH}글자 이상 입력해주세요.")
+    if not DIGIT_PATTERN.search(password):
+        raise forms.ValidationError("비밀번호는 최소 1개의 숫자를 포함해야 합니다.")
+    if password.lower() == password:
+        raise forms.ValidationError("비밀번호는 최소 1개의 대문자를 포함해야 합니다.")
+    if password.upper() == password:
+        raise forms.ValidationError("비밀번호는 최소 1개의 소문자를 포함해야 합니다.")
+    if not SPECIAL_PATTERN.search(password):
+        raise forms.ValidationError("비밀번호는 최소 1개의 특수문자를 포함해야 합니다.")
+    return password
+
+
+# 이미 사용중인 필드 이름 목록 (모든 필드를 쿼리 하나로 확인, exclude_id: 수정 중인 본인 계정)
+def taken_fields(values, exclude_id=None):
+    values = {field: value for field, value in values.items() if value}
+    if not values:
+        return []
+    condition = Q()
+    for field, value in values.items():
+        condition |= Q(**{field: value})
+    queryset = User.objects.filter(condition)
+    if exclude_id is not None:
+        queryset = queryset.exclude(id=exclude_id)
+    taken = set()
+    for row in queryset.values(*values):
+        taken.update(field for field, value in values.items() if row[field] == value)
+    return [field for field in values if field in taken]
+
+
+# 중복 확인을 clean()에서 한 번에 하는 ModelForm 믹스인
+# ModelForm 기본 validate_unique는 고유 필드마다 쿼리를 따로 실행하므로 사용하지 않음
+class UniqueUserFieldsMixin:
+    unique_fields = ('username', 'email')
+
+    def clean(self):
+        cleaned_data = super().clean()
+        self.add_unique_errors()
+        return cleaned_data
+
+    def validate_unique(self):
+        pass
+
+    # 검증을 통과한 필드 중 이미 사용중인 필드에 오류 추가, 추가했으면 True
+    # 확인한 뒤 다른 요청이 먼저 저장해서 고유 인덱스 위반(IntegrityError)이 나면 화면에서 다시 호출
+    def add_unique_errors(self):
+        values = {field: self.cleaned_data[field] for field in self.unique_fields if field in self.cleaned_data}
+        fields = taken_fields(values, exclude_id=self.instance.pk)
+        for field in fields:
+            self.add_error(field, UNIQUE_MESSAGES[field])
+        return bool(fields)
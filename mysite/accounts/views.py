@@ -4,7 +4,9 @@ from django.contrib import messages
 from django.shortcuts import redirect, render
 from django.contrib.auth import authenticate, login, logout, update_session_auth_hash
 from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
 
+from . import backends, purge, ratelimit
 from .forms import FindUsernameForm, LoginForm, RegisterForm, ResetPasswordForm, UpdatePasswordForm, UpdateProfileForm, WithdrawForm
 
 # 회원가입
@@ -14,21 +16,27 @@ def accounts_register(request):
     if request.method == 'POST':
         form = RegisterForm(request.POST)
         if form.is_valid():
-            user = User.objects.create_user(
-                username=form.cleaned_data["username"],
-                password=form.cleaned_data["password1"],
-                first_name=form.cleaned_data["first_name"],
-                email=form.cleaned_data["email"]
-            )
-            user.save()
-            messages.success(request, '회원가입이 완료되었습니다.')
-            return redirect('auth:login')
-        else:
-            messages.error(request, '회원가입에 실패했습니다.')
+            try:
+                with transaction.atomic():
+                    User.objects.create_user(
+                        username=form.cleaned_data["username"],
+                        password=form.cleaned_data["password1"],
+                        first_name=form.cleaned_data["first_name"],
+                        email=form.cleaned_data["email"]
+                    )
+            except IntegrityError:
+                # 중복 확인 뒤 같은 아이디/이메일로 먼저 가입한 요청이 있음 (고유 인덱스 위반)
+                if not form.add_unique_errors():
+                    raise
+            else:
+                messages.success(request, '회원가입이 완료되었습니다.')
+                return redirect('auth:login')
+        messages.error(request, '회원가입에 실패했습니다.')
 
     return render(request, 'accounts/register.html', {'form': form})
 
 # 로그인
+@ratelimit.limit_password_checks(ratelimit.posted_username)
 def accounts_login(request):
     form = LoginForm()
     if request.method == 'POST':
@@ -51,8 +59,10 @@ def accounts_login(request):
 
     return render(request, 'accounts/login.html', {'form': form, 'message_class': 'col-4 mx-auto'})
 
-# 로그아웃
+# 로그아웃 (다음 로그인 때 사용자 정보를 새로 읽도록 사용자 캐시 삭제)
 def accounts_logout(request):
+    if request.user.is_authenticated:
+        backends.invalidate_user(request.user.id)
     logout(request)
     return redirect('auth:login')
 
@@ -67,17 +77,22 @@ def update_profile(request):
     if request.method == 'POST':
         form = UpdateProfileForm(request.POST, instance=request.user)
         if form.is_valid():
-            user = form.save(commit=False)
-            user.save()
-            update_session_auth_hash(request, user)
-            messages.success(request, '프로필 수정이 완료되었습니다.')
-            return redirect('auth:profile')
-        else:
-            messages.error(request, '프로필 수정에 실패했습니다.')
+            try:
+                with transaction.atomic():
+                    user = form.save()
+            except IntegrityError:
+                if not form.add_unique_errors():
+                    raise
+            else:
+                update_session_auth_hash(request, user)
+                messages.success(request, '프로필 수정이 완료되었습니다.')
+                return redirect('auth:profile')
+        messages.error(request, '프로필 수정에 실패했습니다.')
             
     return render(request, 'accounts/update_profile.html', {'form': form, 'message_class': 'col-4 mx-auto'})
 
 # 비밀번호 수정
+@ratelimit.limit_password_checks(ratelimit.current_username)
 def update_password(request):
     form = UpdatePasswordForm()
     
@@ -147,6 +162,7 @@ def reset_password(request):
     return render(request, 'accounts/reset_password.html', {'form': form, 'message_class': 'col-4 mx-auto'})
 
 # 탈퇴
+@ratelimit.limit_password_checks(ratelimit.posted_username)
 def accounts_withdraw(request):
     form = WithdrawForm()
     
@@ -160,7 +176,8 @@ def accounts_withdraw(request):
             user = User.objects.filter(first_name=first_name, username=username, email=email).first()
             authenticated = authenticate(request, username=username, password=password)
             if user and authenticated is not None:
-                user.delete()
+                # 게시글과 계정은 백그라운드 작업에서 묶음 단위로 삭제
+                purge.withdraw(user)
                 logout(request)
                 messages.success(request, '회원탈퇴가 완료되었습니다.')
                 return redirect('auth:login')
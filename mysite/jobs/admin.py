@@ -0,0 +1,41 @@
+from django.contrib import admin, messages
+
+from . import queue
+from .models import DeadLetterJob, Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'name', 'status', 'attempts', 'max_attempts', 'run_at', 'idempotency_key', 'updated_at')
+    list_filter = ('status', 'name')
+    search_fields = ('name', 'idempotency_key')
+    readonly_fields = ('locked_by', 'locked_at', 'last_error', 'created_at', 'updated_at')
+    ordering = ('-id',)
+
+
+# 실패한 작업 (dead letter): 오류 확인 후 다시 실행
+@admin.register(DeadLetterJob)
+class DeadLetterJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'name', 'attempts', 'short_error', 'updated_at')
+    list_filter = ('name',)
+    search_fields = ('name', 'idempotency_key', 'last_error')
+    readonly_fields = ('name', 'payload', 'idempotency_key', 'attempts', 'max_attempts', 'last_error', 'created_at', 'updated_at')
+    fields = readonly_fields
+    ordering = ('-updated_at',)
+    actions = ['retry_jobs']
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).filter(status='failed')
+
+    def has_add_permission(self, request):
+        return False
+
+    @admin.display(description='오류')
+    def short_error(self, obj):
+        lines = obj.last_error.strip().splitlines()
+        return lines[-1] if lines else ''
+
+    @admin.action(description='선택한 작업 다시 실행')
+    def retry_jobs(self, request, queryset):
+        count = queue.retry(queryset)
+        self.message_user(request, f'{count}개의 작업을 다시 실행합니다.', messages.SUCCESS)
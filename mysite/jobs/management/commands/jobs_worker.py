@@ -0,0 +1,56 @@
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from jobs import queue
+
+POLL_INTERVAL = getattr(settings, 'JOBS_POLL_INTERVAL', 1)
+
+
+# 백그라운드 작업 실행 (여러 프로세스로 실행 가능)
+class Command(BaseCommand):
+    help = '대기 중인 백그라운드 작업을 실행합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='대기 중인 작업을 모두 실행한 뒤 종료')
+        parser.add_argument('--batch-size', type=int, default=10)
+        parser.add_argument('--sleep', type=float, default=POLL_INTERVAL, help='작업이 없을 때 기다리는 시간 (초)')
+
+    def handle(self, *args, **options):
+        if options['once']:
+            count = queue.run_pending(options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(f'{count}개의 작업을 실행했습니다.'))
+            return
+
+        self.stopping = False
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        self.stdout.write(f'작업자 {queue.worker_name()} 시작')
+
+        last_purge = 0
+        while not self.stopping:
+            close_old_connections()
+            jobs = queue.claim(options['batch_size'])
+            for index, job in enumerate(jobs):
+                ok = queue.run_job(job)
+                self.stdout.write(f'{job.name} #{job.id}: {"완료" if ok else "실패"}')
+                if self.stopping:
+                    queue.release(jobs[index + 1:])
+                    break
+
+            # 한 시간마다 오래된 완료 작업 삭제
+            if time.monotonic() - last_purge > 60 * 60:
+                queue.purge_done()
+                last_purge = time.monotonic()
+
+            if not jobs:
+                time.sleep(options['sleep'])
+
+        self.stdout.write('작업자 종료')
+
+    # 실행 중인 작업을 마친 뒤 종료
+    def stop(self, signum, frame):
+        self.stopping = True
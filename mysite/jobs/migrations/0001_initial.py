@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:09
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, verbose_name='작업')),
+                ('payload', models.JSONField(blank=True, default=dict, verbose_name='인자')),
+                ('idempotency_key', models.CharField(blank=True, max_length=200, null=True, unique=True, verbose_name='중복 방지 키')),
+                ('status', models.CharField(choices=[('queued', '대기'), ('running', '실행 중'), ('done', '완료'), ('failed', '실패')], default='queued', max_length=20, verbose_name='상태')),
+                ('attempts', models.PositiveIntegerField(default=0, verbose_name='시도 횟수')),
+                ('max_attempts', models.PositiveIntegerField(default=5, verbose_name='최대 시도 횟수')),
+                ('run_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='실행 예정 일시')),
+                ('locked_by', models.CharField(blank=True, max_length=200, null=True, verbose_name='실행 중인 작업자')),
+                ('locked_at', models.DateTimeField(blank=True, null=True, verbose_name='실행 시작 일시')),
+                ('last_error', models.TextField(blank=True, default='', verbose_name='마지막 오류')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='등록일시')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='수정일시')),
+            ],
+            options={
+                'verbose_name': '작업',
+                'verbose_name_plural': '작업 목록',
+                'db_table': 'jobs',
+                'indexes': [models.Index(fields=['status', 'run_at'], name='jobs_status_run_at_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='DeadLetterJob',
+            fields=[
+            ],
+            options={
+                'verbose_name': '실패한 작업',
+                'verbose_name_plural': '실패한 작업 목록',
+                'proxy': True,
+                'indexes': [],
+                'constraints': [],
+            },
+            bases=('jobs.job',),
+        ),
+    ]
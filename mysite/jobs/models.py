@@ -0,0 +1,45 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    # 백그라운드 작업 (manage.py jobs_worker가 실행)
+    STATUS_CHOICES = [
+        ('queued', '대기'),
+        ('running', '실행 중'),
+        ('done', '완료'),
+        ('failed', '실패'),
+    ]
+
+    name = models.CharField(verbose_name="작업", max_length=100)
+    payload = models.JSONField(verbose_name="인자", default=dict, blank=True)
+    idempotency_key = models.CharField(verbose_name="중복 방지 키", max_length=200, unique=True, null=True, blank=True)
+    status = models.CharField(verbose_name="상태", max_length=20, choices=STATUS_CHOICES, default='queued')
+    attempts = models.PositiveIntegerField(verbose_name="시도 횟수", default=0)
+    max_attempts = models.PositiveIntegerField(verbose_name="최대 시도 횟수", default=5)
+    run_at = models.DateTimeField(verbose_name="실행 예정 일시", default=timezone.now)
+    locked_by = models.CharField(verbose_name="실행 중인 작업자", max_length=200, null=True, blank=True)
+    locked_at = models.DateTimeField(verbose_name="실행 시작 일시", null=True, blank=True)
+    last_error = models.TextField(verbose_name="마지막 오류", blank=True, default='')
+    created_at = models.DateTimeField(verbose_name="등록일시", auto_now_add=True)
+    updated_at = models.DateTimeField(verbose_name="수정일시", auto_now=True)
+
+    class Meta:
+        db_table = 'jobs'
+        verbose_name = "작업"
+        verbose_name_plural = "작업 목록"
+        indexes = [
+            # 작업자가 실행할 작업 조회
+            models.Index(fields=['status', 'run_at'], name='jobs_status_run_at_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.name} #{self.id} ({self.status})'
+
+
+class DeadLetterJob(Job):
+    # 최대 시도 횟수를 넘겨 실패한 작업 (관리자 화면에서 확인 후 다시 실행)
+    class Meta:
+        proxy = True
+        verbose_name = "실패한 작업"
+        verbose_name_plural = "실패한 작업 목록"
@@ -0,0 +1,172 @@
+import logging
+import os
+import socket
+import traceback
+import uuid
+from contextvars import ContextVar
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = getattr(settings, 'JOBS_MAX_ATTEMPTS', 5)
+# 다시 시도할 때까지 기다리는 시간 (초, 시도할 때마다 2배)
+RETRY_BACKOFF = getattr(settings, 'JOBS_RETRY_BACKOFF', 2)
+MAX_RETRY_DELAY = getattr(settings, 'JOBS_MAX_RETRY_DELAY', 60 * 60)
+# 작업자가 종료되어 실행 중으로 남은 작업을 다시 대기 상태로 돌리는 시간 (초)
+LOCK_TIMEOUT = getattr(settings, 'JOBS_LOCK_TIMEOUT', 60 * 10)
+# 완료된 작업 보관 기간 (초, 중복 방지 키 확인용)
+KEEP_DONE = getattr(settings, 'JOBS_KEEP_DONE', 60 * 60 * 24 * 7)
+
+# 작업 이름 → 실행 함수
+registry = {}
+
+# 실행 중인 작업 (checkpoint에서 사용)
+_current_job = ContextVar('current_job', default=None)
+
+
+# 작업 등록 데코레이터: @task('posts.index_post')
+# atomic=False: 작업 함수를 트랜잭션 밖에서 실행 (큰 파일 읽기처럼 오래 걸리는 작업이 쓰기 잠금을 잡지 않도록
+# 함수가 필요한 부분만 짧은 트랜잭션으로 처리하고, 다시 실행해도 되도록 checkpoint로 진행 상태를 저장)
+def task(name, atomic=True):
+    def decorator(func):
+        func.atomic = atomic
+        registry[name] = func
+        return func
+    return decorator
+
+
+# 작업 진행 상태를 payload에 저장: 실패 후 다시 실행할 때 저장한 값이 인자로 전달되어 끝난 단계를 건너뜀
+# 작업 함수 안의 트랜잭션에서 호출하면 그 트랜잭션과 함께 커밋됨
+def checkpoint(**values):
+    job = _current_job.get()
+    if job is None:
+        return
+    job.payload = {**job.payload, **values}
+    Job.objects.filter(id=job.id).update(payload=job.payload)
+
+
+# 작업 추가 (INSERT 한 번, 현재 트랜잭션이 커밋되어야 작업자에게 보임)
+# 같은 idempotency_key의 작업이 이미 있으면 추가하지 않고 기존 작업 반환
+def enqueue(name, payload=None, key=None, run_at=None, max_attempts=None):
+    job = Job(
+        name=name,
+        payload=payload or {},
+        idempotency_key=key,
+        run_at=run_at or timezone.now(),
+        max_attempts=max_attempts or MAX_ATTEMPTS,
+    )
+    if key is None:
+        job.save()
+        return job
+    try:
+        with transaction.atomic():
+            job.save()
+    except IntegrityError:
+        return Job.objects.get(idempotency_key=key)
+    return job
+
+
+def worker_name():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+# 실행할 작업 가져오기: status='queued' 조건의 UPDATE로 작업마다 한 작업자만 가져감
+def claim(batch_size=10, worker=None):
+    now = timezone.now()
+    token = f'{worker or worker_name()}:{uuid.uuid4().hex[:8]}'
+
+    # 작업자가 종료되어 실행 중으로 남은 작업 복구
+    Job.objects.filter(status='running', locked_at__lt=now - timedelta(seconds=LOCK_TIMEOUT)).update(
+        status='queued', locked_by=None, locked_at=None,
+    )
+
+    ids = list(
+        Job.objects.filter(status='queued', run_at__lte=now)
+        .order_by('run_at', 'id')
+        .values_list('id', flat=True)[:batch_size]
+    )
+    if not ids:
+        return []
+    Job.objects.filter(id__in=ids, status='queued').update(
+        status='running', locked_by=token, locked_at=now, attempts=F('attempts') + 1,
+    )
+    return list(Job.objects.filter(locked_by=token, status='running').order_by('run_at', 'id'))
+
+
+# 작업 실행: 작업 함수와 완료 처리는 하나의 트랜잭션(atomic=False 작업은 함수가 직접 처리), 실패하면 나중에 다시 시도
+def run_job(job):
+    func = registry.get(job.name)
+    token = _current_job.set(job)
+    try:
+        if func is None:
+            raise LookupError(f'등록되지 않은 작업입니다: {job.name}')
+        if getattr(func, 'atomic', True):
+            with transaction.atomic():
+                func(**job.payload)
+                mark_done(job)
+        else:
+            func(**job.payload)
+            mark_done(job)
+    except Exception:
+        error = traceback.format_exc()
+        logger.warning('작업 실패: %s #%s (%s/%s)', job.name, job.id, job.attempts, job.max_attempts)
+        if job.attempts >= job.max_attempts:
+            # 실패한 작업 목록(관리자 화면)으로 이동
+            Job.objects.filter(id=job.id).update(
+                status='failed', locked_by=None, last_error=error, updated_at=timezone.now(),
+            )
+        else:
+            delay = min(RETRY_BACKOFF * (2 ** (job.attempts - 1)), MAX_RETRY_DELAY)
+            Job.objects.filter(id=job.id).update(
+                status='queued', locked_by=None, locked_at=None, last_error=error,
+                run_at=timezone.now() + timedelta(seconds=delay), updated_at=timezone.now(),
+            )
+        return False
+    finally:
+        _current_job.reset(token)
+    return True
+
+
+def mark_done(job):
+    Job.objects.filter(id=job.id).update(status='done', locked_by=None, last_error='', updated_at=timezone.now())
+
+
+# 대기 중인 작업을 모두 실행 (테스트, --once)
+def run_pending(batch_size=10, worker=None):
+    count = 0
+    while True:
+        jobs = claim(batch_size, worker)
+        if not jobs:
+            return count
+        for job in jobs:
+            run_job(job)
+            count += 1
+
+
+# 가져왔지만 실행하지 못한 작업을 대기 상태로 되돌림 (작업자 종료 시)
+def release(jobs):
+    return Job.objects.filter(id__in=[job.id for job in jobs], status='running').update(
+        status='queued', locked_by=None, locked_at=None, attempts=F('attempts') - 1,
+    )
+
+
+# 실패한 작업 다시 실행
+def retry(queryset):
+    return queryset.filter(status='failed').update(
+        status='queued', attempts=0, run_at=timezone.now(), locked_by=None, locked_at=None,
+    )
+
+
+# 보관 기간이 지난 완료 작업 삭제
+def purge_done():
+    deleted, _ = Job.objects.filter(
+        status='done', updated_at__lt=timezone.now() - timedelta(seconds=KEEP_DONE),
+    ).delete()
+    return deleted
@@ -0,0 +1,146 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase
+from django.utils import timezone
+
+from jobs import queue
+from jobs.models import DeadLetterJob, Job
+
+
+class Failure(Exception):
+    pass
+
+
+# 작업 큐: 가져오기, 실패 시 다시 시도(대기 시간 2배씩), 실패한 작업 목록, 중복 방지 키, 진행 상태 저장
+class QueueTests(TestCase):
+
+    def setUp(self):
+        self.calls = []
+        patcher = mock.patch.dict(queue.registry)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def register(self, name, func, atomic=True):
+        return queue.task(name, atomic=atomic)(func)
+
+    # 다시 시도할 작업을 지금 실행할 수 있게 (대기 시간 건너뜀)
+    def make_due(self):
+        Job.objects.filter(status='queued').update(run_at=timezone.now())
+
+    def test_enqueue_dedups_by_key(self):
+        first = queue.enqueue('test.noop', {'value': 1}, key='test.noop:1')
+        second = queue.enqueue('test.noop', {'value': 2}, key='test.noop:1')
+        self.assertEqual(first.id, second.id)
+        self.assertEqual(Job.objects.get().payload, {'value': 1})
+
+        # 키가 없으면 매번 추가
+        queue.enqueue('test.noop')
+        queue.enqueue('test.noop')
+        self.assertEqual(Job.objects.count(), 3)
+
+    def test_claim(self):
+        due = queue.enqueue('test.noop')
+        queue.enqueue('test.noop', run_at=timezone.now() + timedelta(hours=1))
+
+        jobs = queue.claim(worker='worker1')
+        self.assertEqual([job.id for job in jobs], [due.id])
+        self.assertEqual((jobs[0].status, jobs[0].attempts), ('running', 1))
+        self.assertTrue(jobs[0].locked_by.startswith('worker1:'))
+        # 이미 가져간 작업은 다른 작업자가 가져가지 않음
+        self.assertEqual(queue.claim(worker='worker2'), [])
+
+        # 작업자가 종료되어 실행 중으로 남은 작업은 잠금 시간이 지나면 다시 가져감
+        Job.objects.filter(id=due.id).update(locked_at=timezone.now() - timedelta(seconds=queue.LOCK_TIMEOUT + 1))
+        jobs = queue.claim(worker='worker2')
+        self.assertEqual([(job.id, job.attempts) for job in jobs], [(due.id, 2)])
+
+        queue.release(jobs)
+        self.assertEqual(Job.objects.filter(id=due.id, status='queued', attempts=1).count(), 1)
+
+    def test_retry_with_backoff(self):
+        def fail():
+            self.calls.append(1)
+            raise Failure('실패')
+        self.register('test.fail', fail)
+        job = queue.enqueue('test.fail', max_attempts=3)
+
+        delays = []
+        for _ in range(2):
+            started = timezone.now()
+            self.assertEqual(queue.run_pending(), 1)
+            job.refresh_from_db()
+            self.assertEqual(job.status, 'queued')
+            self.assertIn('Failure: 실패', job.last_error)
+            delays.append((job.run_at - started).total_seconds())
+            self.make_due()
+
+        self.assertAlmostEqual(delays[0], queue.RETRY_BACKOFF, delta=1)
+        self.assertAlmostEqual(delays[1], queue.RETRY_BACKOFF * 2, delta=1)
+
+        # 최대 시도 횟수를 넘기면 실패한 작업 목록으로 이동
+        queue.run_pending()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts, len(self.calls)), ('failed', 3, 3))
+        self.assertEqual(list(DeadLetterJob.objects.filter(status='failed')), [job])
+        self.assertEqual(queue.run_pending(), 0)
+
+        # 다시 실행하면 시도 횟수를 처음부터 셈
+        self.assertEqual(queue.retry(Job.objects.all()), 1)
+        queue.run_pending()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts, len(self.calls)), ('queued', 1, 4))
+
+    def test_unknown_task_fails(self):
+        job = queue.enqueue('test.unknown', max_attempts=1)
+        queue.run_pending()
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'failed')
+        self.assertIn('LookupError', job.last_error)
+
+    # 기본 작업은 작업 함수와 완료 처리를 한 트랜잭션으로 실행 (실패하면 함수가 바꾼 내용도 롤백)
+    def test_atomic_task_rolls_back(self):
+        def write_then_fail():
+            queue.enqueue('test.side_effect')
+            raise Failure()
+        self.register('test.write_then_fail', write_then_fail)
+        queue.enqueue('test.write_then_fail', max_attempts=1)
+
+        queue.run_pending()
+        self.assertFalse(Job.objects.filter(name='test.side_effect').exists())
+
+    # atomic=False 작업은 checkpoint로 저장한 값을 받아 다시 실행할 때 끝난 단계를 건너뜀
+    def test_checkpoint_resume(self):
+        def steps(first=None, second=None):
+            if first is None:
+                self.calls.append('first')
+                first = 'a'
+                queue.checkpoint(first=first)
+            if second is None:
+                self.calls.append('second')
+                if len(self.calls) == 2:
+                    raise Failure()
+                queue.checkpoint(second=first + 'b')
+            self.calls.append('done')
+        self.register('test.steps', steps, atomic=False)
+        job = queue.enqueue('test.steps', {})
+
+        queue.run_pending()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.payload), ('queued', {'first': 'a'}))
+
+        self.make_due()
+        queue.run_pending()
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'done')
+        self.assertEqual(job.payload, {'first': 'a', 'second': 'ab'})
+        self.assertEqual(self.calls, ['first', 'second', 'second', 'done'])
+
+    def test_purge_done(self):
+        old = queue.enqueue('test.noop', key='old')
+        queue.enqueue('test.noop', key='new')
+        Job.objects.update(status='done')
+        Job.objects.filter(id=old.id).update(updated_at=timezone.now() - timedelta(seconds=queue.KEEP_DONE + 1))
+
+        self.assertEqual(queue.purge_done(), 1)
+        self.assertEqual(list(Job.objects.values_list('idempotency_key', flat=True)), ['new'])
@@ -0,0 +1,241 @@
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import connections
+from django.http import HttpResponse, HttpResponseForbidden
+from django.template.backends.django import DjangoTemplates, Template
+from django.utils.crypto import constant_time_compare
+
+# 요청 단위 성능 측정 (InstrumentationMiddleware가 기록, /metrics에서 Prometheus 텍스트 형식으로 출력)
+# 값은 프로세스 메모리에 모으므로 작업자 프로세스가 여러 개면 프로세스마다 따로 집계됨
+METRICS_ENABLED = getattr(settings, 'METRICS_ENABLED', True)
+# 쿼리/템플릿 시간까지 측정할 요청 비율 (응답 시간과 크기는 모든 요청에서 측정)
+SAMPLE_RATE = getattr(settings, 'METRICS_SAMPLE_RATE', 1.0)
+# /metrics 접근 토큰 (Authorization: Bearer <토큰>), 없으면 스태프 사용자만 접근 가능
+TOKEN = getattr(settings, 'METRICS_TOKEN', None)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# 현재 요청의 측정 값 (쿼리/템플릿 측정 대상이 아니면 None)
+_current = ContextVar('request_metrics', default=None)
+
+
+# 요청 하나에서 모은 쿼리/템플릿 시간
+class RequestMetrics:
+    def __init__(self):
+        self.query_count = 0
+        self.query_time = 0.0
+        self.template_time = 0.0
+        # 템플릿 안에서 다른 템플릿을 렌더링하면 바깥 템플릿 시간만 계산
+        self.template_depth = 0
+
+    def execute(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.query_time += time.perf_counter() - started
+            self.query_count += 1
+
+
+def current():
+    return _current.get()
+
+
+def activate(request_metrics):
+    return _current.set(request_metrics)
+
+
+def deactivate(token):
+    _current.reset(token)
+
+
+# 연결의 execute_wrappers에 한 번만 등록하는 쿼리 측정 함수
+# 비동기 화면의 쿼리는 이벤트 루프가 아닌 다른 스레드의 연결에서 실행되므로 요청마다 연결에 등록하지 않고 현재 요청을 ContextVar로 찾음
+def execute_wrapper(execute, sql, params, many, context):
+    request_metrics = _current.get()
+    if request_metrics is None:
+        return execute(sql, params, many, context)
+    return request_metrics.execute(execute, sql, params, many, context)
+
+
+# request_started는 비동기 요청에서도 쿼리를 실행할 스레드에서 호출되므로 이때 그 스레드의 연결에 등록
+def install_execute_wrappers(**kwargs):
+    for connection in connections.all():
+        if execute_wrapper not in connection.execute_wrappers:
+            connection.execute_wrappers.append(execute_wrapper)
+
+
+def install():
+    request_started.connect(install_execute_wrappers, dispatch_uid='mysite.metrics')
+
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_labels(names, values, extra=()):
+    pairs = [*zip(names, values), *extra]
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{escape_label(value)}"' for name, value in pairs) + '}'
+
+
+def format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    type = 'counter'
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def inc(self, *labels, amount=1):
+        with self.lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def samples(self):
+        with self.lock:
+            values = dict(self.values)
+        for labels, value in sorted(values.items()):
+            yield self.name, format_labels(self.labels, labels), value
+
+
+# 누적 버킷 히스토그램 (관측할 때는 해당 버킷 하나만 증가, 출력할 때 누적)
+class Histogram:
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labels=(), buckets=DURATION_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        # 레이블 값 → [버킷별 개수..., +Inf 개수], 합계
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def observe(self, *labels, value):
+        index = bisect_left(self.buckets, value)
+        with self.lock:
+            entry = self.values.get(labels)
+            if entry is None:
+                entry = self.values[labels] = [[0] * (len(self.buckets) + 1), 0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    def samples(self):
+        with self.lock:
+            values = {labels: (list(counts), total) for labels, (counts, total) in self.values.items()}
+        for labels, (counts, total) in sorted(values.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float('inf')), counts):
+                cumulative += count
+                yield f'{self.name}_bucket', format_labels(self.labels, labels, [('le', format_value(bound))]), cumulative
+            yield f'{self.name}_sum', format_labels(self.labels, labels), total
+            yield f'{self.name}_count', format_labels(self.labels, labels), cumulative
+
+
+REQUESTS = Counter('django_http_requests_total', '처리한 요청 수', ['view', 'method', 'status'])
+REQUEST_DURATION = Histogram(
+    'django_http_request_duration_seconds', '요청 처리 시간 (미들웨어 전체)', ['view'],
+)
+RESPONSE_SIZE = Histogram(
+    'django_http_response_size_bytes', '응답 본문 크기 (스트리밍 응답은 Content-Length가 있을 때만)', ['view'],
+    buckets=SIZE_BUCKETS,
+)
+QUERY_COUNT = Histogram(
+    'django_db_queries_per_request', '요청 하나에서 실행한 쿼리 수 (측정 대상 요청만)', ['view'],
+    buckets=QUERY_COUNT_BUCKETS,
+)
+QUERY_DURATION = Histogram(
+    'django_db_query_duration_seconds', '요청 하나에서 쿼리 실행에 쓴 시간 (측정 대상 요청만)', ['view'],
+)
+TEMPLATE_DURATION = Histogram(
+    'django_template_render_duration_seconds', '요청 하나에서 템플릿 렌더링에 쓴 시간 (측정 대상 요청만)', ['view'],
+)
+
+METRICS = [REQUESTS, REQUEST_DURATION, RESPONSE_SIZE, QUERY_COUNT, QUERY_DURATION, TEMPLATE_DURATION]
+
+
+def record(view, method, status, duration, size, request_metrics=None):
+    REQUESTS.inc(view, method, str(status))
+    REQUEST_DURATION.observe(view, value=duration)
+    if size is not None:
+        RESPONSE_SIZE.observe(view, value=size)
+    if request_metrics is not None:
+        QUERY_COUNT.observe(view, value=request_metrics.query_count)
+        QUERY_DURATION.observe(view, value=request_metrics.query_time)
+        TEMPLATE_DURATION.observe(view, value=request_metrics.template_time)
+
+
+# Prometheus 텍스트 형식
+def export():
+    lines = []
+    for metric in METRICS:
+        lines.append(f'# HELP {metric.name} {metric.documentation}')
+        lines.append(f'# TYPE {metric.name} {metric.type}')
+        for name, labels, value in metric.samples():
+            lines.append(f'{name}{labels} {format_value(value)}')
+    return '\n'.join(lines) + '\n'
+
+
+def reset():
+    for metric in METRICS:
+        with metric.lock:
+            metric.values.clear()
+
+
+def is_authorized(request):
+    if TOKEN:
+        scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+        if scheme.lower() == 'bearer' and constant_time_compare(token, TOKEN):
+            return True
+    user = getattr(request, 'user', None)
+    return bool(user and user.is_active and user.is_staff)
+
+
+def metrics_view(request):
+    if not is_authorized(request):
+        return HttpResponseForbidden()
+    return HttpResponse(export(), content_type=CONTENT_TYPE)
+
+
+# 렌더링 시간을 현재 요청의 측정 값에 더하는 템플릿
+class InstrumentedTemplate(Template):
+    def render(self, context=None, request=None):
+        request_metrics = _current.get()
+        if request_metrics is None:
+            return super().render(context, request)
+
+        request_metrics.template_depth += 1
+        started = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            request_metrics.template_depth -= 1
+            if not request_metrics.template_depth:
+                request_metrics.template_time += time.perf_counter() - started
+
+
+# settings.TEMPLATES의 BACKEND로 사용 (DjangoTemplates와 같고 렌더링 시간만 측정)
+class InstrumentedDjangoTemplates(DjangoTemplates):
+    def from_string(self, template_code):
+        return InstrumentedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        return InstrumentedTemplate(super().get_template(template_name).template, self)
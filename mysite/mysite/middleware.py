@@ -0,0 +1,111 @@
+import random
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from . import metrics, routers
+
+PRIMARY_COOKIE_NAME = getattr(settings, 'DATABASE_PRIMARY_COOKIE_NAME', 'db_primary')
+# 쓰기 후 이 시간 동안은 복제 지연과 상관없이 방금 쓴 내용을 읽도록 기본 데이터베이스에서 조회
+PRIMARY_STICKY_SECONDS = getattr(settings, 'DATABASE_PRIMARY_STICKY_SECONDS', 10)
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+# 지표에 그대로 기록하는 요청 메서드 (그 외 임의의 메서드는 'OTHER'로 묶어서 레이블 수가 늘지 않게 함)
+METRIC_METHODS = {'GET', 'POST', 'PUT', 'PATCH', 'DELETE', 'HEAD', 'OPTIONS'}
+
+
+# 읽기 요청은 복제본, 쓰기 요청과 쓰기 직후의 요청은 기본 데이터베이스로 보냄
+# (세션 저장 쓰기도 감지하도록 SessionMiddleware보다 앞에 위치)
+class ReplicaRoutingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with routers.routing(pinned=self.is_pinned(request)) as state:
+            response = self.get_response(request)
+        return self.process_response(state, response)
+
+    async def __acall__(self, request):
+        with routers.routing(pinned=self.is_pinned(request)) as state:
+            response = await self.get_response(request)
+        return self.process_response(state, response)
+
+    def is_pinned(self, request):
+        return request.method not in SAFE_METHODS or PRIMARY_COOKIE_NAME in request.COOKIES
+
+    # 게시글 등록/수정 후 리다이렉트된 화면에서도 방금 쓴 내용이 보이도록 쿠키 설정
+    def process_response(self, state, response):
+        if state.wrote and routers.REPLICAS:
+            response.set_cookie(
+                PRIMARY_COOKIE_NAME, '1',
+                max_age=PRIMARY_STICKY_SECONDS,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
+
+
+# 요청마다 처리 시간, 응답 크기, 쿼리 수/시간, 템플릿 렌더링 시간을 URL 이름(posts:list 등)별로 기록
+# 쿼리/템플릿 측정은 METRICS_SAMPLE_RATE 비율의 요청에서만 (가장 바깥에 위치해야 세션/인증 쿼리까지 포함)
+class InstrumentationMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not metrics.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        metrics.install()
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        started = time.perf_counter()
+        request_metrics = self.sample()
+        token = metrics.activate(request_metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.deactivate(token)
+        self.record(request, response, time.perf_counter() - started, request_metrics)
+        return response
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        request_metrics = self.sample()
+        token = metrics.activate(request_metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            metrics.deactivate(token)
+        self.record(request, response, time.perf_counter() - started, request_metrics)
+        return response
+
+    def sample(self):
+        if metrics.SAMPLE_RATE >= 1 or random.random() < metrics.SAMPLE_RATE:
+            return metrics.RequestMetrics()
+        return None
+
+    def record(self, request, response, duration, request_metrics):
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match else '<unresolved>'
+        method = request.method if request.method in METRIC_METHODS else 'OTHER'
+        metrics.record(view, method, response.status_code, duration, self.size(response), request_metrics)
+
+    # 스트리밍 응답은 본문을 읽지 않고 Content-Length만 사용
+    def size(self, response):
+        if response.streaming:
+            length = response.headers.get('Content-Length')
+            return int(length) if length and length.isdigit() else None
+        return len(response.content)
@@ -0,0 +1,72 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# 읽기 전용 복제본 별칭 목록 (settings.DATABASE_REPLICAS)
+REPLICAS = getattr(settings, 'DATABASE_REPLICAS', [])
+
+# 요청별 라우팅 상태 (요청 밖에서는 None → 항상 기본 데이터베이스 사용)
+_state = ContextVar('db_routing_state', default=None)
+
+
+class RoutingState:
+    def __init__(self, pinned=False):
+        # True면 읽기도 기본(주) 데이터베이스에서 수행
+        self.pinned = pinned
+        # 요청 중에 쓰기가 있었는지 (응답에 고정 쿠키 설정)
+        self.wrote = False
+
+
+# 요청 처리 동안 사용할 라우팅 상태 설정
+@contextmanager
+def routing(pinned=False):
+    state = RoutingState(pinned)
+    token = _state.set(state)
+    try:
+        yield state
+    finally:
+        _state.reset(token)
+
+
+# 블록 안의 읽기는 기본 데이터베이스에서 수행 (캐시 채우기 등 복제 지연이 남으면 안 되는 조회)
+@contextmanager
+def primary():
+    state = _state.get()
+    if state is None or state.pinned:
+        yield
+        return
+
+    state.pinned = True
+    try:
+        yield
+    finally:
+        state.pinned = False
+
+
+# 주(기본) 데이터베이스 1개 + 읽기 전용 복제본 N개
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if not REPLICAS or state is None or state.pinned:
+            return DEFAULT_DB_ALIAS
+        # 트랜잭션 안에서는 방금 쓴 내용을 읽을 수 있도록 기본 데이터베이스 사용
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return random.choice(REPLICAS)
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    # 복제본은 기본 데이터베이스와 같은 데이터이므로 관계 허용
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    # 스키마는 기본 데이터베이스에만 적용 (복제본은 복제로 따라옴)
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
@@ -1,5 +1,8 @@
+import os
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -28,9 +31,12 @@ INSTALLED_APPS = [
     'posts',
     'tinymce',
     'accounts',
+    'jobs',
 ]
 
 MIDDLEWARE = [
+    'mysite.middleware.InstrumentationMiddleware',
+    'mysite.middleware.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -44,7 +50,7 @@ ROOT_URLCONF = 'mysite.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'mysite.metrics.InstrumentedDjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -64,14 +70,133 @@ WSGI_APPLICATION = 'mysite.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
+# DJANGO_DB_PROFILE: 'development' (default) or 'production'
+# 'production' turns on WAL, synchronous=NORMAL, a busy timeout, mmap and a larger page
+# cache on every new connection, starts write transactions with BEGIN IMMEDIATE so they
+# wait for the lock up front instead of failing halfway, and reuses connections.
+
+DATABASE_PROFILES = {
+    'development': {},
+    'production': {
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'timeout': 20,
+            'transaction_mode': 'IMMEDIATE',
+            'init_command': (
+                'PRAGMA journal_mode=WAL;'
+                'PRAGMA synchronous=NORMAL;'
+                'PRAGMA busy_timeout=20000;'
+                'PRAGMA mmap_size=134217728;'
+                'PRAGMA cache_size=-20000;'
+                'PRAGMA temp_store=MEMORY;'
+            ),
+        },
+    },
+}
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'NAME': os.environ.get('DJANGO_DB_NAME', BASE_DIR / 'db.sqlite3'),
+        **DATABASE_PROFILES[os.environ.get('DJANGO_DB_PROFILE', 'development')],
+    }
+}
+
+# Read replicas
+# DJANGO_DB_REPLICAS: comma-separated SQLite files kept in sync with 'default' (e.g. by
+# Litestream/LiteFS), added as 'replica1', 'replica2', ... Other engines can be added to
+# DATABASES by hand; every alias other than 'default' is treated as a replica.
+# GET requests read from a random replica; POST requests and requests within
+# DATABASE_PRIMARY_STICKY_SECONDS after a write (cookie) read from 'default'.
+
+for index, name in enumerate(filter(None, os.environ.get('DJANGO_DB_REPLICAS', '').split(',')), start=1):
+    DATABASES[f'replica{index}'] = {
+        **DATABASES['default'],
+        'NAME': name.strip(),
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+DATABASE_ROUTERS = ['mysite.routers.PrimaryReplicaRouter']
+DATABASE_PRIMARY_STICKY_SECONDS = 10
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# DJANGO_CACHE_BACKEND: 'locmem' (default), 'redis' or 'memcached'
+
+CACHE_BACKENDS = {
+    'locmem': ('django.core.cache.backends.locmem.LocMemCache', 'mysite'),
+    'redis': ('django.core.cache.backends.redis.RedisCache', 'redis://127.0.0.1:6379/1'),
+    'memcached': ('django.core.cache.backends.memcached.PyMemcacheCache', '127.0.0.1:11211'),
+}
+CACHE_BACKEND_NAME = os.environ.get('DJANGO_CACHE_BACKEND', 'locmem')
+if CACHE_BACKEND_NAME not in CACHE_BACKENDS:
+    raise ImproperlyConfigured(
+        f'DJANGO_CACHE_BACKEND must be one of {", ".join(CACHE_BACKENDS)}, not {CACHE_BACKEND_NAME!r}'
+    )
+CACHE_BACKEND, CACHE_LOCATION = CACHE_BACKENDS[CACHE_BACKEND_NAME]
+# locmem is per process: a delete in one worker is not seen by the others
+CACHE_IS_SHARED = CACHE_BACKEND_NAME != 'locmem'
+
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKEND,
+        'LOCATION': os.environ.get('DJANGO_CACHE_LOCATION', CACHE_LOCATION),
+        'TIMEOUT': 300,
     }
 }
 
 
+# Sessions and authentication
+# https://docs.djangoproject.com/en/5.1/topics/http/sessions/#using-cached-sessions
+# With a shared cache (redis/memcached) sessions are read from the cache and
+# written through to the database, and the authenticated user is cached by
+# accounts.backends.CachedModelBackend (invalidated when the user is saved or
+# deleted, and on logout). With the per-process locmem cache an invalidation
+# would only reach one worker, so both stay on the database
+# (enforced by the accounts.E001/E002 system checks).
+if CACHE_IS_SHARED:
+    SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+    AUTHENTICATION_BACKENDS = ['accounts.backends.CachedModelBackend']
+else:
+    SESSION_ENGINE = 'django.contrib.sessions.backends.db'
+    AUTHENTICATION_BACKENDS = ['django.contrib.auth.backends.ModelBackend']
+ACCOUNTS_USER_CACHE_TIMEOUT = 60 * 15
+
+
+# Password hashing: the first hasher hashes new passwords; stored hashes made
+# with another hasher or cost are rehashed transparently on the next login.
+# DJANGO_PASSWORD_HASHER: 'pbkdf2' (default), 'scrypt' or 'argon2' (pip install argon2-cffi)
+PASSWORD_HASHER_CHOICES = {
+    'pbkdf2': 'accounts.hashers.ConfigurablePBKDF2PasswordHasher',
+    'scrypt': 'accounts.hashers.ConfigurableScryptPasswordHasher',
+    'argon2': 'django.contrib.auth.hashers.Argon2PasswordHasher',
+}
+PASSWORD_HASHER = os.environ.get('DJANGO_PASSWORD_HASHER', 'pbkdf2')
+if PASSWORD_HASHER not in PASSWORD_HASHER_CHOICES:
+    raise ImproperlyConfigured(
+        f'DJANGO_PASSWORD_HASHER must be one of {", ".join(PASSWORD_HASHER_CHOICES)}, not {PASSWORD_HASHER!r}'
+    )
+PASSWORD_HASHERS = [
+    PASSWORD_HASHER_CHOICES[PASSWORD_HASHER],
+    *(hasher for name, hasher in PASSWORD_HASHER_CHOICES.items() if name != PASSWORD_HASHER),
+]
+ACCOUNTS_PBKDF2_ITERATIONS = int(os.environ['DJANGO_PBKDF2_ITERATIONS']) if os.environ.get('DJANGO_PBKDF2_ITERATIONS') else None
+ACCOUNTS_SCRYPT_WORK_FACTOR = int(os.environ['DJANGO_SCRYPT_WORK_FACTOR']) if os.environ.get('DJANGO_SCRYPT_WORK_FACTOR') else None
+
+# Login/password-check rate limiting (token buckets per client IP, charged on every POST, and
+# per username, charged only when authentication fails:
+# (capacity, tokens refilled per second)); 'local' keeps buckets per process,
+# 'cache' shares them through the cache backend
+ACCOUNTS_RATELIMIT_ENABLED = os.environ.get('DJANGO_RATELIMIT_ENABLED', '1') == '1'
+ACCOUNTS_RATELIMIT_BACKEND = os.environ.get('DJANGO_RATELIMIT_BACKEND', 'local')
+ACCOUNTS_RATELIMIT_IP = (20, 10 / 60)
+ACCOUNTS_RATELIMIT_USERNAME = (5, 1 / 60)
+ACCOUNTS_RATELIMIT_IP_HEADER = None
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -119,3 +244,94 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+
+# Storage backends
+# https://docs.djangoproject.com/en/5.1/ref/settings/#storages
+# 'attachments' holds post attachments. To keep them in S3 or MinIO (requires boto3):
+#     'attachments': {
+#         'BACKEND': 'posts.storage.S3AttachmentStorage',
+#         'OPTIONS': {'bucket_name': 'attachments', 'endpoint_url': 'http://localhost:9000'},
+#     }
+
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+    'attachments': {
+        'BACKEND': 'posts.storage.LocalAttachmentStorage',
+    },
+}
+
+# Posts pagination
+# 'page': page-number pagination, 'cursor': keyset pagination on (created_at, id),
+# 'auto': switch to keyset pagination once the board grows past the threshold
+POSTS_PER_PAGE = 10
+POSTS_PAGINATION_MODE = 'auto'
+POSTS_CURSOR_PAGINATION_THRESHOLD = 1000
+POSTS_COUNT_CACHE_TIMEOUT = 60
+
+# Posts full-text search
+# 'auto': SQLite FTS5 / PostgreSQL tsvector index when available, 'like': LIKE '%keyword%' scan
+POSTS_SEARCH_BACKEND = 'auto'
+
+# Posts attachment downloads
+# None: stream from Django, 'x-accel-redirect': hand off to nginx (internal location
+# POSTS_DOWNLOAD_ACCEL_PREFIX aliased to MEDIA_ROOT), 'x-sendfile': Apache/lighttpd
+POSTS_DOWNLOAD_OFFLOAD = None
+POSTS_DOWNLOAD_ACCEL_PREFIX = '/protected-media/'
+POSTS_DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Posts chunked (resumable) uploads; sessions not resumed or attached within
+# POSTS_UPLOAD_SESSION_TTL seconds are aborted by the jobs worker
+# (or python manage.py expire_uploads)
+POSTS_UPLOAD_MAX_SIZE = 2 * 1024 * 1024 * 1024
+POSTS_UPLOAD_SESSION_TTL = 60 * 60 * 24
+
+# Posts image attachment previews (WebP + JPEG, generated by the jobs worker in a process pool;
+# needs Pillow; backfill with python manage.py generate_thumbnails)
+POSTS_THUMBNAIL_SIZES = {'thumb': 320, 'preview': 1280}
+POSTS_THUMBNAIL_PROCESSES = None
+POSTS_THUMBNAIL_MAX_SOURCE_SIZE = 50 * 1024 * 1024
+POSTS_THUMBNAIL_QUALITY = 80
+
+# Posts derived content (sanitized HTML, list excerpt, counts computed on save;
+# backfill existing rows with python manage.py backfill_post_content)
+POSTS_EXCERPT_LENGTH = 150
+
+# Posts detail page cache
+POSTS_READ_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Posts list page cache (unfiltered pages, invalidated by a generation counter)
+POSTS_LIST_CACHE_PAGES = 5
+POSTS_LIST_CACHE_TIMEOUT = 60 * 5
+
+# Post count and list generation: rewritten on commit, but with the per-process
+# locmem cache other workers only pick up a change when their copy expires
+POSTS_COUNTER_CACHE_TIMEOUT = 60 * 5 if CACHE_IS_SHARED else 5
+POSTS_LIST_GENERATION_TIMEOUT = 60 * 5 if CACHE_IS_SHARED else 5
+
+# Posts write serialization (create/update/delete retried when SQLite reports a lock)
+POSTS_WRITE_RETRIES = 5
+POSTS_WRITE_RETRY_DELAY = 0.05
+
+# Posts async views (list/read/download/create); asgi.py turns this on
+POSTS_ASYNC_VIEWS = os.environ.get('DJANGO_ASYNC_VIEWS') == '1'
+
+# Account withdrawal: posts are purged by the jobs worker in batches of this size
+ACCOUNTS_PURGE_BATCH_SIZE = 500
+
+# Request metrics (InstrumentationMiddleware, exported at /metrics in Prometheus format;
+# query/template timings only for METRICS_SAMPLE_RATE of requests)
+METRICS_ENABLED = True
+METRICS_SAMPLE_RATE = float(os.environ.get('DJANGO_METRICS_SAMPLE_RATE', '1.0'))
+METRICS_TOKEN = os.environ.get('DJANGO_METRICS_TOKEN')
+
+# Background jobs (python manage.py jobs_worker)
+JOBS_MAX_ATTEMPTS = 5
+JOBS_RETRY_BACKOFF = 2
+JOBS_LOCK_TIMEOUT = 60 * 10
+JOBS_KEEP_DONE = 60 * 60 * 24 * 7
+JOBS_POLL_INTERVAL = 1
@@ -0,0 +1,46 @@
+from contextlib import contextmanager
+
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+# 화면별 최대 쿼리 수 (세션, 사용자 조회 포함)
+QUERY_BUDGETS = {
+    'posts:list': 4,
+    'posts:read': 4,
+    'posts:download': 3,
+    'auth:profile': 2,
+}
+
+
+# 쿼리 수 초과 오류
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+# 블록 안에서 실행된 쿼리 수가 예산을 넘으면 실패
+@contextmanager
+def query_budget(max_queries, using='default'):
+    with CaptureQueriesContext(connections[using]) as context:
+        yield context
+
+    if len(context) > max_queries:
+        queries = '\n'.join(
+            f'{index}. {query["sql"]}' for index, query in enumerate(context.captured_queries, start=1)
+        )
+        raise QueryBudgetExceeded(
+            f'{len(context)}개의 쿼리가 실행되었습니다. (예산: {max_queries}개)\n{queries}'
+        )
+
+
+# 테스트 케이스용 믹스인
+class QueryBudgetMixin:
+    query_budgets = QUERY_BUDGETS
+
+    def assertQueryBudget(self, url_name, *, args=None, kwargs=None, data=None, method='get', budget=None):
+        if budget is None:
+            budget = self.query_budgets[url_name]
+        url = reverse(url_name, args=args, kwargs=kwargs)
+        with query_budget(budget):
+            response = getattr(self.client, method)(url, data)
+        return response
@@ -0,0 +1,168 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import connections, transaction
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+
+from mysite import metrics, routers
+from mysite.middleware import PRIMARY_COOKIE_NAME
+from posts.models import Posts
+
+REPLICA = 'test_replica'
+
+
+# 복제본 라우팅 (PrimaryReplicaRouter, ReplicaRoutingMiddleware) 확인
+# test_replica는 테스트 중에만 추가하는, 기본 테스트 데이터베이스를 가리키는 별도 연결 (테스트 실행 도구와 관계없이 동작)
+# 기본 연결에서 커밋한 내용만 보이므로 TestCase 대신 TransactionTestCase 사용
+class ReplicaRoutingTests(TransactionTestCase):
+    # 테스트 실행 도구는 테스트 데이터베이스를 만들기 전에 databases를 읽으므로 연결을 추가한 뒤 설정
+    databases = {'default'}
+
+    @classmethod
+    def setUpClass(cls):
+        connections.settings[REPLICA] = {**connections['default'].settings_dict, 'TEST': {'MIRROR': 'default'}}
+        cls.databases = {'default', REPLICA}
+        try:
+            super().setUpClass()
+        except Exception:
+            cls.remove_replica()
+            raise
+
+    @classmethod
+    def tearDownClass(cls):
+        try:
+            super().tearDownClass()
+        finally:
+            cls.remove_replica()
+
+    @classmethod
+    def remove_replica(cls):
+        cls.databases = {'default'}
+        connections[REPLICA].close()
+        del connections[REPLICA]
+        del connections.settings[REPLICA]
+
+    def setUp(self):
+        patcher = mock.patch.object(routers, 'REPLICAS', [REPLICA])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.user = User.objects.create_user('tester1', password='Passw0rd!', first_name='홍길동')
+        self.post = Posts.objects.create(title='제목', content='<p>내용</p>', created_by=self.user)
+        self.client.force_login(self.user)
+
+    # 요청 중 기본 데이터베이스와 복제본에서 게시글 테이블을 조회한 횟수
+    def request(self, method, path, data=None):
+        with CaptureQueriesContext(connections['default']) as default, \
+                CaptureQueriesContext(connections[REPLICA]) as replica:
+            response = getattr(self.client, method)(path, data)
+        return response, self.post_reads(default), self.post_reads(replica)
+
+    def post_reads(self, context):
+        return sum(
+            1 for query in context.captured_queries
+            if query['sql'].startswith('SELECT') and '"posts"' in query['sql']
+        )
+
+    def test_get_reads_from_replica(self):
+        response, default_reads, replica_reads = self.request('get', f'/posts/read/{self.post.id}/')
+        self.assertContains(response, '제목')
+        self.assertEqual(default_reads, 0)
+        self.assertGreater(replica_reads, 0)
+        self.assertNotIn(PRIMARY_COOKIE_NAME, response.cookies)
+
+    # 쓰기 요청과 쓰기 직후(고정 쿠키가 있는 동안)의 읽기는 기본 데이터베이스에서 수행
+    def test_post_and_sticky_reads_use_primary(self):
+        response, default_reads, replica_reads = self.request('post', f'/posts/update/{self.post.id}/', {
+            'title': '수정한 제목', 'content': '<p>수정한 내용</p>',
+        })
+        self.assertEqual(response.status_code, 302)
+        self.assertGreater(default_reads, 0)
+        self.assertEqual(replica_reads, 0)
+        self.assertIn(PRIMARY_COOKIE_NAME, response.cookies)
+
+        response, default_reads, replica_reads = self.request('get', f'/posts/read/{self.post.id}/')
+        self.assertContains(response, '수정한 제목')
+        self.assertGreater(default_reads, 0)
+        self.assertEqual(replica_reads, 0)
+
+        self.client.cookies.pop(PRIMARY_COOKIE_NAME)
+        response, default_reads, replica_reads = self.request('get', f'/posts/read/{self.post.id}/')
+        self.assertEqual(default_reads, 0)
+        self.assertGreater(replica_reads, 0)
+
+    def test_primary_pins_reads(self):
+        with routers.routing():
+            self.assertEqual(Posts.objects.all().db, REPLICA)
+            with routers.primary():
+                self.assertEqual(Posts.objects.all().db, 'default')
+                # 안쪽에서 다시 호출해도 바깥 블록이 끝날 때까지 고정
+                with routers.primary():
+                    pass
+                self.assertEqual(Posts.objects.all().db, 'default')
+            self.assertEqual(Posts.objects.all().db, REPLICA)
+
+            with transaction.atomic():
+                self.assertEqual(Posts.objects.all().db, 'default')
+
+        # 요청 밖(관리 명령, 작업자)에서는 항상 기본 데이터베이스
+        self.assertEqual(Posts.objects.all().db, 'default')
+
+
+# /metrics: 화면 요청을 기록한 뒤 Prometheus 텍스트 형식으로 출력, 토큰이나 스태프 사용자만 접근
+class MetricsTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('tester1', password='Passw0rd!')
+        cls.staff = User.objects.create_user('staff1', password='Passw0rd!', is_staff=True)
+
+    def setUp(self):
+        metrics.reset()
+        self.addCleanup(metrics.reset)
+
+    def test_export(self):
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get('/posts/').status_code, 200)
+        self.client.get('/posts/')
+        other = self.client.generic('PURGE', '/posts/')
+        self.client.force_login(self.staff)
+
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], metrics.CONTENT_TYPE)
+        lines = response.content.decode().splitlines()
+        self.assertIn('# TYPE django_http_requests_total counter', lines)
+        self.assertIn('django_http_requests_total{view="posts:list",method="GET",status="200"} 2', lines)
+        self.assertIn(f'django_http_requests_total{{view="posts:list",method="OTHER",status="{other.status_code}"}} 1', lines)
+        self.assertFalse(any('PURGE' in line for line in lines))
+
+        # 누적 버킷: 마지막(+Inf) 버킷과 _count는 전체 요청 수
+        self.assertIn('# TYPE django_http_request_duration_seconds histogram', lines)
+        self.assertIn('django_http_request_duration_seconds_bucket{view="posts:list",le="+Inf"} 3', lines)
+        self.assertIn('django_http_request_duration_seconds_count{view="posts:list"} 3', lines)
+        buckets = [
+            int(line.rsplit(' ', 1)[1]) for line in lines
+            if line.startswith('django_http_request_duration_seconds_bucket{view="posts:list"')
+        ]
+        self.assertEqual(len(buckets), len(metrics.DURATION_BUCKETS) + 1)
+        self.assertEqual(buckets, sorted(buckets))
+        self.assertIn('django_db_queries_per_request_count{view="posts:list"} 3', lines)
+        self.assertTrue(any(line.startswith('django_http_response_size_bytes_sum{view="posts:list"}') for line in lines))
+
+    def test_access(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 403)
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get('/metrics').status_code, 403)
+        self.client.logout()
+
+        with mock.patch.object(metrics, 'TOKEN', 'secret-token'):
+            self.assertEqual(self.client.get('/metrics', headers={'Authorization': 'Bearer secret-token'}).status_code, 200)
+            self.assertEqual(self.client.get('/metrics', headers={'Authorization': 'Bearer wrong'}).status_code, 403)
+            self.assertEqual(self.client.get('/metrics', headers={'Authorization': 'secret-token'}).status_code, 403)
+
+        # 토큰을 설정하지 않았으면 Bearer 헤더는 무시
+        self.assertEqual(self.client.get('/metrics', headers={'Authorization': 'Bearer '}).status_code, 403)
+        self.client.force_login(self.staff)
+        self.assertEqual(self.client.get('/metrics').status_code, 200)
@@ -1,9 +1,12 @@
 from django.contrib import admin
 from django.urls import path, include
 
+from . import metrics
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('posts/', include('posts.urls')),
     path('tinymce/', include('tinymce.urls')),
     path('auth/', include('accounts.urls')),
+    path('metrics', metrics.metrics_view, name='metrics'),
 ]
@@ -5,3 +5,5 @@ class PostsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'posts'
 
+    def ready(self):
+        from . import signals  # noqa: F401
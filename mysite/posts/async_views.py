@@ -0,0 +1,198 @@
+from asgiref.sync import sync_to_async
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.core.paginator import Paginator
+from django.http import HttpResponse
+from django.shortcuts import aget_object_or_404, redirect, render
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from . import attachments, cache, content, counters, downloads, search, thumbnails
+from .forms import PostCreateForm
+from .models import Attachment, Posts
+from .pagination import PER_PAGE, CachedCountPaginator, CursorPaginator, acached_count, alist, count_cache_key, use_cursor_pagination
+from .storage import get_attachment_storage
+from .views import ATTACHMENT_FIELDS, READ_FIELDS, create_post, search_filter, search_query, stage_upload
+from .writes import run_serialized
+
+# ASGI(uvicorn 등)에서 사용하는 비동기 화면
+# 스레드 전환 없이 비동기 ORM과 캐시를 사용하고, 트랜잭션이 필요한 저장만 동기 함수로 실행
+
+
+# 템플릿에서 request.user를 조회할 때 동기 쿼리가 실행되지 않도록 미리 조회
+async def load_user(request):
+    request.user = await request.auser()
+    return request.user
+
+
+# 게시글 목록
+@login_required(login_url='auth:login')
+async def posts_list(request):
+    await load_user(request)
+    page = request.GET.get('page', '1')
+    searchType = request.GET.get('searchType')
+    searchKeyword = request.GET.get('searchKeyword')
+    posts = Posts.objects.for_listing().order_by('-created_at')
+    count_key = None
+
+    # 검색 조건 처리
+    if searchType not in [None, ''] and searchKeyword not in [None, '']:
+        # 전문 검색 인덱스 사용 (검색 순위순 정렬)
+        if search.is_enabled():
+            results = await sync_to_async(search.search_results)(searchType, searchKeyword, page, PER_PAGE)
+            paginator = Paginator(results, PER_PAGE)
+            page_obj = await sync_to_async(paginator.get_page)(page)
+            posts = await Posts.objects.for_listing().ain_bulk(page_obj.object_list)
+            page_obj.object_list = [posts[post_id] for post_id in page_obj.object_list if post_id in posts]
+
+            # 순번 계산하여 게시글 리스트에 추가
+            start_index = paginator.count - (paginator.per_page * (page_obj.number - 1))
+            for index, post in enumerate(page_obj):
+                post.index_number = start_index - index
+
+            return render(request, 'posts/list.html', {
+                'posts': page_obj,
+                'searchType': searchType,
+                'searchKeyword': searchKeyword,
+                'search_query': search_query(searchType, searchKeyword),
+            })
+
+        count_key = count_cache_key('search', searchType, searchKeyword)
+        posts = search_filter(posts, searchType, searchKeyword)
+
+    # 전체 게시글 수는 카운터, 검색 결과 수는 캐시에서 조회
+    if count_key is None:
+        total = await counters.aget_count()
+        row_cache = cache.acached_list_rows
+    else:
+        total = await acached_count(posts, count_key)
+        row_cache = None
+
+    # 게시글이 많으면 커서(키셋) 페이지네이션 사용
+    if use_cursor_pagination(request, total):
+        cursor_paginator = CursorPaginator(posts, PER_PAGE, lambda: total, count_key or 'posts:count:list', row_cache)
+        if request.GET.get('date'):
+            page_obj = await cursor_paginator.aget_page_for_date(request.GET.get('date'))
+        else:
+            page_obj = await cursor_paginator.aget_page(request.GET.get('cursor'))
+
+        return render(request, 'posts/list.html', {
+            'posts': page_obj,
+            'cursor_mode': True,
+            'searchType': searchType,
+            'searchKeyword': searchKeyword,
+            'date': request.GET.get('date', ''),
+            'search_query': search_query(searchType, searchKeyword),
+        })
+
+    # 페이지네이션 (현재 페이지 목록은 비동기로 조회)
+    paginator = CachedCountPaginator(posts, PER_PAGE, lambda: total)
+    page_obj = paginator.get_page(page)
+    if row_cache and page_obj.number <= cache.LIST_CACHE_PAGES:
+        page_obj.object_list = await row_cache(f'page:{PER_PAGE}:{page_obj.number}', lambda: alist(page_obj.object_list))
+    else:
+        page_obj.object_list = await alist(page_obj.object_list)
+
+    # 순번 계산하여 게시글 리스트에 추가
+    start_index = paginator.count - (paginator.per_page * (page_obj.number - 1))
+    for index, post in enumerate(page_obj):
+        post.index_number = start_index - index
+
+    return render(request, 'posts/list.html', {
+        'posts': page_obj,
+        'searchType': searchType,
+        'searchKeyword': searchKeyword,
+        'search_query': search_query(searchType, searchKeyword),
+    })
+
+
+# 게시글 보기
+@login_required(login_url='auth:login')
+async def posts_read(request, post_id):
+    await load_user(request)
+    post = await aget_object_or_404(Posts.objects.only('id', 'created_by', 'updated_at'), id=post_id)
+
+    # 게시글 내용은 캐시된 화면 조각 사용 (수정/삭제 버튼은 사용자별로 따로 표시)
+    post_body = await cache.aget_read_fragment(post.id, post.updated_at)
+    if post_body is None:
+        full_post = await Posts.objects.select_related('created_by').only(*READ_FIELDS).aget(id=post.id)
+        if full_post.content_html is None:
+            # 정리된 HTML을 계산하기 전 게시글 (manage.py backfill_post_content)
+            full_post.content_html = content.sanitize(await Posts.objects.values_list('content', flat=True).aget(id=post.id))[0]
+        attachment = None
+        if attachments.is_digest(full_post.filename):
+            attachment = await Attachment.objects.only(*ATTACHMENT_FIELDS).filter(digest=full_post.filename).afirst()
+        post_body = render_to_string('posts/read_body.html', {
+            'post': full_post,
+            'picture': thumbnails.picture(full_post, attachment),
+        })
+        await cache.aset_read_fragment(post.id, post.updated_at, post_body)
+
+    return render(request, 'posts/read.html', {'post': post, 'post_body': mark_safe(post_body)})
+
+
+# 첨부 파일 다운로드 (파일 읽기는 스레드 풀에서 조각 단위로 수행)
+@login_required(login_url='auth:login')
+async def posts_download(request, post_id, digest=None):
+    post = await aget_object_or_404(Posts.objects.only('id', 'filename', 'original_filename'), id=post_id)
+    if digest is not None and digest != post.filename:
+        return HttpResponse(status=404)
+
+    storage = get_attachment_storage()
+    name = attachments.attachment_name(post)
+    stat = await sync_to_async(storage.stat, thread_sensitive=False)(name) if post.filename else None
+    if stat is not None:
+        etag = f'"{post.filename}"' if attachments.is_digest(post.filename) else None
+        response = await sync_to_async(downloads.file_response, thread_sensitive=False)(
+            request, storage, name, post.original_filename, stat, etag=etag, async_stream=True,
+        )
+        # 해시가 포함된 주소는 내용이 바뀌지 않으므로 계속 캐시
+        if digest is not None:
+            response['Cache-Control'] = 'private, max-age=31536000, immutable'
+        return response
+
+    return HttpResponse(status=404)
+
+
+# 첨부 이미지 미리보기 (브라우저에서 바로 표시)
+@login_required(login_url='auth:login')
+async def posts_thumbnail(request, post_id, digest, variant, fmt):
+    post = await aget_object_or_404(Posts.objects.only('id', 'filename'), id=post_id)
+    if digest != post.filename or variant not in thumbnails.SIZES or fmt not in thumbnails.FORMATS:
+        return HttpResponse(status=404)
+
+    storage = get_attachment_storage()
+    name = attachments.variant_name(digest, variant, fmt)
+    stat = await sync_to_async(storage.stat, thread_sensitive=False)(name)
+    if stat is not None:
+        response = await sync_to_async(downloads.file_response, thread_sensitive=False)(
+            request, storage, name, f'{variant}.{fmt}', stat, etag=f'"{digest}.{variant}.{fmt}"', async_stream=True,
+            content_type=thumbnails.FORMATS[fmt], inline=True,
+        )
+        response['Cache-Control'] = 'private, max-age=31536000, immutable'
+        return response
+
+    return HttpResponse(status=404)
+
+
+# 게시글 등록
+@login_required(login_url='auth:login')
+async def posts_create(request):
+    await load_user(request)
+    form = PostCreateForm()
+
+    if request.method == 'POST':
+        # 요청 본문(업로드 파일 포함) 해석은 스레드 풀에서 수행
+        await sync_to_async(lambda: (request.POST, request.FILES), thread_sensitive=False)()
+        form = PostCreateForm(request.POST)
+
+        if form.is_valid():
+            # 업로드 파일 임시 저장은 잠금 밖에서, 저장과 첨부 파일 연결은 하나의 트랜잭션으로 차례로 실행
+            staged = await sync_to_async(stage_upload, thread_sensitive=False)(request)
+            post = await sync_to_async(run_serialized)(create_post, request, form, staged)
+            messages.success(request, '게시글이 등록되었습니다.')
+            return redirect("posts:read", post_id=post.id)
+        else:
+            messages.error(request, '게시글 등록에 실패했습니다.')
+
+    return render(request, 'posts/create.html', {'form': form})
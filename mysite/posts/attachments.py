@@ -0,0 +1,199 @@
+import hashlib
+import os
+import re
+import uuid
+
+from django.core.files.storage import FileSystemStorage
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from .imaging import SNIFF_SIZE, sniff
+from .models import Attachment
+from .storage import PART_SIZE, get_attachment_storage
+
+DIGEST_RE = re.compile(r'^[0-9a-f]{64}$')
+
+
+# 내용 주소(해시) 기반 첨부 파일인지 확인
+def is_digest(filename):
+    return bool(filename) and DIGEST_RE.match(filename) is not None
+
+
+# 해시 앞자리로 디렉터리를 나눠서 저장: attachments/ab/cd/abcd...
+def digest_name(digest):
+    return f'attachments/{digest[:2]}/{digest[2:4]}/{digest}'
+
+
+# 미리보기 이미지 이름 (원본 옆에 저장): attachments/ab/cd/abcd....thumb.webp
+def variant_name(digest, variant, fmt):
+    return f'{digest_name(digest)}.{variant}.{fmt}'
+
+
+# 게시글 첨부 파일 이름 (이전 방식: posts/<게시글 id>/<uuid>)
+def attachment_name(post):
+    if is_digest(post.filename):
+        return digest_name(post.filename)
+    return f'posts/{post.id}/{post.filename}'
+
+
+# 조각을 저장소로 넘기면서 해시 계산
+class HashingReader:
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+
+    def __iter__(self):
+        for chunk in self.chunks:
+            self.sha256.update(chunk)
+            self.size += len(chunk)
+            yield chunk
+
+    def hexdigest(self):
+        return self.sha256.hexdigest()
+
+
+# 업로드 파일을 해시하면서 임시 이름으로 저장한 뒤 해시 이름으로 이동
+def store(file):
+    return store_chunks(file.chunks(chunk_size=PART_SIZE))
+
+
+def store_chunks(chunks):
+    storage = get_attachment_storage()
+    tmp_name = f'attachments/tmp/{uuid.uuid4().hex}'
+    reader = HashingReader(chunks)
+    storage.save_stream(tmp_name, reader)
+    return place(tmp_name, reader.hexdigest(), reader.size)
+
+
+# 업로드 파일을 임시 이름으로만 저장 (해시 계산과 이동은 백그라운드 작업에서 수행)
+def stage(file):
+    tmp_name = f'attachments/tmp/{uuid.uuid4().hex}'
+    get_attachment_storage().save_stream(tmp_name, file.chunks(chunk_size=PART_SIZE))
+    return tmp_name
+
+
+# 저장된 파일의 해시와 크기
+def hash_stored(name):
+    reader = HashingReader(get_attachment_storage().open_stream(name))
+    try:
+        for _ in reader:
+            pass
+    finally:
+        reader.chunks.close()
+    return reader.hexdigest(), reader.size
+
+
+# 저장된 파일의 형식 (이미지가 아니면 application/octet-stream)
+def sniff_stored(name):
+    stream = get_attachment_storage().open_stream(name, 0, SNIFF_SIZE)
+    try:
+        header = b''.join(stream)
+    finally:
+        stream.close()
+    return sniff(header) or 'application/octet-stream'
+
+
+# 임시 파일을 해시 이름으로 옮기고 참조 수 증가
+# 참조 수를 먼저 늘려서(커밋) 같은 파일의 참조 해제가 그 사이에 파일을 지우지 못하게 한 뒤 파일 이동
+def place(tmp_name, digest, size):
+    storage = get_attachment_storage()
+    try:
+        add_ref(digest, size, sniff_stored(tmp_name))
+        try:
+            place_file(tmp_name, digest)
+        except Exception:
+            release_digest(digest)
+            raise
+    finally:
+        if storage.exists(tmp_name):
+            storage.delete(tmp_name)
+
+    return digest
+
+
+# 참조 수 증가 (처음 올린 파일이면 행 생성)
+# 같은 파일을 동시에 처음 올리면 한쪽 INSERT가 고유 인덱스에 걸리므로 증가로 다시 처리
+def add_ref(digest, size, content_type):
+    with transaction.atomic():
+        if Attachment.objects.filter(digest=digest).update(ref_count=F('ref_count') + 1):
+            return
+        try:
+            with transaction.atomic():
+                Attachment.objects.create(digest=digest, size=size, ref_count=1, content_type=content_type)
+        except IntegrityError:
+            Attachment.objects.filter(digest=digest).update(ref_count=F('ref_count') + 1)
+
+
+# 임시 파일을 해시 이름으로 이동 (같은 파일이 이미 있으면 임시 파일만 삭제)
+# 다시 실행해도 같은 결과 (임시 파일이 이미 옮겨졌으면 아무것도 하지 않음)
+def place_file(tmp_name, digest):
+    storage = get_attachment_storage()
+    name = digest_name(digest)
+    if storage.exists(name):
+        if storage.exists(tmp_name):
+            storage.delete(tmp_name)
+    else:
+        storage.move(tmp_name, name)
+    return name
+
+
+# 참조 수 감소, 더 이상 참조하지 않으면 파일 삭제
+def release(post):
+    if not post.filename:
+        return
+
+    # 파일 삭제는 트랜잭션이 커밋된 뒤에 수행 (롤백되면 파일 유지)
+    if not is_digest(post.filename):
+        name = attachment_name(post)
+        transaction.on_commit(lambda: delete_legacy(name))
+        return
+
+    release_digest(post.filename)
+
+
+# 참조 수만 줄이고 행과 파일 삭제는 커밋 후 delete_unreferenced에서 처리
+def release_digest(digest):
+    Attachment.objects.filter(digest=digest, ref_count__gt=0).update(ref_count=F('ref_count') - 1)
+    transaction.on_commit(lambda: delete_unreferenced(digest), robust=True)
+
+
+# 참조 수가 0인 첨부 파일의 행과 파일 삭제
+# 쓰기 잠금을 잡은 상태에서 참조 수를 다시 확인하고 파일을 지우므로, 그 사이 같은 파일을 다시 올린 place는
+# 참조 수를 늘려서 삭제 대상에서 빠지거나(먼저 커밋) 삭제가 끝난 뒤 파일이 없는 것을 보고 새로 옮김(나중에 커밋)
+# 실패해도 참조 수 0인 행이 남아 attachments_gc가 정리함
+def delete_unreferenced(digest):
+    unreferenced = Attachment.objects.filter(digest=digest, ref_count=0)
+    with transaction.atomic():
+        # UPDATE로 먼저 쓰기 잠금을 잡은 뒤 다시 확인
+        if not unreferenced.update(ref_count=0):
+            return False
+        attachment = unreferenced.get()
+        attachment.delete()
+        delete_files(attachment_names(attachment))
+    return True
+
+
+# 첨부 파일 원본과 미리보기 파일 이름
+def attachment_names(attachment):
+    return [digest_name(attachment.digest)] + [
+        variant_name(attachment.digest, variant, fmt)
+        for variant, info in attachment.variants.items() for fmt in info.get('formats', [])
+    ]
+
+
+# 이전 방식 파일 삭제 (게시글마다 만든 posts/<id>/ 디렉터리도 비었으면 삭제)
+def delete_legacy(name):
+    storage = get_attachment_storage()
+    storage.delete(name)
+    if isinstance(storage, FileSystemStorage):
+        try:
+            os.rmdir(os.path.dirname(storage.path(name)))
+        except OSError:
+            pass
+
+
+def delete_files(names):
+    storage = get_attachment_storage()
+    for name in names:
+        storage.delete(name)
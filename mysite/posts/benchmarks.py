@@ -0,0 +1,206 @@
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import subprocess
+from datetime import timedelta
+
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.utils import timezone
+
+from . import attachments, content, counters, search
+from .models import Posts
+
+# 벤치마크 데이터 생성과 결과 저장 (manage.py bench_seed / bench_views / bench_load)
+
+USERNAME_PREFIX = 'bench'
+DEFAULT_PASSWORD = 'bench-password'
+# 첨부 파일 내용을 만들 때 한 번에 생성하는 크기
+CHUNK_SIZE = 1024 * 1024
+
+LAST_NAMES = ['김', '이', '박', '최', '정', '강', '조', '윤', '장', '임', '한', '오', '서', '신', '권']
+FIRST_NAMES = ['민준', '서연', '도윤', '하은', '지호', '수아', '예준', '지우', '시우', '서윤', '주원', '하린', '지민', '채원']
+SUBJECTS = [
+    '게시판', '공지사항', '회의록', '프로젝트', '일정', '배포', '장애', '데이터베이스', '캐시', '검색',
+    '첨부 파일', '성능', '서버', '디자인', '회원가입', '로그인', '테스트', '문서', '예산', '보고서',
+]
+TOPICS = [
+    '이번 주', '다음 분기', '신규 기능', '운영 환경', '개발 환경', '고객 요청', '내부 검토', '긴급 점검',
+]
+ACTIONS = ['정리했습니다', '공유합니다', '검토 부탁드립니다', '변경되었습니다', '확인이 필요합니다', '완료했습니다']
+SENTENCES = [
+    '{subject} 관련 내용을 {action}.',
+    '{topic} {subject} 작업은 예정대로 진행하고 있습니다.',
+    '자세한 내용은 첨부한 자료를 참고해 주세요.',
+    '{subject} 응답 시간이 {number}ms까지 늘어난 원인을 확인하고 있습니다.',
+    '{topic}에는 {subject}와 {subject2}를 함께 점검할 예정입니다.',
+    '질문이나 의견은 댓글로 남겨 주시면 {action}.',
+    '{number}건의 요청 중 대부분은 {subject} 화면에서 발생했습니다.',
+]
+
+
+def make_rng(seed):
+    return random.Random(seed)
+
+
+def full_name(rng):
+    return rng.choice(LAST_NAMES) + rng.choice(FIRST_NAMES)
+
+
+def sentence(rng):
+    return rng.choice(SENTENCES).format(
+        subject=rng.choice(SUBJECTS),
+        subject2=rng.choice(SUBJECTS),
+        topic=rng.choice(TOPICS),
+        action=rng.choice(ACTIONS),
+        number=rng.randint(2, 900),
+    )
+
+
+def post_title(rng):
+    return f'[{rng.choice(TOPICS)}] {rng.choice(SUBJECTS)} {rng.choice(ACTIONS)}'
+
+
+# TinyMCE로 작성한 것과 비슷한 HTML (문단, 강조, 목록, 링크, 표)
+def post_html(rng, paragraphs=None):
+    blocks = []
+    for _ in range(paragraphs or rng.randint(2, 8)):
+        kind = rng.random()
+        if kind < 0.6:
+            words = ' '.join(sentence(rng) for _ in range(rng.randint(2, 6)))
+            if rng.random() < 0.3:
+                words = words.replace(rng.choice(SUBJECTS), f'<strong>{rng.choice(SUBJECTS)}</strong>', 1)
+            blocks.append(f'<p>{words}</p>')
+        elif kind < 0.8:
+            items = ''.join(f'<li>{sentence(rng)}</li>' for _ in range(rng.randint(2, 5)))
+            blocks.append(f'<ul>{items}</ul>')
+        elif kind < 0.9:
+            blocks.append(f'<p><a href="https://example.com/{rng.randint(1, 999)}" target="_blank">{rng.choice(SUBJECTS)} 문서</a></p>')
+        else:
+            rows = ''.join(
+                f'<tr><td>{rng.choice(SUBJECTS)}</td><td>{rng.randint(1, 100)}%</td></tr>' for _ in range(rng.randint(2, 4))
+            )
+            blocks.append(f'<table><tbody>{rows}</tbody></table>')
+    return ''.join(blocks)
+
+
+def random_chunks(rng, size):
+    remaining = size
+    while remaining > 0:
+        length = min(CHUNK_SIZE, remaining)
+        yield rng.randbytes(length)
+        remaining -= length
+
+
+# 사용자 N명, 게시글 M개 (최근 1년에 고르게 분포), 일부 게시글에 첨부 파일 생성
+# 같은 시드면 같은 데이터를 만듦 (비밀번호 해시는 한 번만 계산해서 모든 사용자가 같은 비밀번호 사용)
+def generate(users=10, posts=1000, attachment_count=0, file_size=1024 * 1024, seed=0,
+             password=DEFAULT_PASSWORD, batch_size=500):
+    rng = make_rng(seed)
+    hashed = make_password(password)
+    User.objects.bulk_create([
+        User(username=f'{USERNAME_PREFIX}{index}', password=hashed, first_name=full_name(rng),
+             email=f'{USERNAME_PREFIX}{index}@example.com')
+        for index in range(1, users + 1)
+    ], batch_size=batch_size)
+    authors = list(User.objects.filter(username__startswith=USERNAME_PREFIX).order_by('id'))
+
+    now = timezone.now()
+    for start in range(0, posts, batch_size):
+        batch = []
+        for _ in range(start, min(start + batch_size, posts)):
+            author = rng.choice(authors)
+            post = content.apply(Posts(title=post_title(rng), content=post_html(rng), created_by=author, updated_by=author))
+            post.created_at = now - timedelta(seconds=rng.randint(0, 60 * 60 * 24 * 365))
+            post.updated_at = post.created_at
+            batch.append(post)
+        Posts.objects.bulk_create(batch)
+        # bulk_create는 auto_now/auto_now_add 값으로 덮어쓰므로 작성/수정일시를 다시 저장
+        Posts.objects.bulk_update(batch, ['created_at', 'updated_at'])
+
+    post_ids = list(Posts.objects.order_by('?').values_list('id', flat=True)[:attachment_count])
+    for index, post_id in enumerate(post_ids, start=1):
+        digest = attachments.store_chunks(random_chunks(rng, file_size))
+        Posts.objects.filter(id=post_id).update(filename=digest, original_filename=f'자료{index}.bin')
+
+    # bulk_create/update는 시그널을 거치지 않으므로 카운터와 검색 색인을 다시 만듦
+    counters.recount_posts()
+    search.rebuild_index(Posts.objects.all())
+    return {'users': len(authors), 'posts': posts, 'attachments': len(post_ids)}
+
+
+# 상위 백분위 값 (nearest-rank)
+def percentile(values, q):
+    return values[max(math.ceil(len(values) * q) - 1, 0)] if values else 0
+
+
+def summarize(latencies, errors=0, elapsed=None, **extra):
+    latencies = sorted(latencies)
+    count = len(latencies)
+    elapsed = elapsed if elapsed is not None else sum(latencies)
+    result = {
+        'requests': count,
+        'errors': errors,
+        'requests_per_sec': count / elapsed if elapsed else 0,
+        'mean_ms': statistics.fmean(latencies) * 1000 if latencies else 0,
+        'p50_ms': statistics.median(latencies) * 1000 if latencies else 0,
+        'p95_ms': percentile(latencies, 0.95) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'max_ms': latencies[-1] * 1000 if latencies else 0,
+    }
+    result.update(extra)
+    return result
+
+
+def git_revision():
+    try:
+        completed = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip() or None
+
+
+# 커밋별로 비교할 수 있도록 실행 환경과 함께 저장
+def save_results(path, benchmark, options, results):
+    data = {
+        'benchmark': benchmark,
+        'revision': git_revision(),
+        'created_at': timezone.now().isoformat(),
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'database': settings.DATABASES['default']['ENGINE'].rsplit('.', 1)[-1],
+        'cpu_count': os.cpu_count(),
+        'options': options,
+        'results': results,
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    return data
+
+
+def load_results(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+# 이전 결과 대비 p50/p95 변화율 (양수면 느려짐)
+def compare(previous, current, keys=('p50_ms', 'p95_ms')):
+    rows = []
+    for name, result in current.items():
+        before = previous.get(name)
+        if not before:
+            continue
+        changes = {
+            key: (result[key] - before[key]) / before[key] * 100 if before.get(key) else None
+            for key in keys
+        }
+        rows.append((name, before, result, changes))
+    return rows
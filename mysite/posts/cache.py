@@ -0,0 +1,88 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from mysite import routers
+
+READ_CACHE_TIMEOUT = getattr(settings, 'POSTS_READ_CACHE_TIMEOUT', 60 * 60 * 24)
+LIST_CACHE_TIMEOUT = getattr(settings, 'POSTS_LIST_CACHE_TIMEOUT', 60 * 5)
+LIST_CACHE_PAGES = getattr(settings, 'POSTS_LIST_CACHE_PAGES', 5)
+LIST_GENERATION_KEY = 'posts:list:generation'
+# 세대 번호 유지 시간 (locmem 캐시에서는 다른 작업자가 이 시간이 지나야 새 세대 번호를 사용)
+LIST_GENERATION_TIMEOUT = getattr(settings, 'POSTS_LIST_GENERATION_TIMEOUT', 60)
+
+
+# 게시글 보기 캐시 키 (게시글 id + 수정일시)
+def read_cache_key(post_id, updated_at):
+    return f'posts:read:{post_id}:{updated_at.timestamp():.6f}'
+
+
+def get_read_fragment(post_id, updated_at):
+    return cache.get(read_cache_key(post_id, updated_at))
+
+
+def set_read_fragment(post_id, updated_at, html):
+    cache.set(read_cache_key(post_id, updated_at), html, READ_CACHE_TIMEOUT)
+
+
+async def aget_read_fragment(post_id, updated_at):
+    return await cache.aget(read_cache_key(post_id, updated_at))
+
+
+async def aset_read_fragment(post_id, updated_at, html):
+    await cache.aset(read_cache_key(post_id, updated_at), html, READ_CACHE_TIMEOUT)
+
+
+# 게시글 보기 캐시 삭제
+def invalidate_read(posts):
+    cache.delete_many([read_cache_key(post_id, updated_at) for post_id, updated_at in posts])
+
+
+# 목록 캐시 세대 번호 (게시글 등록/수정/삭제 시 새 번호로 변경)
+# 번호는 현재 시각으로 만들어서 만료 후 다시 만들어도 이전 세대의 목록 캐시를 사용하지 않음
+def new_generation():
+    return time.time_ns()
+
+
+def list_generation():
+    generation = cache.get(LIST_GENERATION_KEY)
+    if generation is None:
+        cache.add(LIST_GENERATION_KEY, new_generation(), LIST_GENERATION_TIMEOUT)
+        generation = cache.get(LIST_GENERATION_KEY) or new_generation()
+    return generation
+
+
+async def alist_generation():
+    generation = await cache.aget(LIST_GENERATION_KEY)
+    if generation is None:
+        await cache.aadd(LIST_GENERATION_KEY, new_generation(), LIST_GENERATION_TIMEOUT)
+        generation = await cache.aget(LIST_GENERATION_KEY) or new_generation()
+    return generation
+
+
+def bump_list_generation():
+    cache.set(LIST_GENERATION_KEY, new_generation(), LIST_GENERATION_TIMEOUT)
+
+
+# 검색하지 않은 목록 페이지 캐시 (세대 번호가 바뀌면 이전 캐시는 사용하지 않음)
+def cached_list_rows(name, fetch):
+    key = f'posts:list:{list_generation()}:{name}'
+    rows = cache.get(key)
+    if rows is None:
+        # 복제 지연으로 이전 목록이 캐시되지 않도록 기본 데이터베이스에서 조회
+        with routers.primary():
+            rows = fetch()
+        cache.set(key, rows, LIST_CACHE_TIMEOUT)
+    return rows
+
+
+# fetch는 목록을 반환하는 비동기 함수
+async def acached_list_rows(name, fetch):
+    key = f'posts:list:{await alist_generation()}:{name}'
+    rows = await cache.aget(key)
+    if rows is None:
+        with routers.primary():
+            rows = await fetch()
+        await cache.aset(key, rows, LIST_CACHE_TIMEOUT)
+    return rows
@@ -0,0 +1,171 @@
+import re
+from html import escape
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
+
+from django.conf import settings
+
+# 게시글 내용(TinyMCE HTML)에서 미리 계산해서 저장하는 값: 정리된 HTML, 요약, 단어/글자 수
+EXCERPT_LENGTH = getattr(settings, 'POSTS_EXCERPT_LENGTH', 150)
+
+# 허용하는 태그와 속성 (그 외 태그는 제거하고 내용만 남김)
+ALLOWED_TAGS = {
+    'a': {'href', 'title', 'target'},
+    'b': set(), 'strong': set(), 'i': set(), 'em': set(), 'u': set(), 's': set(), 'strike': set(),
+    'sub': set(), 'sup': set(), 'span': set(), 'br': set(), 'hr': set(),
+    'p': set(), 'div': set(), 'blockquote': set(), 'pre': set(), 'code': set(),
+    'h1': set(), 'h2': set(), 'h3': set(), 'h4': set(), 'h5': set(), 'h6': set(),
+    'ul': set(), 'ol': set(), 'li': set(),
+    'table': set(), 'thead': set(), 'tbody': set(), 'tfoot': set(), 'tr': set(),
+    'th': {'colspan', 'rowspan'}, 'td': {'colspan', 'rowspan'}, 'caption': set(),
+    'img': {'src', 'alt', 'title', 'width', 'height'},
+}
+VOID_TAGS = {'br', 'hr', 'img'}
+# 내용까지 제거하는 태그
+DROP_CONTENT_TAGS = {'script', 'style', 'iframe', 'object', 'embed', 'template', 'noscript', 'svg', 'math'}
+# 텍스트로 바꿀 때 앞뒤에 공백을 넣는 태그
+BLOCK_TAGS = {
+    'br', 'hr', 'p', 'div', 'blockquote', 'pre', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+    'ul', 'ol', 'li', 'table', 'tr', 'th', 'td', 'caption',
+}
+URL_ATTRIBUTES = {'href', 'src'}
+URL_SCHEMES = {'', 'http', 'https', 'mailto'}
+# TinyMCE가 붙여넣은 이미지를 넣는 data: 주소 (SVG는 스크립트를 담을 수 있으므로 제외)
+DATA_IMAGE_RE = re.compile(r'^data:image/(?:png|jpeg|gif|webp);base64,[A-Za-z0-9+/=\s]+$', re.IGNORECASE)
+
+# style 속성은 TinyMCE 서식(정렬, 글자/배경색, 표/이미지 크기 등)에 쓰는 속성만 남김
+STYLE_TAGS = set(ALLOWED_TAGS) - {'br', 'hr'}
+STYLE_PROPERTIES = {
+    'text-align', 'color', 'background-color', 'width', 'height', 'font-size', 'font-weight', 'font-style',
+    'text-decoration', 'vertical-align', 'padding-left', 'margin-left', 'border-collapse',
+}
+# 값은 색/길이/키워드만 허용 (url(), expression(), 이스케이프, 주석 등은 제거)
+STYLE_VALUE_RE = re.compile(r'^(?:[#\w.%+-]+|(?:rgb|rgba|hsl|hsla)\([\d\s.,%]+\))(?:\s+(?:[#\w.%+-]+|(?:rgb|rgba|hsl|hsla)\([\d\s.,%]+\)))*$', re.IGNORECASE)
+
+WHITESPACE_RE = re.compile(r'\s+')
+
+
+# 허용 목록 기반 HTML 정리 + 텍스트 추출 (한 번 파싱)
+class Sanitizer(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.html = []
+        self.text = []
+        self.open_tags = []
+        self.dropping = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in DROP_CONTENT_TAGS:
+            self.dropping += 1
+            return
+        if self.dropping:
+            return
+        if tag in BLOCK_TAGS:
+            self.text.append(' ')
+        if tag not in ALLOWED_TAGS:
+            return
+
+        allowed = ALLOWED_TAGS[tag]
+        parts = [tag]
+        for name, value in attrs:
+            if value is None:
+                continue
+            if name == 'style' and tag in STYLE_TAGS:
+                value = clean_style(value)
+                if not value:
+                    continue
+            elif name not in allowed:
+                continue
+            elif name in URL_ATTRIBUTES and not is_safe_url(value) and not (tag == 'img' and DATA_IMAGE_RE.match(value)):
+                continue
+            parts.append(f'{name}="{escape(value)}"')
+        if tag == 'a' and any(name == 'target' for name, _ in attrs):
+            parts.append('rel="noopener noreferrer"')
+        self.html.append(f'<{" ".join(parts)}>')
+        if tag not in VOID_TAGS:
+            self.open_tags.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        if tag in DROP_CONTENT_TAGS:
+            return
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS and self.open_tags and self.open_tags[-1] == tag:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if tag in DROP_CONTENT_TAGS:
+            self.dropping = max(self.dropping - 1, 0)
+            return
+        if self.dropping:
+            return
+        if tag in BLOCK_TAGS:
+            self.text.append(' ')
+        if tag not in self.open_tags:
+            return
+        # 닫히지 않은 안쪽 태그도 함께 닫음
+        while self.open_tags:
+            open_tag = self.open_tags.pop()
+            self.html.append(f'</{open_tag}>')
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        if self.dropping:
+            return
+        self.html.append(escape(data, quote=False))
+        self.text.append(data)
+
+    def result(self):
+        self.close()
+        while self.open_tags:
+            self.html.append(f'</{self.open_tags.pop()}>')
+        return ''.join(self.html), WHITESPACE_RE.sub(' ', ''.join(self.text)).strip()
+
+
+def is_safe_url(url):
+    try:
+        scheme = urlsplit(WHITESPACE_RE.sub('', url)).scheme.lower()
+    except ValueError:
+        return False
+    return scheme in URL_SCHEMES
+
+
+# 허용한 속성과 값만 남긴 style 속성 (남은 게 없으면 빈 문자열)
+def clean_style(style):
+    declarations = []
+    for declaration in style.split(';'):
+        name, _, value = declaration.partition(':')
+        name, value = name.strip().lower(), WHITESPACE_RE.sub(' ', value).strip()
+        if name in STYLE_PROPERTIES and STYLE_VALUE_RE.match(value):
+            declarations.append(f'{name}: {value}')
+    return '; '.join(declarations)
+
+
+# HTML → (정리된 HTML, 텍스트)
+def sanitize(html):
+    sanitizer = Sanitizer()
+    sanitizer.feed(html or '')
+    return sanitizer.result()
+
+
+def excerpt(text, length=EXCERPT_LENGTH):
+    if len(text) <= length:
+        return text
+    return text[:length].rstrip() + '…'
+
+
+# 게시글 내용에서 계산한 값 (저장할 때 한 번만 계산)
+def derive(html):
+    content_html, text = sanitize(html)
+    return {
+        'content_html': content_html,
+        'excerpt': excerpt(text),
+        'word_count': len(text.split()),
+        'char_count': len(text),
+    }
+
+
+def apply(post):
+    for field, value in derive(post.content).items():
+        setattr(post, field, value)
+    return post
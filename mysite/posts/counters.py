@@ -0,0 +1,71 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+
+from mysite import routers
+
+from .models import Counter, Posts
+
+POST_COUNT = 'posts'
+# 캐시한 카운터 값 유지 시간 (변경하면 커밋 후 새 값으로 덮어씀)
+# 프로세스마다 따로 있는 캐시(locmem)에서는 다른 작업자가 이 시간이 지나야 새 값을 읽으므로 짧게 설정
+COUNTER_CACHE_TIMEOUT = getattr(settings, 'POSTS_COUNTER_CACHE_TIMEOUT', 60)
+
+
+def counter_cache_key(name):
+    return f'posts:counter:{name}'
+
+
+# 전체 게시글 수 다시 세기 (카운터가 없거나 대량 작업 후)
+def recount_posts():
+    with routers.primary(), transaction.atomic():
+        value = Posts.objects.count()
+        Counter.objects.update_or_create(name=POST_COUNT, defaults={'value': value})
+    transaction.on_commit(lambda: cache.set(counter_cache_key(POST_COUNT), value, COUNTER_CACHE_TIMEOUT))
+    return value
+
+
+# 카운터 조회 (캐시 → 카운터 테이블 순서, 게시글 테이블은 조회하지 않음)
+# 조회한 값은 add로만 저장해서, 읽는 사이에 커밋된 변경이 저장한 새 값을 이전 값으로 덮어쓰지 않음
+def get_count(name=POST_COUNT):
+    key = counter_cache_key(name)
+    value = cache.get(key)
+    if value is None:
+        # 복제 지연으로 이전 값이 캐시되지 않도록 기본 데이터베이스에서 조회
+        with routers.primary():
+            value = Counter.objects.filter(name=name).values_list('value', flat=True).first()
+        if value is None:
+            value = recount_posts()
+        cache.add(key, value, COUNTER_CACHE_TIMEOUT)
+    return value
+
+
+async def aget_count(name=POST_COUNT):
+    key = counter_cache_key(name)
+    value = await cache.aget(key)
+    if value is None:
+        with routers.primary():
+            value = await Counter.objects.filter(name=name).values_list('value', flat=True).afirst()
+        if value is None:
+            # 트랜잭션이 필요하므로 동기 함수로 실행
+            value = await sync_to_async(recount_posts)()
+        await cache.aadd(key, value, COUNTER_CACHE_TIMEOUT)
+    return value
+
+
+# 카운터 증감 (커밋 후 데이터베이스의 새 값을 캐시에 저장)
+def add(delta, name=POST_COUNT):
+    with transaction.atomic():
+        updated = Counter.objects.filter(name=name).update(value=F('value') + delta)
+        if not updated:
+            recount_posts()
+    transaction.on_commit(lambda: refresh(name))
+
+
+def refresh(name=POST_COUNT):
+    with routers.primary():
+        value = Counter.objects.filter(name=name).values_list('value', flat=True).first()
+    if value is not None:
+        cache.set(counter_cache_key(name), value, COUNTER_CACHE_TIMEOUT)
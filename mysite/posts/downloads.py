@@ -0,0 +1,115 @@
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseRedirect, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+
+from .storage import aiter_stream
+
+CHUNK_SIZE = getattr(settings, 'POSTS_DOWNLOAD_CHUNK_SIZE', 64 * 1024)
+# None: Django가 직접 전송, 'x-accel-redirect': nginx, 'x-sendfile': Apache/lighttpd,
+# 'redirect': 저장소 주소(S3 서명된 주소 등)로 이동
+OFFLOAD = getattr(settings, 'POSTS_DOWNLOAD_OFFLOAD', None)
+ACCEL_PREFIX = getattr(settings, 'POSTS_DOWNLOAD_ACCEL_PREFIX', '/protected-media/')
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+# Range 헤더 해석: (시작, 끝) 또는 None, 만족할 수 없는 범위는 False
+def parse_range(header, size):
+    match = RANGE_RE.match(header.strip()) if header else None
+    if match is None:
+        return None
+
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # 마지막 N 바이트
+        length = int(last)
+        if length == 0:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+# If-Range 조건이 맞을 때만 Range 요청 처리
+def if_range_matches(request, etag, last_modified):
+    if_range = request.headers.get('If-Range')
+    if not if_range:
+        return True
+    if if_range.startswith('"') or if_range.startswith('W/'):
+        return if_range == etag
+    return parse_http_date_safe(if_range) == last_modified
+
+
+def content_disposition(filename, inline=False):
+    return f'{"inline" if inline else "attachment"}; filename*=UTF-8\'\'{quote(filename)}'
+
+
+# 첨부 파일 응답 (스트리밍, Range, ETag/Last-Modified, 웹 서버 위임)
+# stat은 파일이 있는지 확인할 때 조회한 storage.stat(name) 결과 (S3는 HEAD 요청 한 번)
+# async_stream=True면 ASGI에서 파일을 비동기 반복자로 전송, inline=True면 브라우저에서 바로 표시 (미리보기 이미지)
+def file_response(request, storage, name, filename, stat, etag=None, async_stream=False,
+                  content_type='application/octet-stream', inline=False):
+    size, modified_time = stat
+    last_modified = int(modified_time.timestamp())
+    if etag is None:
+        etag = f'"{size:x}-{int(modified_time.timestamp() * 1000000):x}"'
+
+    # 304 Not Modified / 412 Precondition Failed
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is not None:
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    # 웹 서버나 저장소가 파일을 직접 전송 (Django는 권한 확인만 수행)
+    if OFFLOAD:
+        if OFFLOAD == 'redirect':
+            return HttpResponseRedirect(storage.url(name))
+        response = HttpResponse(content_type=content_type)
+        if OFFLOAD == 'x-accel-redirect':
+            response['X-Accel-Redirect'] = quote(ACCEL_PREFIX.rstrip('/') + '/' + name)
+        else:
+            response['X-Sendfile'] = storage.path(name)
+        response['Content-Disposition'] = content_disposition(filename, inline)
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    byte_range = None
+    if if_range_matches(request, etag, last_modified):
+        byte_range = parse_range(request.headers.get('Range'), size)
+
+    # 416 Range Not Satisfiable
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+
+    if byte_range:
+        start, end = byte_range
+        stream = storage.open_stream(name, start, end - start + 1, CHUNK_SIZE)
+    else:
+        start, end = 0, size - 1
+        stream = storage.open_stream(name, chunk_size=CHUNK_SIZE)
+    if async_stream:
+        stream = aiter_stream(stream)
+
+    response = StreamingHttpResponse(stream, status=206 if byte_range else 200, content_type=content_type)
+    response['Content-Length'] = str(end - start + 1)
+    if byte_range:
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+
+    response['Accept-Ranges'] = 'bytes'
+    response['Content-Disposition'] = content_disposition(filename, inline)
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    return response
@@ -0,0 +1,81 @@
+from io import BytesIO
+
+# 이미지 변환 함수 (Pillow 필요)
+# 별도 프로세스에서 실행되므로 Django 설정이나 모델을 사용하지 않음
+
+# 파일 앞부분으로 이미지 형식 판별
+SIGNATURES = [
+    (b'\xff\xd8\xff', 'image/jpeg'),
+    (b'\x89PNG\r\n\x1a\n', 'image/png'),
+    (b'GIF87a', 'image/gif'),
+    (b'GIF89a', 'image/gif'),
+]
+SNIFF_SIZE = 16
+CONTENT_TYPES = {content_type for _, content_type in SIGNATURES} | {'image/webp'}
+
+
+def sniff(header):
+    for signature, content_type in SIGNATURES:
+        if header.startswith(signature):
+            return content_type
+    if header[:4] == b'RIFF' and header[8:12] == b'WEBP':
+        return 'image/webp'
+    return ''
+
+
+def is_available():
+    try:
+        import PIL  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+# 원본 이미지를 크기별 WebP, JPEG로 변환
+# sizes: {'thumb': 320, ...} → {'width', 'height', 'variants': {'thumb': {'width', 'height', 'webp', 'jpeg'}}}
+# 이미지로 열 수 없는 파일이면 None
+def render_variants(data, sizes, quality=80):
+    from PIL import Image
+
+    try:
+        return _render_variants(data, sizes, quality)
+    except (OSError, ValueError, SyntaxError, Image.DecompressionBombError):
+        return None
+
+
+def _render_variants(data, sizes, quality):
+    from PIL import Image, ImageOps
+
+    with Image.open(BytesIO(data)) as image:
+        # 움직이는 GIF/WebP는 첫 프레임만 사용
+        image.seek(0)
+        image = ImageOps.exif_transpose(image)
+        width, height = image.size
+
+        variants = {}
+        for name, max_size in sizes.items():
+            resized = image.copy()
+            resized.thumbnail((max_size, max_size), Image.Resampling.LANCZOS)
+
+            has_alpha = resized.mode in ('RGBA', 'LA') or (resized.mode == 'P' and 'transparency' in resized.info)
+            resized = resized.convert('RGBA' if has_alpha else 'RGB')
+
+            webp = BytesIO()
+            resized.save(webp, 'WEBP', quality=quality, method=4)
+
+            # JPEG는 투명도를 지원하지 않으므로 흰 배경에 합성
+            if has_alpha:
+                background = Image.new('RGB', resized.size, (255, 255, 255))
+                background.paste(resized, mask=resized.getchannel('A'))
+                resized = background
+            jpeg = BytesIO()
+            resized.save(jpeg, 'JPEG', quality=quality, optimize=True, progressive=True)
+
+            variants[name] = {
+                'width': resized.width,
+                'height': resized.height,
+                'webp': webp.getvalue(),
+                'jpeg': jpeg.getvalue(),
+            }
+
+    return {'width': width, 'height': height, 'variants': variants}
@@ -0,0 +1,317 @@
+import os
+import shutil
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import timedelta
+
+from django.core.files.storage import FileSystemStorage
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from jobs.models import Job
+from posts import attachments, cache
+from posts.models import Attachment, Posts, UploadSession
+from posts.storage import get_attachment_storage
+from posts.writes import run_serialized
+
+# 이전 방식 디렉터리(posts/<id>/)를 작업 하나에 넘기는 개수
+DIRS_PER_TASK = 1000
+# 아직 반영하지 않은 작업 (실패한 작업도 관리자 화면에서 다시 실행할 수 있으므로 포함)
+PENDING_JOB_STATUSES = ['queued', 'running', 'failed']
+
+
+# 첨부 파일 저장소와 데이터베이스 비교
+# - 고아 파일: 저장소에는 있지만 데이터베이스에서 참조하지 않는 파일 (해시 파일, 미리보기, 임시 파일, 이전 방식 파일)
+# - 끊어진 참조: 데이터베이스에는 있지만 저장소에 파일이 없는 첨부 파일/게시글
+# - 분할 업로드 조각: 진행 중인 업로드가 아닌 .multipart/<업로드 ID>/ 디렉터리
+# - 참조 수: 게시글, 게시글에 연결하지 않은 완료된 업로드, 아직 반영하지 않은 작업으로 다시 센 값과 다른 첨부 파일
+# 디렉터리는 여러 스레드에서 os.scandir로 읽고, 데이터베이스 조회는 묶음 단위로 현재 스레드에서 실행
+class Command(BaseCommand):
+    help = '첨부 파일 저장소에서 고아 파일과 끊어진 참조를 찾고, --delete를 지정하면 정리합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--delete', action='store_true', help='고아 파일 삭제, 끊어진 참조와 참조 수 정리 (지정하지 않으면 확인만 함)')
+        parser.add_argument('--grace', type=int, default=60 * 60 * 24, help='이 시간(초) 안에 수정된 파일과 만든 첨부 파일은 건드리지 않음')
+        parser.add_argument('--workers', type=int, default=8, help='디렉터리를 읽는 스레드 수')
+        parser.add_argument('--batch-size', type=int, default=500, help='한 번에 확인할 파일/게시글 수')
+
+    def handle(self, *args, **options):
+        storage = get_attachment_storage()
+        if not isinstance(storage, FileSystemStorage):
+            raise CommandError('로컬 파일 시스템 첨부 파일 저장소만 지원합니다.')
+
+        self.storage = storage
+        self.verbosity = options['verbosity']
+        self.root = storage.path('')
+        self.delete = options['delete']
+        self.batch_size = options['batch_size']
+        self.cutoff = time.time() - options['grace']
+        self.created_cutoff = timezone.now() - timedelta(seconds=options['grace'])
+        self.stats = {
+            'dirs': 0, 'files': 0, 'bytes': 0, 'orphans': 0, 'orphan_bytes': 0, 'dangling': 0, 'mismatched': 0,
+        }
+        # 작업자가 아직 처리하지 않은 임시 업로드 파일, 완료 처리 중인 분할 업로드 파일
+        self.pending_tmp = {
+            job.payload.get('tmp_name')
+            for job in Job.objects.filter(name='posts.store_attachment', status__in=['queued', 'running'])
+        }
+        self.pending_tmp.update(session.storage_name for session in UploadSession.objects.filter(status__in=['uploading', 'processing']).only('id'))
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            futures = [executor.submit(self.scan, path) for path in self.shards()]
+            for future in as_completed(futures):
+                dirs, entries = future.result()
+                self.stats['dirs'] += dirs
+                for index in range(0, len(entries), self.batch_size):
+                    self.check_files(entries[index:index + self.batch_size])
+        self.check_multipart()
+        scanned = time.perf_counter() - started
+
+        self.check_attachments()
+        self.check_posts()
+        self.check_ref_counts()
+
+        elapsed = time.perf_counter() - started
+        stats = self.stats
+        self.stdout.write(
+            f'디렉터리 {stats["dirs"]}개, 파일 {stats["files"]}개 ({stats["bytes"] / 1024 / 1024:.1f}MB) 확인: '
+            f'{scanned:.1f}초 ({stats["files"] / scanned if scanned else 0:.0f}개/초), 전체 {elapsed:.1f}초'
+        )
+        action = '삭제' if self.delete else '발견'
+        self.stdout.write(self.style.SUCCESS(
+            f'고아 파일 {stats["orphans"]}개 ({stats["orphan_bytes"] / 1024 / 1024:.1f}MB) {action}, '
+            f'끊어진 참조 {stats["dangling"]}개 {"정리" if self.delete else "발견"}, '
+            f'참조 수가 어긋난 첨부 파일 {stats["mismatched"]}개 {"정리" if self.delete else "발견"}'
+        ))
+        if not self.delete and (stats['orphans'] or stats['dangling'] or stats['mismatched']):
+            self.stdout.write('정리하려면 --delete를 지정해서 다시 실행하세요.')
+
+    # 나눠서 읽을 디렉터리: attachments/ab, attachments/tmp, posts/<id> 여러 개씩
+    def shards(self):
+        for top in ('attachments', 'posts'):
+            top_path = os.path.join(self.root, top)
+            if not os.path.isdir(top_path):
+                continue
+            with os.scandir(top_path) as it:
+                dirs = [entry.path for entry in it if entry.is_dir(follow_symlinks=False)]
+            if top == 'attachments':
+                yield from ([path] for path in dirs)
+            else:
+                for index in range(0, len(dirs), DIRS_PER_TASK):
+                    yield dirs[index:index + DIRS_PER_TASK]
+
+    # 디렉터리 아래 파일 목록 (저장소 기준 이름, 크기, 수정 시각)
+    def scan(self, paths):
+        dirs = 0
+        entries = []
+        stack = list(paths)
+        while stack:
+            path = stack.pop()
+            dirs += 1
+            with os.scandir(path) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        stat = entry.stat(follow_symlinks=False)
+                        name = os.path.relpath(entry.path, self.root).replace(os.sep, '/')
+                        entries.append((name, stat.st_size, stat.st_mtime))
+        return dirs, entries
+
+    def check_files(self, entries):
+        self.stats['files'] += len(entries)
+        self.stats['bytes'] += sum(size for _, size, _ in entries)
+
+        digests, legacy, orphans = {}, {}, []
+        for entry in entries:
+            name = entry[0]
+            parts = name.split('/')
+            if parts[0] == 'attachments' and parts[1] == 'tmp':
+                if name not in self.pending_tmp:
+                    orphans.append(entry)
+            elif parts[0] == 'attachments' and len(parts) == 4:
+                # attachments/ab/cd/<해시> 또는 <해시>.<미리보기>.<형식>
+                digest, _, variant = parts[3].partition('.')
+                if attachments.is_digest(digest) and name.startswith(attachments.digest_name(digest)):
+                    digests.setdefault(digest, []).append((entry, variant))
+                else:
+                    orphans.append(entry)
+            elif parts[0] == 'posts' and len(parts) == 3 and parts[1].isdigit():
+                legacy[(int(parts[1]), parts[2])] = entry
+            else:
+                orphans.append(entry)
+
+        if digests:
+            known = dict(Attachment.objects.filter(digest__in=digests).values_list('digest', 'variants'))
+            for digest, files in digests.items():
+                for entry, variant in files:
+                    if digest not in known:
+                        orphans.append(entry)
+                    elif variant:
+                        variant_name, _, fmt = variant.partition('.')
+                        if fmt not in known[digest].get(variant_name, {}).get('formats', []):
+                            orphans.append(entry)
+
+        if legacy:
+            referenced = set(Posts.objects.filter(id__in={post_id for post_id, _ in legacy}).values_list('id', 'filename'))
+            orphans.extend(entry for key, entry in legacy.items() if key not in referenced)
+
+        for name, size, mtime in orphans:
+            # 방금 저장되어 아직 커밋되지 않은 파일일 수 있음
+            if mtime > self.cutoff:
+                continue
+            self.stats['orphans'] += 1
+            self.stats['orphan_bytes'] += size
+            if self.verbosity >= 2:
+                self.stdout.write(f'고아 파일: {name}')
+            if self.delete:
+                if name.startswith('posts/'):
+                    attachments.delete_legacy(name)
+                else:
+                    self.storage.delete(name)
+
+    # 분할 업로드 조각: 진행 중인 업로드가 아니고 --grace 안에 받은 조각이 없으면 디렉터리째 삭제
+    def check_multipart(self):
+        top_path = os.path.join(self.root, '.multipart')
+        if not os.path.isdir(top_path):
+            return
+        # 디렉터리 목록을 읽은 뒤 조회해야 그 사이 시작한 업로드도 진행 중으로 봄
+        with os.scandir(top_path) as it:
+            upload_dirs = [entry for entry in it if entry.is_dir(follow_symlinks=False)]
+        open_uploads = set(
+            UploadSession.objects.filter(status__in=['uploading', 'processing']).values_list('storage_upload_id', flat=True)
+        )
+
+        for upload_dir in upload_dirs:
+            self.stats['dirs'] += 1
+            mtime, size, count = upload_dir.stat(follow_symlinks=False).st_mtime, 0, 0
+            with os.scandir(upload_dir.path) as it:
+                for entry in it:
+                    stat = entry.stat(follow_symlinks=False)
+                    mtime, size, count = max(mtime, stat.st_mtime), size + stat.st_size, count + 1
+            self.stats['files'] += count
+            self.stats['bytes'] += size
+            if upload_dir.name in open_uploads or mtime > self.cutoff:
+                continue
+            self.stats['orphans'] += count
+            self.stats['orphan_bytes'] += size
+            if self.verbosity >= 2:
+                self.stdout.write(f'고아 파일: .multipart/{upload_dir.name}/ (조각 {count}개)')
+            if self.delete:
+                shutil.rmtree(upload_dir.path, ignore_errors=True)
+
+    # 파일이 없는 첨부 파일 정보: 참조하는 게시글의 첨부 파일 정보를 비우고 삭제
+    def check_attachments(self):
+        last_id = 0
+        while True:
+            rows = list(
+                Attachment.objects.filter(id__gt=last_id).order_by('id')
+                .values_list('id', 'digest')[:self.batch_size]
+            )
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            missing = [digest for _, digest in rows if not self.storage.exists(attachments.digest_name(digest))]
+            if missing:
+                self.report_dangling(f'첨부 파일 {digest}' for digest in missing)
+                if self.delete:
+                    run_serialized(self.clear_attachments, missing)
+
+    def clear_attachments(self, digests):
+        self.clear_posts(Posts.objects.filter(filename__in=digests))
+        Attachment.objects.filter(digest__in=digests).delete()
+
+    # 첨부 파일 정보가 없는 해시 참조, 파일이 없는 이전 방식 참조
+    def check_posts(self):
+        last_id = 0
+        while True:
+            rows = list(
+                Posts.objects.filter(id__gt=last_id, filename__isnull=False).exclude(filename='')
+                .order_by('id').values_list('id', 'filename')[:self.batch_size]
+            )
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            digests = {filename for _, filename in rows if attachments.is_digest(filename)}
+            known = set(Attachment.objects.filter(digest__in=digests).values_list('digest', flat=True))
+            missing = [post_id for post_id, filename in rows if not self.has_file(post_id, filename, known)]
+            if missing:
+                self.report_dangling(f'게시글 #{post_id}' for post_id in missing)
+                if self.delete:
+                    run_serialized(self.clear_posts, Posts.objects.filter(id__in=missing))
+
+    def has_file(self, post_id, filename, known_digests):
+        if attachments.is_digest(filename):
+            return filename in known_digests
+        return self.storage.exists(attachments.attachment_name(Posts(id=post_id, filename=filename)))
+
+    def clear_posts(self, posts):
+        cache.invalidate_read(posts.values_list('id', 'updated_at'))
+        posts.update(filename=None, original_filename=None)
+
+    # 참조 수 확인 (--grace 안에 만든 첨부 파일은 아직 게시글에 연결 중일 수 있으므로 건너뜀)
+    def check_ref_counts(self):
+        last_id = 0
+        while True:
+            rows = list(
+                Attachment.objects.filter(id__gt=last_id, created_at__lt=self.created_cutoff).order_by('id')
+                .values_list('id', 'digest', 'ref_count')[:self.batch_size]
+            )
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            expected = self.expected_refs([digest for _, digest, _ in rows])
+            mismatched = [(digest, ref_count) for _, digest, ref_count in rows if ref_count != expected[digest]]
+            if not mismatched:
+                continue
+            for digest, ref_count in mismatched:
+                self.stats['mismatched'] += 1
+                if self.verbosity >= 2:
+                    self.stdout.write(f'참조 수 불일치: 첨부 파일 {digest} ({ref_count} → {expected[digest]})')
+            if self.delete:
+                run_serialized(self.fix_ref_counts, [digest for digest, _ in mismatched])
+
+    # 첨부 파일별로 있어야 하는 참조 수
+    def expected_refs(self, digests):
+        expected = Counter()
+        expected.update(dict(
+            Posts.objects.filter(filename__in=digests).values('filename')
+            .annotate(count=Count('id')).values_list('filename', 'count')
+        ))
+        expected.update(dict(
+            UploadSession.objects.filter(status='completed', digest__in=digests).values('digest')
+            .annotate(count=Count('id')).values_list('digest', 'count')
+        ))
+        # 참조 수를 늘렸지만 아직 게시글에 연결하지 않은 저장 작업, 게시글에서 뗐지만 아직 참조 해제하지 않은 작업
+        digests = set(digests)
+        jobs = Job.objects.filter(
+            name__in=['posts.store_attachment', 'posts.release_attachment'], status__in=PENDING_JOB_STATUSES,
+        ).values_list('name', 'payload')
+        for name, payload in jobs:
+            if name == 'posts.store_attachment':
+                digest = payload.get('digest') if payload.get('referenced') and not payload.get('attached') else None
+            else:
+                digest = payload.get('filename')
+            if digest in digests:
+                expected[digest] += 1
+        return expected
+
+    # 쓰기 잠금을 잡은 상태에서 다시 세서 고치고, 더 이상 참조하지 않으면 파일까지 삭제
+    def fix_ref_counts(self, digests):
+        expected = self.expected_refs(digests)
+        for digest, ref_count in Attachment.objects.filter(digest__in=digests).values_list('digest', 'ref_count'):
+            if ref_count == expected[digest]:
+                continue
+            Attachment.objects.filter(digest=digest).update(ref_count=expected[digest])
+            if not expected[digest]:
+                transaction.on_commit(lambda digest=digest: attachments.delete_unreferenced(digest), robust=True)
+
+    def report_dangling(self, labels):
+        for label in labels:
+            self.stats['dangling'] += 1
+            if self.verbosity >= 2:
+                self.stdout.write(f'끊어진 참조: {label}')
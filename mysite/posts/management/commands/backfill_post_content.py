@@ -0,0 +1,50 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from posts import cache, content
+from posts.models import Posts
+
+FIELDS = ['content_html', 'excerpt', 'word_count', 'char_count']
+
+
+# 기존 게시글의 정리된 HTML, 요약, 단어/글자 수 계산
+# id 순서로 묶음만큼 읽어서 bulk_update (수정일시는 바꾸지 않음, 중단해도 이어서 실행 가능)
+# SQLite는 같은 연결에서 읽는 중인 테이블을 수정하면 결과가 보장되지 않으므로 열린 커서 대신 id 범위로 나눠서 조회
+class Command(BaseCommand):
+    help = '기존 게시글의 정리된 내용, 요약, 단어/글자 수를 계산합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--all', action='store_true', help='이미 계산한 게시글도 다시 계산')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        posts = Posts.objects.only('id', 'content', 'updated_at').order_by('id')
+        if not options['all']:
+            posts = posts.filter(content_html__isnull=True)
+
+        count = 0
+        last_id = 0
+        started = time.perf_counter()
+        while True:
+            batch = [content.apply(post) for post in posts.filter(id__gt=last_id)[:batch_size].iterator()]
+            if not batch:
+                break
+            last_id = batch[-1].id
+            count += self.save(batch)
+            self.stdout.write(f'{count}개 처리...')
+
+        # 목록의 요약이 바뀌었으므로 목록 캐시 갱신
+        cache.bump_list_generation()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'{count}개의 게시글을 처리했습니다. ({elapsed:.1f}초, {count / elapsed if elapsed else 0:.0f}개/초)'
+        ))
+
+    def save(self, batch):
+        with transaction.atomic():
+            Posts.objects.bulk_update(batch, FIELDS)
+        cache.invalidate_read([(post.id, post.updated_at) for post in batch])
+        return len(batch)
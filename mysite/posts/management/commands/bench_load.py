@@ -0,0 +1,157 @@
+import http.cookiejar
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from posts import benchmarks
+from posts.models import Posts
+
+# 가상 사용자가 실행하는 작업과 가중치 (locust의 @task(가중치)와 같은 방식)
+TASKS = {
+    'list': 6,
+    'list_page': 2,
+    'search': 2,
+    'read': 5,
+    'download': 1,
+}
+
+
+# 실행 중인 서버에 동시 접속 부하 (locust 방식: 사용자마다 로그인 후 가중치에 따라 작업을 고르고 잠시 대기)
+# 서버와 같은 데이터베이스를 사용해야 함 (bench_seed로 만든 사용자로 로그인하고 게시글 id를 데이터베이스에서 읽음)
+class Command(BaseCommand):
+    help = '실행 중인 서버에 여러 사용자가 동시에 접속하는 부하를 주고 결과를 JSON으로 저장합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000', help='서버 주소')
+        parser.add_argument('--users', type=int, default=20, help='동시 사용자 수')
+        parser.add_argument('--spawn-rate', type=float, default=5, help='초당 시작하는 사용자 수')
+        parser.add_argument('--duration', type=float, default=60, help='실행 시간 (초)')
+        parser.add_argument('--wait', type=float, nargs=2, default=[0.5, 2.0], metavar=('MIN', 'MAX'), help='작업 사이 대기 시간 (초)')
+        parser.add_argument('--password', default=benchmarks.DEFAULT_PASSWORD, help='bench_seed로 만든 사용자 비밀번호')
+        parser.add_argument('--seed', type=int, default=0, help='작업 선택 시드')
+        parser.add_argument('--output', help='결과를 저장할 JSON 파일')
+        parser.add_argument('--compare', metavar='JSON', help='이전 결과 파일과 비교')
+
+    def handle(self, *args, **options):
+        self.base_url = options['url'].rstrip('/')
+        self.password = options['password']
+        self.usernames = list(
+            User.objects.filter(username__startswith=benchmarks.USERNAME_PREFIX, is_active=True)
+            .order_by('id').values_list('username', flat=True)
+        )
+        self.post_ids = list(Posts.objects.values_list('id', flat=True))
+        self.download_ids = list(
+            Posts.objects.exclude(filename__isnull=True).exclude(filename='').values_list('id', flat=True)
+        )
+        if not self.usernames or not self.post_ids:
+            raise CommandError('벤치마크 데이터가 없습니다. 먼저 python manage.py bench_seed를 실행하세요.')
+
+        self.lock = threading.Lock()
+        self.latencies = {}
+        self.errors = {}
+        self.stop = threading.Event()
+
+        started = time.perf_counter()
+        threads = []
+        for index in range(options['users']):
+            if self.stop.wait(1 / options['spawn_rate']) or time.perf_counter() - started > options['duration']:
+                break
+            thread = threading.Thread(target=self.user, args=(index, options), daemon=True)
+            thread.start()
+            threads.append(thread)
+        self.stop.wait(max(options['duration'] - (time.perf_counter() - started), 0))
+        self.stop.set()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        results = {
+            name: benchmarks.summarize(latencies, self.errors.get(name, 0), elapsed)
+            for name, latencies in sorted(self.latencies.items())
+        }
+        everything = [latency for latencies in self.latencies.values() for latency in latencies]
+        results['total'] = benchmarks.summarize(everything, sum(self.errors.values()), elapsed)
+
+        if options['output']:
+            recorded = {key: options[key] for key in ('url', 'users', 'spawn_rate', 'duration', 'wait', 'seed')}
+            benchmarks.save_results(options['output'], 'bench_load', recorded, results)
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f'== 사용자 {len(threads)}명, {elapsed:.1f}초'))
+        for name, result in results.items():
+            self.stdout.write(
+                f'{name:<10} {result["requests"]:7}건  {result["requests_per_sec"]:8.1f}건/초  '
+                f'p50 {result["p50_ms"]:8.1f}ms  p95 {result["p95_ms"]:8.1f}ms  p99 {result["p99_ms"]:8.1f}ms  '
+                f'오류 {result["errors"]}건'
+            )
+        if options['compare']:
+            previous = benchmarks.load_results(options['compare'])
+            self.stdout.write(self.style.MIGRATE_HEADING(f'== {previous.get("revision") or "이전 결과"} 대비'))
+            for name, before, after, changes in benchmarks.compare(previous['results'], results):
+                if changes['p95_ms'] is not None:
+                    self.stdout.write(f'{name:<10} p95 {before["p95_ms"]:8.1f}ms → {after["p95_ms"]:8.1f}ms  ({changes["p95_ms"]:+.1f}%)')
+        if options['output']:
+            self.stdout.write(self.style.SUCCESS(f'결과를 {options["output"]}에 저장했습니다.'))
+
+    # 가상 사용자 하나: 로그인 후 멈출 때까지 작업 반복
+    def user(self, index, options):
+        rng = benchmarks.make_rng(f'{options["seed"]}:{index}')
+        cookies = http.cookiejar.CookieJar()
+        opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(cookies))
+        if not self.login(opener, cookies, self.usernames[index % len(self.usernames)]):
+            return
+
+        tasks = [task for task in TASKS if task != 'download' or self.download_ids]
+        weights = [TASKS[task] for task in tasks]
+        while not self.stop.is_set():
+            task = rng.choices(tasks, weights)[0]
+            self.request(task, opener, self.path(task, rng))
+            self.stop.wait(rng.uniform(*options['wait']))
+
+    def path(self, task, rng):
+        if task == 'list':
+            return '/posts/'
+        if task == 'list_page':
+            return f'/posts/?page={rng.randint(2, 5)}'
+        if task == 'search':
+            query = urllib.parse.urlencode({
+                'searchType': rng.choice(['all', 'title', 'content']),
+                'searchKeyword': rng.choice(benchmarks.SUBJECTS),
+            })
+            return f'/posts/?{query}'
+        if task == 'read':
+            return f'/posts/read/{rng.choice(self.post_ids)}/'
+        return f'/posts/download/{rng.choice(self.download_ids)}/'
+
+    # 로그인 화면에서 받은 CSRF 쿠키로 로그인
+    def login(self, opener, cookies, username):
+        if not self.request('login_form', opener, '/auth/login/'):
+            return False
+        token = next((cookie.value for cookie in cookies if cookie.name == 'csrftoken'), '')
+        data = urllib.parse.urlencode({
+            'username': username, 'password': self.password, 'csrfmiddlewaretoken': token,
+        }).encode()
+        return self.request('login', opener, '/auth/login/', data, headers={'Referer': self.base_url + '/auth/login/'})
+
+    # 요청 하나 (본문을 끝까지 읽은 시간까지 측정), 로그인 화면으로 돌아가면 실패로 계산
+    def request(self, name, opener, path, data=None, headers=None):
+        request = urllib.request.Request(self.base_url + path, data=data, headers=headers or {})
+        started = time.perf_counter()
+        ok = False
+        try:
+            with opener.open(request, timeout=30) as response:
+                while response.read(64 * 1024):
+                    pass
+                ok = name == 'login_form' or '/auth/login/' not in response.geturl()
+        except (urllib.error.URLError, OSError):
+            ok = False
+        latency = time.perf_counter() - started
+        with self.lock:
+            self.latencies.setdefault(name, []).append(latency)
+            if not ok:
+                self.errors[name] = self.errors.get(name, 0) + 1
+        return ok
@@ -0,0 +1,116 @@
+import json
+import os
+import pickle
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from posts import content
+from posts.models import Posts
+from posts.pagination import PER_PAGE
+
+# 목록 조회 방식: 전체 컬럼(모델 그대로) / 목록용 컬럼만(for_listing)
+QUERIES = {
+    'full': lambda: Posts.objects.select_related('created_by').order_by('-created_at', '-id'),
+    'listing': lambda: Posts.objects.for_listing().order_by('-created_at', '-id'),
+}
+
+
+# 내용이 큰 게시글 목록을 조회할 때 방식별 응답 시간과 메모리 사용량 비교
+# 임시 데이터베이스를 만들고 별도 프로세스에서 실행
+class Command(BaseCommand):
+    help = '게시글 목록 조회 방식별 응답 시간과 메모리 사용량을 비교합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=2000, help='미리 등록할 게시글 수')
+        parser.add_argument('--content-size', type=int, default=100 * 1024, help='게시글 내용 크기 (바이트)')
+        parser.add_argument('--pages', type=int, default=200, help='방식별로 조회할 페이지 수')
+        parser.add_argument('--json', action='store_true', help='결과를 JSON으로 출력')
+        parser.add_argument('--child', action='store_true', help='(내부용) 현재 데이터베이스로 측정')
+
+    def handle(self, *args, **options):
+        if options['child']:
+            self.stdout.write(json.dumps(self.measure(options)))
+            return
+
+        manage_py = str(settings.BASE_DIR / 'manage.py')
+        with tempfile.TemporaryDirectory() as tmp:
+            env = dict(os.environ, DJANGO_DB_NAME=os.path.join(tmp, 'bench.sqlite3'))
+            subprocess.run([sys.executable, manage_py, 'migrate', '--verbosity', '0'], env=env, check=True)
+            command = [sys.executable, manage_py, 'bench_post_list', '--child']
+            for option in ('posts', 'content_size', 'pages'):
+                command += [f'--{option.replace("_", "-")}', str(options[option])]
+            completed = subprocess.run(command, env=env, check=True, capture_output=True, text=True)
+
+        try:
+            results = json.loads(completed.stdout.strip().splitlines()[-1])
+        except (IndexError, ValueError) as e:
+            raise CommandError(f'측정 결과를 읽지 못했습니다: {completed.stdout}{completed.stderr}') from e
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        for name, result in results.items():
+            self.stdout.write(
+                f'{name:<8} p50 {result["p50_ms"]:7.2f}ms  p95 {result["p95_ms"]:7.2f}ms  '
+                f'페이지당 최대 메모리 {result["peak_kb"]:9.1f}KB  목록 캐시 {result["pickled_kb"]:9.1f}KB'
+            )
+        full, listing = results['full'], results['listing']
+        if listing['p50_ms'] and listing['peak_kb']:
+            self.stdout.write(self.style.SUCCESS(
+                f'for_listing: 응답 시간 {full["p50_ms"] / listing["p50_ms"]:.1f}배 빠름, '
+                f'메모리 {full["peak_kb"] / listing["peak_kb"]:.1f}배 적음'
+            ))
+
+    def seed(self, count, content_size):
+        user = User.objects.create_user('bench', password=None, first_name='벤치마크')
+        paragraph = '<p>목록 화면에서는 표시하지 않는 긴 본문입니다. <b>Django</b> ORM 조회 비교.</p>'
+        html = paragraph * (content_size // len(paragraph.encode()) + 1)
+        derived = content.derive(html)
+        for start in range(0, count, 200):
+            Posts.objects.bulk_create([
+                Posts(title=f'벤치마크 게시글 {index}', content=html, created_by=user, updated_by=user, **derived)
+                for index in range(start, min(start + 200, count))
+            ])
+
+    def measure(self, options):
+        self.seed(options['posts'], options['content_size'])
+        last_page = max((options['posts'] - 1) // PER_PAGE, 0)
+        offsets = [random.randint(0, last_page) * PER_PAGE for _ in range(options['pages'])]
+
+        results = {}
+        for name, query in QUERIES.items():
+            list(query()[:PER_PAGE])
+
+            # 응답 시간 (메모리 추적 없이 측정)
+            latencies = []
+            for offset in offsets:
+                started = time.perf_counter()
+                rows = list(query()[offset:offset + PER_PAGE])
+                latencies.append(time.perf_counter() - started)
+            latencies.sort()
+
+            # 페이지 하나를 조회할 때 할당되는 최대 메모리
+            peaks = []
+            for offset in offsets[:20]:
+                tracemalloc.start()
+                rows = list(query()[offset:offset + PER_PAGE])
+                peaks.append(tracemalloc.get_traced_memory()[1])
+                tracemalloc.stop()
+
+            results[name] = {
+                'p50_ms': statistics.median(latencies) * 1000,
+                'p95_ms': latencies[int(len(latencies) * 0.95) - 1] * 1000,
+                'peak_kb': statistics.median(peaks) / 1024,
+                # 목록 캐시에 저장되는 크기
+                'pickled_kb': len(pickle.dumps(rows)) / 1024,
+            }
+        return results
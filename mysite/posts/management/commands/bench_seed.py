@@ -0,0 +1,39 @@
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from posts import benchmarks
+
+
+# 현재 데이터베이스에 벤치마크 데이터 생성 (bench_load로 부하를 줄 서버용)
+# 사용자는 bench1, bench2, ... 이고 모두 같은 비밀번호를 사용
+class Command(BaseCommand):
+    help = '현재 데이터베이스에 벤치마크용 사용자, 게시글, 첨부 파일을 생성합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=50, help='생성할 사용자 수')
+        parser.add_argument('--posts', type=int, default=5000, help='생성할 게시글 수')
+        parser.add_argument('--attachments', type=int, default=20, help='첨부 파일을 추가할 게시글 수')
+        parser.add_argument('--file-size', type=int, default=10 * 1024 * 1024, help='첨부 파일 크기 (바이트)')
+        parser.add_argument('--password', default=benchmarks.DEFAULT_PASSWORD, help='사용자 비밀번호')
+        parser.add_argument('--seed', type=int, default=0, help='데이터 생성 시드')
+
+    def handle(self, *args, **options):
+        if User.objects.filter(username__startswith=benchmarks.USERNAME_PREFIX).exists():
+            raise CommandError(f'이미 {benchmarks.USERNAME_PREFIX}로 시작하는 사용자가 있습니다. 빈 데이터베이스에서 실행하세요.')
+
+        started = time.perf_counter()
+        created = benchmarks.generate(
+            users=options['users'],
+            posts=options['posts'],
+            attachment_count=options['attachments'],
+            file_size=options['file_size'],
+            seed=options['seed'],
+            password=options['password'],
+        )
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'사용자 {created["users"]}명, 게시글 {created["posts"]}개, 첨부 파일 {created["attachments"]}개를 '
+            f'생성했습니다. ({elapsed:.1f}초)'
+        ))
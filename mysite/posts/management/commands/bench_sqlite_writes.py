@@ -0,0 +1,144 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection
+
+from posts.models import Posts
+from posts.writes import run_serialized
+
+# (데이터베이스 설정, 쓰기 직렬화 사용 여부)
+SCENARIOS = [
+    ('development', False),
+    ('production', False),
+    ('production', True),
+]
+
+
+# 동시에 게시글을 등록할 때 데이터베이스 설정별 처리량 비교
+# 설정마다 임시 데이터베이스를 만들고 별도 프로세스에서 실행
+class Command(BaseCommand):
+    help = 'SQLite 설정별로 동시 게시글 등록 처리량을 측정합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--writers', type=int, default=8, help='게시글을 등록하는 스레드 수')
+        parser.add_argument('--readers', type=int, default=4, help='목록을 조회하는 스레드 수')
+        parser.add_argument('--writes', type=int, default=50, help='스레드별 등록 건수')
+        parser.add_argument('--child', action='store_true', help='(내부용) 현재 설정으로 측정')
+        parser.add_argument('--serialize', action='store_true', help='(내부용) 쓰기 직렬화 사용')
+
+    def handle(self, *args, **options):
+        if options['child']:
+            result = self.measure(options['writers'], options['readers'], options['writes'], options['serialize'])
+            self.stdout.write(json.dumps(result))
+            return
+
+        results = []
+        for profile, serialize in SCENARIOS:
+            result = self.run_scenario(profile, serialize, options)
+            results.append(result)
+            self.stdout.write(
+                f'{profile:<12} 직렬화 {"O" if serialize else "X"}  '
+                f'등록 {result["writes_per_sec"]:8.1f}건/초  '
+                f'조회 {result["reads_per_sec"]:8.1f}건/초  '
+                f'실패 {result["errors"]}건'
+            )
+
+        base = results[0]['writes_per_sec']
+        best = max(results, key=lambda result: result['writes_per_sec'])
+        if base:
+            self.stdout.write(self.style.SUCCESS(
+                f'{best["profile"]} (직렬화 {"O" if best["serialize"] else "X"}): '
+                f'등록 처리량 {best["writes_per_sec"] / base:.1f}배'
+            ))
+
+    def run_scenario(self, profile, serialize, options):
+        manage_py = str(settings.BASE_DIR / 'manage.py')
+        with tempfile.TemporaryDirectory() as tmp:
+            env = dict(os.environ, DJANGO_DB_PROFILE=profile, DJANGO_DB_NAME=os.path.join(tmp, 'bench.sqlite3'))
+            subprocess.run([sys.executable, manage_py, 'migrate', '--verbosity', '0'], env=env, check=True)
+
+            command = [
+                sys.executable, manage_py, 'bench_sqlite_writes', '--child',
+                '--writers', str(options['writers']),
+                '--readers', str(options['readers']),
+                '--writes', str(options['writes']),
+            ]
+            if serialize:
+                command.append('--serialize')
+            completed = subprocess.run(command, env=env, check=True, capture_output=True, text=True)
+
+        try:
+            result = json.loads(completed.stdout.strip().splitlines()[-1])
+        except (IndexError, ValueError) as e:
+            raise CommandError(f'측정 결과를 읽지 못했습니다: {completed.stdout}{completed.stderr}') from e
+        result.update(profile=profile, serialize=serialize)
+        return result
+
+    # 현재 데이터베이스 설정으로 측정
+    def measure(self, writers, readers, writes, serialize):
+        user = User.objects.create_user('bench', password=None, first_name='벤치마크')
+        errors = []
+        reads = []
+        done = threading.Event()
+
+        def create_post(index):
+            Posts.objects.create(title=f'벤치마크 {index}', content='<p>동시 등록 테스트</p>', created_by=user, updated_by=user)
+
+        def write(worker):
+            try:
+                for index in range(writes):
+                    try:
+                        if serialize:
+                            run_serialized(create_post, f'{worker}-{index}')
+                        else:
+                            create_post(f'{worker}-{index}')
+                    except OperationalError:
+                        errors.append(1)
+            finally:
+                connection.close()
+
+        def read():
+            count = 0
+            try:
+                while not done.is_set():
+                    try:
+                        list(Posts.objects.for_listing().order_by('-created_at', '-id')[:10])
+                        count += 1
+                    except OperationalError:
+                        errors.append(1)
+            finally:
+                reads.append(count)
+                connection.close()
+
+        reader_threads = [threading.Thread(target=read) for _ in range(readers)]
+        writer_threads = [threading.Thread(target=write, args=(worker,)) for worker in range(writers)]
+        for thread in reader_threads:
+            thread.start()
+
+        started = time.perf_counter()
+        for thread in writer_threads:
+            thread.start()
+        for thread in writer_threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        done.set()
+        for thread in reader_threads:
+            thread.join()
+
+        created = Posts.objects.count()
+        return {
+            'writes': created,
+            'errors': len(errors),
+            'elapsed': elapsed,
+            'writes_per_sec': created / elapsed if elapsed else 0,
+            'reads_per_sec': sum(reads) / elapsed if elapsed else 0,
+        }
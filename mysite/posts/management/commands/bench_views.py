@@ -0,0 +1,193 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+
+from posts import benchmarks, pagination
+from posts.models import Posts
+
+SEARCH_TYPES = ['all', 'title', 'content', 'full_name']
+
+
+# 화면별 마이크로 벤치마크 (테스트 클라이언트로 요청, 서버 없음)
+# 임시 데이터베이스에 벤치마크 데이터를 만들고 별도 프로세스에서 실행, 결과는 JSON으로 저장해서 커밋별로 비교
+class Command(BaseCommand):
+    help = '게시판 화면별 응답 시간을 측정하고 결과를 JSON으로 저장합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=50, help='생성할 사용자 수')
+        parser.add_argument('--posts', type=int, default=5000, help='생성할 게시글 수')
+        parser.add_argument('--attachments', type=int, default=5, help='첨부 파일을 추가할 게시글 수')
+        parser.add_argument('--file-size', type=int, default=10 * 1024 * 1024, help='첨부 파일 크기 (바이트)')
+        parser.add_argument('--iterations', type=int, default=200, help='화면별 요청 수')
+        parser.add_argument('--login-iterations', type=int, default=20, help='로그인 요청 수 (비밀번호 해시 계산이 느림)')
+        parser.add_argument('--seed', type=int, default=0, help='데이터 생성 시드')
+        parser.add_argument('--only', nargs='+', metavar='NAME', help='지정한 항목만 측정 (예: list_shallow read)')
+        parser.add_argument('--output', help='결과를 저장할 JSON 파일')
+        parser.add_argument('--compare', metavar='JSON', help='이전 결과 파일과 비교')
+        parser.add_argument('--child', action='store_true', help='(내부용) 현재 데이터베이스로 측정')
+
+    def handle(self, *args, **options):
+        if options['child']:
+            self.stdout.write(json.dumps(self.measure(options)))
+            return
+
+        results = self.run_child(options)
+        recorded = {key: options[key] for key in ('users', 'posts', 'attachments', 'file_size', 'iterations', 'seed')}
+        if options['output']:
+            benchmarks.save_results(options['output'], 'bench_views', recorded, results)
+
+        for name, result in results.items():
+            self.stdout.write(
+                f'{name:<22} p50 {result["p50_ms"]:8.2f}ms  p95 {result["p95_ms"]:8.2f}ms  '
+                f'{result["requests_per_sec"]:8.1f}건/초  쿼리 {result["queries"]:3}개  '
+                f'{result["bytes"] / 1024:9.1f}KB  오류 {result["errors"]}건'
+            )
+        if options['compare']:
+            self.print_comparison(benchmarks.load_results(options['compare']), results)
+        if options['output']:
+            self.stdout.write(self.style.SUCCESS(f'결과를 {options["output"]}에 저장했습니다.'))
+
+    def run_child(self, options):
+        manage_py = str(settings.BASE_DIR / 'manage.py')
+        with tempfile.TemporaryDirectory() as tmp:
+            # 로그인을 반복해서 측정하므로 로그인 요청 제한은 끔
+            env = dict(os.environ, DJANGO_DB_NAME=os.path.join(tmp, 'bench.sqlite3'), DJANGO_RATELIMIT_ENABLED='0')
+            subprocess.run([sys.executable, manage_py, 'migrate', '--verbosity', '0'], env=env, check=True)
+            command = [sys.executable, manage_py, 'bench_views', '--child']
+            for option in ('users', 'posts', 'attachments', 'file_size', 'iterations', 'login_iterations', 'seed'):
+                command += [f'--{option.replace("_", "-")}', str(options[option])]
+            if options['only']:
+                command += ['--only', *options['only']]
+            completed = subprocess.run(command, env=env, check=True, capture_output=True, text=True)
+
+        try:
+            return json.loads(completed.stdout.strip().splitlines()[-1])
+        except (IndexError, ValueError) as e:
+            raise CommandError(f'측정 결과를 읽지 못했습니다: {completed.stdout}{completed.stderr}') from e
+
+    def print_comparison(self, previous, results):
+        self.stdout.write(self.style.MIGRATE_HEADING(f'== {previous.get("revision") or "이전 결과"} 대비'))
+        for name, before, after, changes in benchmarks.compare(previous['results'], results):
+            change = changes['p50_ms']
+            text = f'{name:<22} p50 {before["p50_ms"]:8.2f}ms → {after["p50_ms"]:8.2f}ms'
+            if change is None:
+                self.stdout.write(text)
+                continue
+            style = self.style.ERROR if change > 10 else self.style.SUCCESS if change < -10 else str
+            self.stdout.write(style(f'{text}  ({change:+.1f}%)'))
+
+    # 현재 프로세스에서 측정
+    def measure(self, options):
+        with tempfile.TemporaryDirectory() as media_root, override_settings(MEDIA_ROOT=media_root):
+            benchmarks.generate(
+                users=options['users'],
+                posts=options['posts'],
+                attachment_count=options['attachments'],
+                file_size=options['file_size'],
+                seed=options['seed'],
+            )
+            scenarios = self.scenarios(options)
+            if options['only']:
+                scenarios = {name: scenario for name, scenario in scenarios.items() if name in options['only']}
+            return {name: self.run(*scenario) for name, scenario in scenarios.items()}
+
+    # 이름 → (요청 함수, 요청 수)
+    def scenarios(self, options):
+        host = self.host()
+        client = Client(HTTP_HOST=host)
+        client.force_login(User.objects.get(username=f'{benchmarks.USERNAME_PREFIX}1'))
+        iterations = options['iterations']
+        rng = benchmarks.make_rng(options['seed'])
+
+        post_ids = list(Posts.objects.values_list('id', flat=True))
+        download_ids = list(Posts.objects.exclude(filename__isnull=True).exclude(filename='').values_list('id', flat=True))
+        author = Posts.objects.select_related('created_by').first().created_by
+
+        scenarios = {
+            'list_shallow': (lambda: client.get('/posts/'), iterations),
+            'list_deep': (lambda path=self.deep_list_path(): client.get(path), iterations),
+        }
+        keywords = {
+            'all': benchmarks.SUBJECTS[0],
+            'title': benchmarks.SUBJECTS[1],
+            'content': benchmarks.SUBJECTS[2],
+            'full_name': author.first_name,
+        }
+        for search_type in SEARCH_TYPES:
+            data = {'searchType': search_type, 'searchKeyword': keywords[search_type]}
+            scenarios[f'search_{search_type}'] = (lambda data=data: client.get('/posts/', data), iterations)
+        scenarios['read'] = (lambda: client.get(f'/posts/read/{rng.choice(post_ids)}/'), iterations)
+        if download_ids:
+            scenarios['download'] = (
+                lambda: client.get(f'/posts/download/{rng.choice(download_ids)}/'),
+                max(iterations // 10, 1),
+            )
+
+        def login():
+            return Client(HTTP_HOST=host).post('/auth/login/', {
+                'username': f'{benchmarks.USERNAME_PREFIX}1', 'password': benchmarks.DEFAULT_PASSWORD,
+            })
+        scenarios['login'] = (login, options['login_iterations'])
+        return scenarios
+
+    # 90% 위치의 목록 페이지 (게시글이 많으면 커서, 적으면 페이지 번호)
+    def deep_list_path(self):
+        total = Posts.objects.count()
+        offset = int(total * 0.9)
+        cursor_mode = pagination.PAGINATION_MODE == 'cursor' or (
+            pagination.PAGINATION_MODE == 'auto' and total > pagination.CURSOR_THRESHOLD
+        )
+        if not cursor_mode:
+            return f'/posts/?page={offset // pagination.PER_PAGE + 1}'
+        post = Posts.objects.only('id', 'created_at').order_by('-created_at', '-id')[offset]
+        return f'/posts/?cursor={pagination.encode_cursor("next", post, total - offset)}'
+
+    def host(self):
+        hosts = [host for host in settings.ALLOWED_HOSTS if host != '*' and not host.startswith('.')]
+        return hosts[0] if hosts else 'localhost'
+
+    def run(self, request, iterations):
+        queries = []
+
+        def count(execute, sql, params, many, context):
+            queries[-1] += 1
+            return execute(sql, params, many, context)
+
+        # 캐시와 연결을 채우는 요청 (측정하지 않음)
+        for _ in range(min(5, iterations)):
+            self.consume(request())
+
+        latencies, errors, size = [], 0, 0
+        with connection.execute_wrapper(count):
+            for _ in range(iterations):
+                queries.append(0)
+                started = time.perf_counter()
+                response = request()
+                size = self.consume(response)
+                latencies.append(time.perf_counter() - started)
+                if self.is_error(response):
+                    errors += 1
+        return benchmarks.summarize(latencies, errors, queries=max(queries, default=0), bytes=size)
+
+    # 로그인 화면으로 돌아가는 리다이렉트(로그인 실패, 세션 없음)도 오류로 계산
+    def is_error(self, response):
+        return response.status_code >= 400 or '/auth/login/' in response.get('Location', '')
+
+    # 응답 본문을 끝까지 읽음 (스트리밍 응답 포함)
+    def consume(self, response):
+        if not response.streaming:
+            return len(response.content)
+        size = 0
+        for chunk in response.streaming_content:
+            size += len(chunk)
+        response.close()
+        return size
@@ -0,0 +1,209 @@
+import asyncio
+import io
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client, override_settings
+
+from posts import attachments, counters
+from posts.models import Posts
+
+MODES = ['wsgi', 'asgi']
+
+
+# 같은 화면을 WSGI(동기 화면, 스레드)와 ASGI(비동기 화면, 이벤트 루프)로 동시에 요청해서 비교
+# 서버 없이 애플리케이션을 직접 호출하며, 방식마다 임시 데이터베이스와 별도 프로세스에서 실행
+class Command(BaseCommand):
+    help = 'WSGI와 ASGI의 초당 요청 수와 메모리 사용량을 비교합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=100, help='동시 요청 수 (WSGI는 스레드 수)')
+        parser.add_argument('--requests', type=int, default=2000, help='화면별 전체 요청 수')
+        parser.add_argument('--posts', type=int, default=200, help='미리 등록할 게시글 수')
+        parser.add_argument('--file-size', type=int, default=1024 * 1024, help='다운로드할 첨부 파일 크기 (바이트)')
+        parser.add_argument('--json', action='store_true', help='결과를 JSON으로 출력')
+        parser.add_argument('--child', choices=MODES, help='(내부용) 지정한 방식으로 측정')
+
+    def handle(self, *args, **options):
+        if options['child']:
+            self.stdout.write(json.dumps(self.measure(options['child'], options)))
+            return
+
+        results = {mode: self.run_mode(mode, options) for mode in MODES}
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        for mode, result in results.items():
+            self.stdout.write(self.style.MIGRATE_HEADING(f'== {mode.upper()} (최대 메모리 {result["max_rss_mb"]:.1f}MB)'))
+            for view, stats in result['views'].items():
+                self.stdout.write(
+                    f'{view:<10} {stats["requests_per_sec"]:8.1f}건/초  '
+                    f'p50 {stats["p50_ms"]:7.1f}ms  p95 {stats["p95_ms"]:7.1f}ms  오류 {stats["errors"]}건'
+                )
+
+    def run_mode(self, mode, options):
+        manage_py = str(settings.BASE_DIR / 'manage.py')
+        with tempfile.TemporaryDirectory() as tmp:
+            env = dict(
+                os.environ,
+                DJANGO_DB_NAME=os.path.join(tmp, 'bench.sqlite3'),
+                DJANGO_ASYNC_VIEWS='1' if mode == 'asgi' else '0',
+            )
+            subprocess.run([sys.executable, manage_py, 'migrate', '--verbosity', '0'], env=env, check=True)
+
+            command = [sys.executable, manage_py, 'bench_wsgi_asgi', '--child', mode]
+            for option in ('concurrency', 'requests', 'posts', 'file_size'):
+                command += [f'--{option.replace("_", "-")}', str(options[option])]
+            completed = subprocess.run(command, env=env, check=True, capture_output=True, text=True)
+
+        try:
+            return json.loads(completed.stdout.strip().splitlines()[-1])
+        except (IndexError, ValueError) as e:
+            raise CommandError(f'측정 결과를 읽지 못했습니다: {completed.stdout}{completed.stderr}') from e
+
+    # 현재 프로세스에서 측정
+    def measure(self, mode, options):
+        with tempfile.TemporaryDirectory() as media_root, override_settings(MEDIA_ROOT=media_root):
+            paths, cookie = self.seed(options['posts'], options['file_size'])
+            run = self.run_wsgi if mode == 'wsgi' else self.run_asgi
+            views = {
+                view: run(path, cookie, options['concurrency'], options['requests'])
+                for view, path in paths.items()
+            }
+        return {
+            'mode': mode,
+            'views': views,
+            'max_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        }
+
+    def seed(self, count, file_size):
+        user = User.objects.create_user('bench', password=None, first_name='벤치마크')
+        Posts.objects.bulk_create([
+            Posts(title=f'벤치마크 게시글 {index}', content='<p>비동기 화면 성능 측정</p>', created_by=user, updated_by=user)
+            for index in range(count)
+        ])
+        # bulk_create는 시그널을 거치지 않으므로 게시글 수 카운터를 다시 계산
+        counters.recount_posts()
+        post = Posts.objects.order_by('-id').first()
+        post.filename = attachments.store(ContentFile(os.urandom(file_size), name='bench.bin'))
+        post.original_filename = 'bench.bin'
+        post.save()
+
+        client = Client()
+        client.force_login(user)
+        cookie = f'{settings.SESSION_COOKIE_NAME}={client.cookies[settings.SESSION_COOKIE_NAME].value}'
+        return {
+            'list': '/posts/',
+            'read': f'/posts/read/{post.id}/',
+            'download': f'/posts/download/{post.id}/',
+        }, cookie
+
+    def host(self):
+        hosts = [host for host in settings.ALLOWED_HOSTS if host != '*' and not host.startswith('.')]
+        return hosts[0] if hosts else 'localhost'
+
+    def summary(self, latencies, errors, elapsed):
+        latencies.sort()
+        return {
+            'requests': len(latencies),
+            'errors': errors,
+            'requests_per_sec': len(latencies) / elapsed if elapsed else 0,
+            'p50_ms': statistics.median(latencies) * 1000 if latencies else 0,
+            'p95_ms': latencies[int(len(latencies) * 0.95) - 1] * 1000 if latencies else 0,
+        }
+
+    # WSGI: 스레드마다 동기 화면 호출
+    def run_wsgi(self, path, cookie, concurrency, total):
+        from django.core.wsgi import get_wsgi_application
+        application = get_wsgi_application()
+        lock = threading.Lock()
+        latencies, errors = [], []
+
+        def request(_):
+            environ = {
+                'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': '', 'SCRIPT_NAME': '',
+                'SERVER_NAME': self.host(), 'SERVER_PORT': '80', 'HTTP_HOST': self.host(), 'HTTP_COOKIE': cookie,
+                'SERVER_PROTOCOL': 'HTTP/1.1', 'wsgi.input': io.BytesIO(), 'wsgi.errors': sys.stderr,
+                'wsgi.url_scheme': 'http', 'wsgi.multithread': True, 'wsgi.multiprocess': False,
+            }
+            status = []
+            started = time.perf_counter()
+            body = application(environ, lambda s, headers, exc_info=None: status.append(s))
+            try:
+                for _chunk in body:
+                    pass
+            finally:
+                body.close()
+            with lock:
+                latencies.append(time.perf_counter() - started)
+                if not status[0].startswith('200'):
+                    errors.append(status[0])
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(request, range(total)))
+        return self.summary(latencies, len(errors), time.perf_counter() - started)
+
+    # ASGI: 하나의 이벤트 루프에서 비동기 화면 호출
+    def run_asgi(self, path, cookie, concurrency, total):
+        from django.core.asgi import get_asgi_application
+        application = get_asgi_application()
+        latencies, errors = [], []
+
+        async def request():
+            scope = {
+                'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+                'scheme': 'http', 'path': path, 'raw_path': path.encode(), 'query_string': b'', 'root_path': '',
+                'headers': [(b'host', self.host().encode()), (b'cookie', cookie.encode())],
+                'client': ('127.0.0.1', 50000), 'server': (self.host(), 80),
+            }
+            disconnected = asyncio.Event()
+            received = False
+            status = []
+
+            async def receive():
+                nonlocal received
+                if not received:
+                    received = True
+                    return {'type': 'http.request', 'body': b'', 'more_body': False}
+                await disconnected.wait()
+                return {'type': 'http.disconnect'}
+
+            async def send(message):
+                if message['type'] == 'http.response.start':
+                    status.append(message['status'])
+
+            started = time.perf_counter()
+            await application(scope, receive, send)
+            disconnected.set()
+            latencies.append(time.perf_counter() - started)
+            if status[0] != 200:
+                errors.append(status[0])
+
+        async def worker(queue):
+            while not queue.empty():
+                queue.get_nowait()
+                await request()
+
+        async def main():
+            queue = asyncio.Queue()
+            for index in range(total):
+                queue.put_nowait(index)
+            await asyncio.gather(*(worker(queue) for _ in range(concurrency)))
+
+        started = time.perf_counter()
+        asyncio.run(main())
+        return self.summary(latencies, len(errors), time.perf_counter() - started)
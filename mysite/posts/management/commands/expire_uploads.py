@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from posts import uploads
+
+
+# 만료된 분할 업로드 정리 (작업 큐를 돌리지 않는 환경에서는 cron 등으로 주기적으로 실행)
+class Command(BaseCommand):
+    help = '만료 시각이 지난 분할 업로드를 취소하고 받은 조각과 연결하지 않은 파일의 참조를 정리합니다.'
+
+    def handle(self, *args, **options):
+        expired = uploads.expire_sessions()
+        self.stdout.write(self.style.SUCCESS(f'만료된 업로드 {expired}건을 취소했습니다.'))
+        next_expiry = uploads.next_expiry()
+        if next_expiry is not None:
+            self.stdout.write(f'다음 만료 예정: {next_expiry:%Y-%m-%d %H:%M}')
@@ -0,0 +1,115 @@
+from django.contrib.auth.models import User
+from django.contrib.sessions.backends.base import SessionBase
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import RequestFactory, override_settings
+from django.urls import resolve, reverse
+
+from posts.models import Posts
+
+# 캐시에 가려지지 않도록 캐시를 끄고 실행
+NO_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+
+
+# 화면별 쿼리 실행 계획 출력 (인덱스를 타지 않는 쿼리 확인용)
+class Command(BaseCommand):
+    help = '화면별로 실행되는 쿼리의 EXPLAIN 결과를 출력합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--username', help='화면을 조회할 사용자 (기본값: 첫 번째 사용자)')
+        parser.add_argument('--keyword', default='게시글', help='검색 화면에서 사용할 검색어')
+
+    def handle(self, *args, **options):
+        if options['username']:
+            user = User.objects.filter(username=options['username']).first()
+        else:
+            user = User.objects.order_by('id').first()
+        if user is None:
+            raise CommandError('화면을 조회할 사용자가 없습니다.')
+
+        post = Posts.objects.only('id').order_by('-created_at', '-id').first()
+        attached = Posts.objects.only('id').filter(filename__isnull=False).order_by('-created_at', '-id').first()
+        keyword = options['keyword']
+
+        scans = 0
+        with override_settings(CACHES=NO_CACHE):
+            for title, path in self.view_paths(post, attached, keyword):
+                self.stdout.write(self.style.MIGRATE_HEADING(f'== {title} ({path})'))
+                for sql, params in self.capture(path, user):
+                    scans += self.explain(sql, params)
+
+        for title, queryset in self.account_querysets(user):
+            self.stdout.write(self.style.MIGRATE_HEADING(f'== {title}'))
+            sql, params = queryset.query.sql_with_params()
+            scans += self.explain(sql, params)
+
+        if scans:
+            self.stdout.write(self.style.WARNING(f'인덱스 없이 전체를 읽는 쿼리가 {scans}개 있습니다.'))
+        else:
+            self.stdout.write(self.style.SUCCESS('모든 쿼리가 인덱스를 사용합니다.'))
+
+    def view_paths(self, post, attached, keyword):
+        list_url = reverse('posts:list')
+        yield '게시글 목록', list_url
+        yield '게시글 목록 (커서)', f'{list_url}?date=2000-01-01'
+        for search_type in ('all', 'title', 'content', 'full_name'):
+            yield f'게시글 검색 ({search_type})', f'{list_url}?searchType={search_type}&searchKeyword={keyword}'
+        if post:
+            yield '게시글 보기', reverse('posts:read', args=[post.id])
+        if attached:
+            yield '첨부 파일 다운로드', reverse('posts:download', args=[attached.id])
+
+    # 아이디 찾기/비밀번호 초기화는 데이터를 바꾸므로 화면과 같은 조건의 쿼리만 확인
+    def account_querysets(self, user):
+        yield '아이디 찾기', User.objects.filter(first_name=user.first_name, email=user.email)
+        yield '비밀번호 초기화', User.objects.filter(
+            first_name=user.first_name, username=user.username, email=user.email,
+        )
+
+    # 화면을 직접 호출하면서 실행된 SELECT 쿼리 수집
+    def capture(self, path, user):
+        queries = []
+
+        def wrapper(execute, sql, params, many, context):
+            if sql.lstrip().upper().startswith('SELECT'):
+                queries.append((sql, params))
+            return execute(sql, params, many, context)
+
+        request = RequestFactory().get(path)
+        request.user = user
+        request.session = SessionBase()
+        match = resolve(request.path_info)
+        with connection.execute_wrapper(wrapper):
+            try:
+                response = match.func(request, *match.args, **match.kwargs)
+                if hasattr(response, 'render'):
+                    response.render()
+                response.close()
+            except Exception as e:
+                self.stdout.write(self.style.ERROR(f'   화면 호출 실패: {e}'))
+        return queries
+
+    # 실행 계획 출력, 전체 테이블을 읽는 단계 수 반환
+    def explain(self, sql, params):
+        self.stdout.write(sql)
+        if params:
+            self.stdout.write(f'   params: {list(params)}')
+        with connection.cursor() as cursor:
+            cursor.execute(f'{connection.ops.explain_query_prefix()} {sql}', params)
+            rows = cursor.fetchall()
+
+        scans = 0
+        for row in rows:
+            line = str(row[-1]) if connection.vendor == 'sqlite' else ' '.join(str(value) for value in row)
+            if self.is_full_scan(line):
+                scans += 1
+                self.stdout.write(self.style.WARNING(f'   {line}'))
+            else:
+                self.stdout.write(f'   {line}')
+        self.stdout.write('')
+        return scans
+
+    def is_full_scan(self, line):
+        if connection.vendor == 'sqlite':
+            return line.startswith('SCAN') and 'INDEX' not in line
+        return 'Seq Scan' in line or 'type: ALL' in line
@@ -0,0 +1,92 @@
+import time
+from concurrent.futures import as_completed
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+
+from posts import attachments, imaging, thumbnails
+from posts.models import Attachment
+
+
+# 기존 첨부 파일의 형식 확인 후 이미지의 미리보기 이미지를 묶음 단위로 여러 프로세스에서 생성
+# (새 첨부 파일은 백그라운드 작업에서 자동으로 생성됨)
+class Command(BaseCommand):
+    help = '기존 이미지 첨부 파일의 미리보기 이미지를 생성합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=20, help='한 번에 변환할 이미지 수')
+        parser.add_argument('--processes', type=int, default=None, help='변환 프로세스 수 (기본값: CPU 수)')
+        parser.add_argument('--force', action='store_true', help='미리보기 이미지가 있어도 다시 생성')
+
+    def handle(self, *args, **options):
+        try:
+            thumbnails.require_pillow()
+        except ImproperlyConfigured as e:
+            raise CommandError(str(e)) from e
+
+        sniffed = self.sniff_unknown()
+        if sniffed:
+            self.stdout.write(f'{sniffed}개 첨부 파일의 형식을 확인했습니다.')
+
+        attachments_qs = Attachment.objects.filter(content_type__in=imaging.CONTENT_TYPES, ref_count__gt=0)
+        if not options['force']:
+            attachments_qs = attachments_qs.filter(variants={})
+
+        pool = thumbnails.get_pool(options['processes'])
+        generated = failed = source_bytes = 0
+        started = time.perf_counter()
+        last_id = 0
+        try:
+            while True:
+                batch = list(attachments_qs.filter(id__gt=last_id).order_by('id')[:options['batch_size']])
+                if not batch:
+                    break
+                last_id = batch[-1].id
+
+                # 원본 읽기는 현재 프로세스, 변환은 프로세스 풀에서 동시에 실행
+                futures = {}
+                for attachment in batch:
+                    try:
+                        data = thumbnails.load_source(attachment)
+                    except FileNotFoundError:
+                        self.stderr.write(f'원본 파일이 없습니다: {attachment.digest}')
+                        failed += 1
+                        continue
+                    if data is None:
+                        thumbnails.save_variants(attachment, None)
+                        failed += 1
+                        continue
+                    source_bytes += len(data)
+                    future = pool.submit(imaging.render_variants, data, thumbnails.SIZES, thumbnails.QUALITY)
+                    futures[future] = attachment
+
+                for future in as_completed(futures):
+                    result = future.result()
+                    thumbnails.save_variants(futures[future], result)
+                    if result is None:
+                        failed += 1
+                    else:
+                        generated += 1
+                self.stdout.write(f'{generated + failed}개 처리...')
+        finally:
+            thumbnails.shutdown_pool()
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'미리보기 이미지 생성: {generated}개, 실패: {failed}개, {elapsed:.1f}초 '
+            f'({generated / elapsed if elapsed else 0:.1f}개/초, '
+            f'{source_bytes / 1024 / 1024 / elapsed if elapsed else 0:.1f}MB/초)'
+        ))
+
+    # 형식을 확인하지 않은 첨부 파일 (미리보기 기능 추가 전에 등록된 파일)
+    def sniff_unknown(self):
+        count = 0
+        for attachment in Attachment.objects.filter(content_type='').only('id', 'digest').iterator():
+            try:
+                content_type = attachments.sniff_stored(attachments.digest_name(attachment.digest))
+            except FileNotFoundError:
+                self.stderr.write(f'원본 파일이 없습니다: {attachment.digest}')
+                continue
+            Attachment.objects.filter(id=attachment.id).update(content_type=content_type)
+            count += 1
+        return count
@@ -0,0 +1,50 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand
+
+from posts import transfer
+
+
+# 게시글을 JSONL/CSV로 내보내기 (첨부 파일은 --attachments로 tar 파일 생성)
+# 게시글은 서버 측 커서로 조금씩 읽어서 바로 쓰므로 게시글 수와 상관없이 메모리 사용량 일정
+class Command(BaseCommand):
+    help = '게시글을 JSONL 또는 CSV 파일로 내보냅니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('output', help='저장할 파일 (-: 표준 출력)')
+        parser.add_argument('--format', choices=transfer.FORMATS, help='파일 형식 (기본값: 확장자로 판단)')
+        parser.add_argument('--attachments', help='첨부 파일을 저장할 tar 파일')
+        parser.add_argument('--chunk-size', type=int, default=2000, help='한 번에 읽을 게시글 수')
+
+    def handle(self, *args, **options):
+        output = options['output']
+        fmt = transfer.detect_format(output, options['format'])
+        # 표준 출력으로 내보낼 때는 진행 상황을 표준 오류로 출력
+        log = self.stderr if output == '-' else self.stdout
+
+        started = time.perf_counter()
+        count = 0
+        stream = sys.stdout if output == '-' else open(output, 'w', encoding='utf-8', newline='')
+        try:
+            records = transfer.export_records(options['chunk_size'])
+            for count, _record in enumerate(transfer.write_records(records, stream, fmt), 1):
+                if count % 10000 == 0:
+                    log.write(f'{count}개 내보내는 중...')
+        finally:
+            if stream is not sys.stdout:
+                stream.close()
+        elapsed = time.perf_counter() - started
+        log.write(self.style.SUCCESS(
+            f'게시글 {count}개를 내보냈습니다. ({elapsed:.1f}초, {count / elapsed if elapsed else 0:.0f}개/초)'
+        ))
+
+        if options['attachments']:
+            started = time.perf_counter()
+            with open(options['attachments'], 'wb') as f:
+                files, size = transfer.export_attachments(f, options['chunk_size'])
+            elapsed = time.perf_counter() - started
+            log.write(self.style.SUCCESS(
+                f'첨부 파일 {files}개 ({size / 1024 / 1024:.1f}MB)를 내보냈습니다. '
+                f'({elapsed:.1f}초, {size / 1024 / 1024 / elapsed if elapsed else 0:.1f}MB/초)'
+            ))
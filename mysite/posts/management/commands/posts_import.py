@@ -0,0 +1,70 @@
+import sys
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from posts import cache, counters, transfer
+
+
+# posts_export로 내보낸 JSONL/CSV 파일에서 게시글 가져오기
+# 작성자는 아이디(username)로 찾고, 게시글은 묶음마다 하나의 트랜잭션으로 bulk_create
+class Command(BaseCommand):
+    help = 'JSONL 또는 CSV 파일에서 게시글을 가져옵니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('input', help='가져올 파일 (-: 표준 입력)')
+        parser.add_argument('--format', choices=transfer.FORMATS, help='파일 형식 (기본값: 확장자로 판단)')
+        parser.add_argument('--attachments', help='posts_export로 만든 첨부 파일 tar 파일')
+        parser.add_argument('--batch-size', type=int, default=1000, help='한 번에 저장할 게시글 수')
+        parser.add_argument('--default-user', help='작성자를 찾을 수 없을 때 사용할 아이디 (없으면 건너뜀)')
+
+    def handle(self, *args, **options):
+        default_user = None
+        if options['default_user']:
+            default_user = User.objects.filter(username=options['default_user']).first()
+            if default_user is None:
+                raise CommandError(f'사용자를 찾을 수 없습니다: {options["default_user"]}')
+        importer = transfer.Importer(options['batch_size'], default_user)
+
+        try:
+            if options['attachments']:
+                started = time.perf_counter()
+                with open(options['attachments'], 'rb') as f:
+                    files, size = importer.import_attachments(f)
+                elapsed = time.perf_counter() - started
+                self.stdout.write(
+                    f'첨부 파일 {files}개 ({size / 1024 / 1024:.1f}MB)를 저장했습니다. '
+                    f'({elapsed:.1f}초, {size / 1024 / 1024 / elapsed if elapsed else 0:.1f}MB/초)'
+                )
+
+            started = time.perf_counter()
+            source = options['input']
+            fmt = transfer.detect_format(source, options['format'])
+            stream = sys.stdin if source == '-' else open(source, encoding='utf-8', newline='')
+            try:
+                importer.import_records(transfer.read_records(stream, fmt), self.progress)
+            finally:
+                if stream is not sys.stdin:
+                    stream.close()
+        finally:
+            # 게시글이 참조하지 않는 첨부 파일 정리
+            importer.release_staged()
+            # bulk_create는 시그널을 거치지 않으므로 게시글 수 카운터와 목록 캐시 갱신
+            counters.recount_posts()
+            cache.bump_list_generation()
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'게시글 {importer.created}개를 가져왔습니다. ({elapsed:.1f}초, '
+            f'{importer.created / elapsed if elapsed else 0:.0f}개/초)'
+        ))
+        if importer.skipped:
+            self.stdout.write(self.style.WARNING(f'작성자를 찾을 수 없어 건너뛴 게시글: {importer.skipped}개'))
+        if importer.missing_attachments:
+            self.stdout.write(self.style.WARNING(
+                f'첨부 파일을 찾을 수 없어 첨부 없이 가져온 게시글: {importer.missing_attachments}개'
+            ))
+
+    def progress(self, importer):
+        self.stdout.write(f'{importer.created}개 가져오는 중...')
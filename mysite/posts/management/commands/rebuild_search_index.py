@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from posts import search
+from posts.models import Posts
+
+
+# 게시글 검색 인덱스 전체 재생성
+class Command(BaseCommand):
+    help = '게시글 전문 검색 인덱스를 다시 생성합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        if not search.is_enabled():
+            self.stdout.write('전문 검색을 지원하지 않는 데이터베이스입니다.')
+            return
+        count = search.rebuild_index(Posts.objects.all(), batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'{count}개의 게시글을 색인했습니다.'))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from posts import cache, counters
+
+
+# 전체 게시글 수 카운터 재계산 (bulk_create 등 시그널을 거치지 않은 작업 후 실행)
+class Command(BaseCommand):
+    help = '전체 게시글 수 카운터를 다시 계산합니다.'
+
+    def handle(self, *args, **options):
+        count = counters.recount_posts()
+        cache.bump_list_generation()
+        self.stdout.write(self.style.SUCCESS(f'전체 게시글 수: {count}'))
@@ -0,0 +1,95 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:57
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Attachment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('digest', models.CharField(max_length=64, unique=True, verbose_name='해시')),
+                ('size', models.BigIntegerField(verbose_name='크기')),
+                ('ref_count', models.PositiveIntegerField(default=0, verbose_name='참조 수')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='등록일시')),
+            ],
+            options={
+                'verbose_name': '첨부 파일',
+                'verbose_name_plural': '첨부 파일 목록',
+                'db_table': 'posts_attachments',
+            },
+        ),
+        migrations.CreateModel(
+            name='Counter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True, verbose_name='이름')),
+                ('value', models.BigIntegerField(default=0, verbose_name='값')),
+            ],
+            options={
+                'verbose_name': '카운터',
+                'verbose_name_plural': '카운터 목록',
+                'db_table': 'posts_counters',
+            },
+        ),
+        migrations.CreateModel(
+            name='Posts',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=100, verbose_name='제목')),
+                ('content', models.TextField(verbose_name='내용')),
+                ('filename', models.CharField(blank=True, max_length=100, null=True, verbose_name='파일명')),
+                ('original_filename', models.CharField(blank=True, max_length=100, null=True, verbose_name='원본파일명')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='작성일시')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='수정일시')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='posts_created_by', to=settings.AUTH_USER_MODEL, verbose_name='작성자')),
+                ('updated_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='posts_updated_by', to=settings.AUTH_USER_MODEL, verbose_name='수정자')),
+            ],
+            options={
+                'verbose_name': '게시글',
+                'verbose_name_plural': '게시글 목록',
+                'db_table': 'posts',
+            },
+        ),
+        migrations.CreateModel(
+            name='UploadSession',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('filename', models.CharField(max_length=100, verbose_name='원본파일명')),
+                ('size', models.BigIntegerField(verbose_name='크기')),
+                ('chunk_size', models.PositiveIntegerField(verbose_name='조각 크기')),
+                ('received', models.BigIntegerField(default=0, verbose_name='받은 크기')),
+                ('storage_upload_id', models.CharField(max_length=1024, verbose_name='저장소 업로드 ID')),
+                ('digest', models.CharField(blank=True, max_length=64, null=True, verbose_name='해시')),
+                ('status', models.CharField(choices=[('uploading', '업로드 중'), ('completed', '업로드 완료'), ('attached', '첨부 완료'), ('aborted', '취소')], default='uploading', max_length=20, verbose_name='상태')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='등록일시')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='수정일시')),
+                ('created_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='upload_sessions', to=settings.AUTH_USER_MODEL, verbose_name='작성자')),
+                ('post', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='upload_sessions', to='posts.posts', verbose_name='게시글')),
+            ],
+            options={
+                'verbose_name': '분할 업로드',
+                'verbose_name_plural': '분할 업로드 목록',
+                'db_table': 'posts_upload_sessions',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='posts',
+            index=models.Index(fields=['-created_at', '-id'], name='posts_created_at_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='posts',
+            index=models.Index(fields=['created_by', '-created_at'], name='posts_created_by_created_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attachment',
+            name='content_type',
+            field=models.CharField(blank=True, default='', max_length=100, verbose_name='형식'),
+        ),
+        migrations.AddField(
+            model_name='attachment',
+            name='height',
+            field=models.PositiveIntegerField(blank=True, null=True, verbose_name='높이'),
+        ),
+        migrations.AddField(
+            model_name='attachment',
+            name='variants',
+            field=models.JSONField(blank=True, default=dict, verbose_name='미리보기'),
+        ),
+        migrations.AddField(
+            model_name='attachment',
+            name='width',
+            field=models.PositiveIntegerField(blank=True, null=True, verbose_name='너비'),
+        ),
+    ]
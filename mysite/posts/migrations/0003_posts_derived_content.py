@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0002_attachment_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='posts',
+            name='char_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='글자 수'),
+        ),
+        migrations.AddField(
+            model_name='posts',
+            name='content_html',
+            field=models.TextField(blank=True, editable=False, null=True, verbose_name='정리된 내용'),
+        ),
+        migrations.AddField(
+            model_name='posts',
+            name='excerpt',
+            field=models.TextField(blank=True, default='', editable=False, verbose_name='요약'),
+        ),
+        migrations.AddField(
+            model_name='posts',
+            name='word_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='단어 수'),
+        ),
+    ]
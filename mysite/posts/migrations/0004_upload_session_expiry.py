@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:58
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+
+
+# 이미 있던 업로드는 마지막으로 받은 시각부터 하루 뒤에 만료
+def set_expires_at(apps, schema_editor):
+    UploadSession = apps.get_model('posts', 'UploadSession')
+    UploadSession.objects.filter(expires_at__isnull=True).update(expires_at=F('updated_at') + timedelta(days=1))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0003_posts_derived_content'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='uploadsession',
+            name='expires_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='만료일시'),
+        ),
+        migrations.AddIndex(
+            model_name='uploadsession',
+            index=models.Index(fields=['status', 'expires_at'], name='upload_status_expires_idx'),
+        ),
+        migrations.RunPython(set_expires_at, migrations.RunPython.noop),
+    ]
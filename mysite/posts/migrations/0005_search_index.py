@@ -0,0 +1,34 @@
+from django.db import migrations
+
+# 게시글 전문 검색 인덱스 테이블 (posts.search 백엔드가 사용, 데이터베이스 종류별로 문법이 달라 직접 SQL 실행)
+# 이전에는 post_migrate에서 만들었으므로 이미 있으면 그대로 두고, 기존 게시글은 rebuild_search_index로 채움
+CREATE_SQL = {
+    'sqlite': [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5(title, content, author, tokenize='unicode61')",
+    ],
+    'postgresql': [
+        'CREATE TABLE IF NOT EXISTS posts_fts (post_id bigint PRIMARY KEY, document tsvector NOT NULL)',
+        'CREATE INDEX IF NOT EXISTS posts_fts_document ON posts_fts USING GIN (document)',
+    ],
+}
+
+
+def create_search_index(apps, schema_editor):
+    for sql in CREATE_SQL.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(sql)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor in CREATE_SQL:
+        schema_editor.execute('DROP TABLE IF EXISTS posts_fts')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0004_upload_session_expiry'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
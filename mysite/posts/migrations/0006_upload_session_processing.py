@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0005_search_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='uploadsession',
+            name='status',
+            field=models.CharField(choices=[('uploading', '업로드 중'), ('processing', '처리 중'), ('completed', '업로드 완료'), ('attached', '첨부 완료'), ('aborted', '취소')], default='uploading', max_length=20, verbose_name='상태'),
+        ),
+    ]
@@ -1,21 +1,125 @@
+import uuid
+
 from django.db import models
 from django.contrib.auth.models import User
 
+
+# 목록/검색 화면에서 조회하는 컬럼 (내용 컬럼은 조회하지 않음, 작성자는 이름만 조회)
+LIST_FIELDS = ['id', 'title', 'excerpt', 'created_at', 'updated_at', 'created_by__id', 'created_by__first_name']
+
+
+class PostsQuerySet(models.QuerySet):
+    # 목록 화면용 가벼운 조회
+    def for_listing(self):
+        return self.select_related('created_by').only(*LIST_FIELDS)
+
+
 class Posts(models.Model):
     # 게시글 정보
     title = models.CharField(verbose_name="제목", max_length=100)
     content = models.TextField(verbose_name="내용")
+    # 내용에서 저장할 때 계산하는 값 (posts.content.derive, NULL: 아직 계산하지 않음)
+    content_html = models.TextField(verbose_name="정리된 내용", null=True, blank=True, editable=False)
+    excerpt = models.TextField(verbose_name="요약", blank=True, default='', editable=False)
+    word_count = models.PositiveIntegerField(verbose_name="단어 수", default=0, editable=False)
+    char_count = models.PositiveIntegerField(verbose_name="글자 수", default=0, editable=False)
     filename = models.CharField(verbose_name="파일명", max_length=100, null=True, blank=True)
     original_filename = models.CharField(verbose_name="원본파일명", max_length=100, null=True, blank=True)
     created_by = models.ForeignKey(User, on_delete=models.CASCADE, verbose_name="작성자", null=True, blank=True, related_name="posts_created_by")
     updated_by = models.ForeignKey(User, on_delete=models.CASCADE, verbose_name="수정자", null=True, blank=True, related_name="posts_updated_by")
     created_at = models.DateTimeField(verbose_name="작성일시", auto_now_add=True)
     updated_at = models.DateTimeField(verbose_name="수정일시", auto_now=True)
+
+    objects = PostsQuerySet.as_manager()
     
     class Meta:
         db_table = 'posts'
         verbose_name = "게시글"
         verbose_name_plural = "게시글 목록"
+        indexes = [
+            # 목록 정렬 (최신순, 커서 페이지네이션)
+            models.Index(fields=['-created_at', '-id'], name='posts_created_at_id_idx'),
+            # 작성자별 목록
+            models.Index(fields=['created_by', '-created_at'], name='posts_created_by_created_idx'),
+        ]
+
+    def __str__(self):
+        return self.title
+
+
+class Counter(models.Model):
+    # 집계 값 (전체 게시글 수 등, COUNT(*) 대신 사용)
+    name = models.CharField(verbose_name="이름", max_length=50, unique=True)
+    value = models.BigIntegerField(verbose_name="값", default=0)
+
+    class Meta:
+        db_table = 'posts_counters'
+        verbose_name = "카운터"
+        verbose_name_plural = "카운터 목록"
+
+    def __str__(self):
+        return f'{self.name}={self.value}'
+
+
+class Attachment(models.Model):
+    # 첨부 파일 정보 (내용 해시 기준으로 한 번만 저장)
+    digest = models.CharField(verbose_name="해시", max_length=64, unique=True)
+    size = models.BigIntegerField(verbose_name="크기")
+    ref_count = models.PositiveIntegerField(verbose_name="참조 수", default=0)
+    # 파일 앞부분으로 판별한 형식 (빈 값: 아직 확인하지 않음)
+    content_type = models.CharField(verbose_name="형식", max_length=100, blank=True, default='')
+    # 이미지 크기와 생성된 미리보기 이미지 ({'thumb': {'width': 320, 'height': 240}, ...})
+    width = models.PositiveIntegerField(verbose_name="너비", null=True, blank=True)
+    height = models.PositiveIntegerField(verbose_name="높이", null=True, blank=True)
+    variants = models.JSONField(verbose_name="미리보기", default=dict, blank=True)
+    created_at = models.DateTimeField(verbose_name="등록일시", auto_now_add=True)
+
+    class Meta:
+        db_table = 'posts_attachments'
+        verbose_name = "첨부 파일"
+        verbose_name_plural = "첨부 파일 목록"
+
+    def __str__(self):
+        return self.digest
+
+
+class UploadSession(models.Model):
+    # 이어 올리기가 가능한 분할 업로드 정보
+    STATUS_CHOICES = [
+        ('uploading', '업로드 중'),
+        ('processing', '처리 중'),
+        ('completed', '업로드 완료'),
+        ('attached', '첨부 완료'),
+        ('aborted', '취소'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    filename = models.CharField(verbose_name="원본파일명", max_length=100)
+    size = models.BigIntegerField(verbose_name="크기")
+    chunk_size = models.PositiveIntegerField(verbose_name="조각 크기")
+    received = models.BigIntegerField(verbose_name="받은 크기", default=0)
+    storage_upload_id = models.CharField(verbose_name="저장소 업로드 ID", max_length=1024)
+    digest = models.CharField(verbose_name="해시", max_length=64, null=True, blank=True)
+    status = models.CharField(verbose_name="상태", max_length=20, choices=STATUS_CHOICES, default='uploading')
+    post = models.ForeignKey(Posts, on_delete=models.SET_NULL, verbose_name="게시글", null=True, blank=True, related_name="upload_sessions")
+    created_by = models.ForeignKey(User, on_delete=models.CASCADE, verbose_name="작성자", related_name="upload_sessions")
+    created_at = models.DateTimeField(verbose_name="등록일시", auto_now_add=True)
+    updated_at = models.DateTimeField(verbose_name="수정일시", auto_now=True)
+    # 이 시각까지 이어 올리거나 게시글에 연결하지 않으면 취소 (조각을 받을 때마다 연장)
+    expires_at = models.DateTimeField(verbose_name="만료일시", null=True, blank=True)
+
+    class Meta:
+        db_table = 'posts_upload_sessions'
+        verbose_name = "분할 업로드"
+        verbose_name_plural = "분할 업로드 목록"
+        indexes = [
+            models.Index(fields=['status', 'expires_at'], name='upload_status_expires_idx'),
+        ]
 
     def __str__(self):
-        return self.title
\ No newline at end of file
+        return f'{self.filename} ({self.received}/{self.size})'
+
+    # 저장소에서 사용할 임시 이름
+    @property
+    def storage_name(self):
+        return f'attachments/tmp/{self.id.hex}'
@@ -0,0 +1,212 @@
+import base64
+import hashlib
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.functional import cached_property
+
+PER_PAGE = getattr(settings, 'POSTS_PER_PAGE', 10)
+PAGINATION_MODE = getattr(settings, 'POSTS_PAGINATION_MODE', 'auto')
+CURSOR_THRESHOLD = getattr(settings, 'POSTS_CURSOR_PAGINATION_THRESHOLD', 1000)
+COUNT_CACHE_TIMEOUT = getattr(settings, 'POSTS_COUNT_CACHE_TIMEOUT', 60)
+
+
+# 캐시 키 생성 (검색 조건별로 구분)
+def count_cache_key(*parts):
+    digest = hashlib.md5('|'.join(str(part) for part in parts).encode()).hexdigest()
+    return f'posts:count:{digest}'
+
+
+# 캐시된 전체 게시글 수 (COUNT(*)는 캐시가 만료되었을 때만 실행)
+def cached_count(queryset, key):
+    return cache.get_or_set(key, queryset.count, COUNT_CACHE_TIMEOUT)
+
+
+async def acached_count(queryset, key):
+    count = await cache.aget(key)
+    if count is None:
+        count = await queryset.acount()
+        await cache.aset(key, count, COUNT_CACHE_TIMEOUT)
+    return count
+
+
+# 비동기 ORM으로 쿼리셋 조회
+async def alist(queryset):
+    return [row async for row in queryset]
+
+
+# COUNT(*) 대신 전달받은 함수(카운터, 캐시)로 전체 개수를 구하는 페이지네이터
+class CachedCountPaginator(Paginator):
+    def __init__(self, object_list, per_page, count_func, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_func = count_func
+
+    @cached_property
+    def count(self):
+        return self.count_func()
+
+
+# 커서 인코딩: (created_at, id, 순번)
+def encode_cursor(direction, post, index_number):
+    raw = f'{direction}|{post.created_at.isoformat()}|{post.id}|{index_number}'
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+# 커서 디코딩: 잘못된 커서는 None 반환
+def decode_cursor(token):
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)).decode()
+        direction, created_at, post_id, index_number = raw.split('|')
+        created_at = parse_datetime(created_at)
+        if direction not in ('next', 'prev') or created_at is None:
+            return None
+        return direction, created_at, int(post_id), int(index_number)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+# 커서 페이지 (템플릿에서 Page 객체처럼 사용)
+class CursorPage:
+    def __init__(self, object_list, has_next, has_previous, total):
+        self.object_list = object_list
+        self.has_next_page = has_next
+        self.has_previous_page = has_previous
+        self.total = total
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.has_next_page
+
+    def has_previous(self):
+        return self.has_previous_page
+
+    @property
+    def next_cursor(self):
+        if not self.has_next_page or not self.object_list:
+            return None
+        last = self.object_list[-1]
+        return encode_cursor('next', last, last.index_number)
+
+    @property
+    def previous_cursor(self):
+        if not self.has_previous_page or not self.object_list:
+            return None
+        first = self.object_list[0]
+        return encode_cursor('prev', first, first.index_number)
+
+
+# 커서(키셋) 페이지네이터: (created_at, id) 기준으로 OFFSET 없이 조회
+# 비동기 메서드(a로 시작)에서는 row_cache도 비동기 함수를 전달
+class CursorPaginator:
+    def __init__(self, queryset, per_page, count_func, count_key, row_cache=None):
+        self.queryset = queryset.order_by('-created_at', '-id')
+        self.per_page = per_page
+        self.count_func = count_func
+        self.count_key = count_key
+        self.row_cache = row_cache
+
+    @cached_property
+    def count(self):
+        return self.count_func()
+
+    # 첫 페이지 (row_cache가 있으면 캐시된 목록 사용)
+    def first_page(self):
+        fetch = lambda: list(self.queryset[:self.per_page + 1])
+        rows = self.row_cache(f'cursor:{self.per_page}', fetch) if self.row_cache else fetch()
+        return self._page(rows, self.count, has_previous=False)
+
+    async def afirst_page(self):
+        fetch = lambda: alist(self.queryset[:self.per_page + 1])
+        rows = await self.row_cache(f'cursor:{self.per_page}', fetch) if self.row_cache else await fetch()
+        return self._page(rows, self.count, has_previous=False)
+
+    # 커서 위치의 다음/이전 페이지
+    def get_page(self, token):
+        cursor = decode_cursor(token) if token else None
+        if cursor is None:
+            return self.first_page()
+        queryset, make_page = self._cursor_query(cursor)
+        return make_page(list(queryset))
+
+    async def aget_page(self, token):
+        cursor = decode_cursor(token) if token else None
+        if cursor is None:
+            return await self.afirst_page()
+        queryset, make_page = self._cursor_query(cursor)
+        return make_page(await alist(queryset))
+
+    # 커서 방향에 따라 조회할 쿼리셋과 페이지 생성 함수
+    def _cursor_query(self, cursor):
+        direction, created_at, post_id, index_number = cursor
+        if direction == 'next':
+            queryset = self.queryset.filter(
+                Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=post_id)
+            )[:self.per_page + 1]
+            return queryset, lambda rows: self._page(rows, index_number - 1, has_previous=True)
+
+        queryset = self.queryset.filter(
+            Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=post_id)
+        ).order_by('created_at', 'id')[:self.per_page + 1]
+        return queryset, lambda rows: self._previous_page(rows, index_number)
+
+    def _previous_page(self, rows, index_number):
+        has_previous = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        rows.reverse()
+        page = self._page(rows, index_number + len(rows), has_previous=has_previous)
+        page.has_next_page = True
+        return page
+
+    # 날짜로 이동: 해당 날짜 이전(포함)에 작성된 게시글부터 표시
+    def get_page_for_date(self, value):
+        day = parse_date(value) if value else None
+        if day is None:
+            return self.first_page()
+
+        newer, older, key = self._date_query(day)
+        newer_count = cached_count(newer, key)
+        return self._page(list(older), self.count - newer_count, has_previous=newer_count > 0)
+
+    async def aget_page_for_date(self, value):
+        day = parse_date(value) if value else None
+        if day is None:
+            return await self.afirst_page()
+
+        newer, older, key = self._date_query(day)
+        newer_count = await acached_count(newer, key)
+        return self._page(await alist(older), self.count - newer_count, has_previous=newer_count > 0)
+
+    def _date_query(self, day):
+        boundary = timezone.make_aware(datetime.combine(day + timedelta(days=1), time.min))
+        newer = self.queryset.filter(created_at__gte=boundary)
+        older = self.queryset.filter(created_at__lt=boundary)[:self.per_page + 1]
+        return newer, older, f'{self.count_key}:{day.isoformat()}'
+
+    def _page(self, rows, start_index, has_previous):
+        has_next = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        for index, post in enumerate(rows):
+            post.index_number = start_index - index
+        return CursorPage(rows, has_next, has_previous, self.count)
+
+
+# 페이지네이션 방식 결정 (게시글이 많으면 커서 방식 사용)
+def use_cursor_pagination(request, total):
+    if request.GET.get('cursor') or request.GET.get('date'):
+        return True
+    if PAGINATION_MODE == 'auto':
+        return total > CURSOR_THRESHOLD
+    return PAGINATION_MODE == 'cursor'
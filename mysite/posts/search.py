@@ -0,0 +1,259 @@
+import re
+from html import unescape
+
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.utils.html import strip_tags
+
+from .models import Posts
+
+SEARCH_BACKEND = getattr(settings, 'POSTS_SEARCH_BACKEND', 'auto')
+
+# 한글/한자 구간과 그 외 단어 구간을 나눠서 토큰화
+CJK = r'\u1100-\u11ff\u3131-\u318e\uac00-\ud7a3\u4e00-\u9fff'
+CJK_RUN = re.compile(r'[%s]+' % CJK)
+WORD_RUN = re.compile(r'[%s]+|[^\W_%s]+' % (CJK, CJK))
+
+# 검색 종류별 인덱스 컬럼
+COLUMNS = {
+    'all': None,
+    'title': 'title',
+    'content': 'content',
+    'full_name': 'author',
+}
+
+
+# HTML 태그 제거 (TinyMCE 내용)
+def html_to_text(html):
+    return unescape(strip_tags(html or ''))
+
+
+# 색인용 토큰화: 한글은 2-gram + 마지막 글자, 그 외는 단어 단위
+def tokenize(text):
+    tokens = []
+    for run in WORD_RUN.findall((text or '').lower()):
+        if CJK_RUN.fullmatch(run):
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+            tokens.append(run[-1])
+        else:
+            tokens.append(run)
+    return tokens
+
+
+# 검색어 토큰화: 한글 2-gram은 완전 일치, 나머지는 접두어 검색
+def query_tokens(keyword):
+    tokens = []
+    for run in WORD_RUN.findall((keyword or '').lower()):
+        if CJK_RUN.fullmatch(run) and len(run) > 1:
+            tokens.extend((run[i:i + 2], False) for i in range(len(run) - 1))
+        else:
+            tokens.append((run, True))
+    return tokens
+
+
+# 게시글 색인 문서 (제목, 내용, 작성자)
+def document(post):
+    author = post.created_by.first_name if post.created_by_id else ''
+    return (
+        ' '.join(tokenize(post.title)),
+        ' '.join(tokenize(html_to_text(post.content))),
+        ' '.join(tokenize(author)),
+    )
+
+
+# SQLite FTS5 백엔드 (posts_fts 테이블은 마이그레이션 0005_search_index에서 생성)
+class SQLiteBackend:
+    def index(self, cursor, post):
+        cursor.execute('DELETE FROM posts_fts WHERE rowid = %s', [post.id])
+        cursor.execute(
+            'INSERT INTO posts_fts (rowid, title, content, author) VALUES (%s, %s, %s, %s)',
+            [post.id, *document(post)],
+        )
+
+    def remove(self, cursor, post_id):
+        cursor.execute('DELETE FROM posts_fts WHERE rowid = %s', [post_id])
+
+    def clear(self, cursor):
+        cursor.execute('DELETE FROM posts_fts')
+
+    def match(self, column, tokens):
+        match = ' AND '.join('"%s"%s' % (token, '*' if prefix else '') for token, prefix in tokens)
+        if column:
+            match = '%s : (%s)' % (column, match)
+        return match
+
+    # (id 목록, 전체 결과 수) - 결과 수는 같은 쿼리에서 창 함수로 계산 (결과가 없으면 None)
+    # bm25()는 창 함수와 같은 단계에서 쓸 수 없어서 하위 쿼리에서 계산
+    def search(self, cursor, column, tokens, limit, offset=0):
+        # 제목 > 작성자 > 내용 순으로 가중치
+        cursor.execute(
+            'SELECT rowid, count(*) OVER () FROM ('
+            'SELECT rowid, bm25(posts_fts, 10.0, 1.0, 5.0) AS rank FROM posts_fts WHERE posts_fts MATCH %s'
+            ') ORDER BY rank, rowid DESC LIMIT %s OFFSET %s',
+            [self.match(column, tokens), limit, offset],
+        )
+        rows = cursor.fetchall()
+        return [row[0] for row in rows], rows[0][1] if rows else None
+
+    def count(self, cursor, column, tokens):
+        cursor.execute('SELECT count(*) FROM posts_fts WHERE posts_fts MATCH %s', [self.match(column, tokens)])
+        return cursor.fetchone()[0]
+
+
+# PostgreSQL tsvector 백엔드 (posts_fts 테이블은 마이그레이션 0005_search_index에서 생성)
+class PostgreSQLBackend:
+    WEIGHTS = {'title': 'A', 'author': 'B', 'content': 'C'}
+
+    def index(self, cursor, post):
+        title, content, author = document(post)
+        cursor.execute(
+            "INSERT INTO posts_fts (post_id, document) VALUES (%s, "
+            "setweight(to_tsvector('simple', %s), 'A') || "
+            "setweight(to_tsvector('simple', %s), 'B') || "
+            "setweight(to_tsvector('simple', %s), 'C')) "
+            "ON CONFLICT (post_id) DO UPDATE SET document = EXCLUDED.document",
+            [post.id, title, author, content],
+        )
+
+    def remove(self, cursor, post_id):
+        cursor.execute('DELETE FROM posts_fts WHERE post_id = %s', [post_id])
+
+    def clear(self, cursor):
+        cursor.execute('DELETE FROM posts_fts')
+
+    def query(self, column, tokens):
+        weight = self.WEIGHTS.get(column, '')
+        return ' & '.join(
+            '%s:%s%s' % (token, '*' if prefix else '', weight) if prefix or weight else token
+            for token, prefix in tokens
+        )
+
+    def search(self, cursor, column, tokens, limit, offset=0):
+        cursor.execute(
+            "SELECT post_id, count(*) OVER () FROM posts_fts, to_tsquery('simple', %s) query "
+            "WHERE document @@ query ORDER BY ts_rank(document, query) DESC, post_id DESC LIMIT %s OFFSET %s",
+            [self.query(column, tokens), limit, offset],
+        )
+        rows = cursor.fetchall()
+        return [row[0] for row in rows], rows[0][1] if rows else None
+
+    def count(self, cursor, column, tokens):
+        cursor.execute(
+            "SELECT count(*) FROM posts_fts WHERE document @@ to_tsquery('simple', %s)",
+            [self.query(column, tokens)],
+        )
+        return cursor.fetchone()[0]
+
+
+BACKENDS = {
+    'sqlite': SQLiteBackend,
+    'postgresql': PostgreSQLBackend,
+}
+
+
+# 현재 DB에서 사용할 전문 검색 백엔드 (지원하지 않으면 None)
+def get_backend(using='default'):
+    if SEARCH_BACKEND == 'like':
+        return None
+    backend_class = BACKENDS.get(connections[using].vendor)
+    return backend_class() if backend_class else None
+
+
+def is_enabled():
+    return get_backend() is not None
+
+
+# 게시글 색인
+def index_post(post):
+    backend = get_backend()
+    if backend:
+        with connections['default'].cursor() as cursor:
+            backend.index(cursor, post)
+
+
+# 게시글 색인 삭제
+def remove_post(post_id):
+    backend = get_backend()
+    if backend:
+        with connections['default'].cursor() as cursor:
+            backend.remove(cursor, post_id)
+
+
+# 전체 재색인
+def rebuild_index(queryset, batch_size=500):
+    backend = get_backend()
+    if backend is None:
+        return 0
+    count = 0
+    with transaction.atomic(), connections['default'].cursor() as cursor:
+        backend.clear(cursor)
+        for post in queryset.select_related('created_by').iterator(chunk_size=batch_size):
+            backend.index(cursor, post)
+            count += 1
+    return count
+
+
+# 검색 결과 게시글 id (순위순, 결과 수 제한 없음)
+# Paginator에 넘기면 전체 결과 수와 현재 페이지의 id만 조회 (미리 조회한 페이지는 전체 결과 수와 함께 한 번에)
+class SearchResults:
+    def __init__(self, backend, column, tokens):
+        self.backend = backend
+        self.column = column
+        self.tokens = tokens
+        self.total = None
+        # 시작 위치 → 조회한 id 목록 (Paginator는 마지막 페이지를 전체 결과 수에 맞춰 더 적게 요청함)
+        self.pages = {}
+
+    # 검색 인덱스도 게시글과 같은 데이터베이스(복제본 포함)에서 조회
+    def cursor(self):
+        return connections[router.db_for_read(Posts)].cursor()
+
+    def fetch(self, offset, limit):
+        post_ids = self.pages.get(offset)
+        if post_ids is None or not self.covers(offset, post_ids, limit):
+            with self.cursor() as cursor:
+                post_ids, total = self.backend.search(cursor, self.column, self.tokens, limit, offset)
+            self.pages[offset] = post_ids
+            if total is not None:
+                self.total = total
+            elif offset == 0:
+                self.total = 0
+        return post_ids[:limit]
+
+    # 조회해 둔 id 목록으로 요청한 구간을 채울 수 있는지 (모자라도 결과 끝까지 조회했으면 충분)
+    def covers(self, offset, post_ids, limit):
+        return len(post_ids) >= limit or (self.total is not None and offset + len(post_ids) >= self.total)
+
+    def count(self):
+        if self.total is None:
+            with self.cursor() as cursor:
+                self.total = self.backend.count(cursor, self.column, self.tokens)
+        return self.total
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+        start = index.start or 0
+        if index.stop <= start:
+            return []
+        return self.fetch(start, index.stop - start)
+
+
+# 검색 결과 (검색할 수 없으면 빈 목록)
+# page를 넘기면 그 페이지를 전체 결과 수와 함께 미리 조회해서 Paginator가 COUNT를 따로 실행하지 않음
+def search_results(searchType, searchKeyword, page=None, per_page=10):
+    backend = get_backend()
+    tokens = query_tokens(searchKeyword)
+    if backend is None or not tokens or searchType not in COLUMNS:
+        return []
+    results = SearchResults(backend, COLUMNS[searchType], tokens)
+    try:
+        number = int(page)
+    except (TypeError, ValueError):
+        number = 1
+    if number >= 1:
+        results.fetch((number - 1) * per_page, per_page)
+    return results
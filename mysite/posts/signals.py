@@ -0,0 +1,70 @@
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from . import cache, content, counters, tasks, thumbnails
+from .models import Attachment, Posts
+
+
+# 게시글 수정 전 수정일시 (이전 보기 캐시 삭제용)
+@receiver(pre_save, sender=Posts)
+def remember_updated_at(sender, instance, **kwargs):
+    instance._previous_updated_at = instance.updated_at
+
+
+# 게시글 저장 전 정리된 HTML, 요약, 단어/글자 수 계산 (내용을 저장하지 않으면 생략)
+@receiver(pre_save, sender=Posts)
+def derive_content(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or 'content' in update_fields:
+        content.apply(instance)
+
+
+# 게시글 등록/수정 시 검색 인덱스 갱신, 이전 보기 캐시 삭제 (백그라운드 작업)
+@receiver(post_save, sender=Posts)
+def index_post(sender, instance, **kwargs):
+    tasks.post_saved(instance, getattr(instance, '_previous_updated_at', None))
+
+
+# 게시글 등록/수정/삭제 시 전체 게시글 수, 목록 캐시 세대 갱신
+@receiver(post_save, sender=Posts)
+def update_list_cache(sender, instance, created, **kwargs):
+    if created:
+        counters.add(1)
+    transaction.on_commit(cache.bump_list_generation)
+
+
+@receiver(post_delete, sender=Posts)
+def update_list_cache_on_delete(sender, instance, **kwargs):
+    counters.add(-1)
+    transaction.on_commit(cache.bump_list_generation)
+
+
+# 게시글 삭제 시 검색 인덱스, 보기 캐시 삭제, 첨부 파일 참조 해제 (백그라운드 작업)
+@receiver(post_delete, sender=Posts)
+def remove_post(sender, instance, **kwargs):
+    tasks.post_deleted(instance)
+
+
+# 새 이미지 첨부 파일의 미리보기 이미지 생성 (백그라운드 작업)
+@receiver(post_save, sender=Attachment)
+def generate_thumbnails(sender, instance, created, **kwargs):
+    if created and thumbnails.is_image(instance) and thumbnails.is_enabled():
+        tasks.generate_thumbnails(instance)
+
+
+# 작성자 이름 변경 여부 확인
+@receiver(pre_save, sender=User)
+def check_author_name(sender, instance, update_fields=None, **kwargs):
+    instance._first_name_changed = False
+    if instance.pk is None or (update_fields is not None and 'first_name' not in update_fields):
+        return
+    old_first_name = User.objects.filter(pk=instance.pk).values_list('first_name', flat=True).first()
+    instance._first_name_changed = old_first_name is not None and old_first_name != instance.first_name
+
+
+# 작성자 이름 변경 시 작성한 게시글 재색인, 보기 캐시 삭제 (백그라운드 작업)
+@receiver(post_save, sender=User)
+def reindex_author_posts(sender, instance, **kwargs):
+    if getattr(instance, '_first_name_changed', False):
+        tasks.author_renamed(instance)
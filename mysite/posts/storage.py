@@ -0,0 +1,285 @@
+import os
+import shutil
+import tempfile
+import uuid
+from collections import namedtuple
+from datetime import timezone as dt_timezone
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage, Storage, storages
+from django.utils import timezone
+from django.utils.deconstruct import deconstructible
+from django.utils.functional import cached_property
+
+CHUNK_SIZE = 64 * 1024
+# S3 멀티파트 업로드는 마지막 조각을 제외하고 5MB 이상이어야 함
+PART_SIZE = 8 * 1024 * 1024
+
+
+# 파일 크기와 수정 시각 (다운로드 응답의 Content-Length, ETag, Last-Modified)
+FileStat = namedtuple('FileStat', ['size', 'modified_time'])
+
+
+# 첨부 파일 저장소 (settings.STORAGES['attachments'])
+def get_attachment_storage():
+    return storages['attachments']
+
+
+# 파일의 일부 구간을 조금씩 읽어서 전달
+class RangeFileWrapper:
+    def __init__(self, file, start=0, length=None, chunk_size=CHUNK_SIZE):
+        self.file = file
+        self.file.seek(start)
+        self.remaining = length
+        self.chunk_size = chunk_size
+
+    def __iter__(self):
+        while self.remaining is None or self.remaining > 0:
+            size = self.chunk_size if self.remaining is None else min(self.chunk_size, self.remaining)
+            data = self.file.read(size)
+            if not data:
+                break
+            if self.remaining is not None:
+                self.remaining -= len(data)
+            yield data
+
+    def close(self):
+        self.file.close()
+
+
+# 스트리밍 읽기를 비동기 반복자로 변환 (파일 읽기는 스레드 풀에서 수행해서 이벤트 루프를 막지 않음)
+async def aiter_stream(stream):
+    iterator = iter(stream)
+    read = sync_to_async(next, thread_sensitive=False)
+    try:
+        while True:
+            chunk = await read(iterator, None)
+            if chunk is None:
+                break
+            yield chunk
+    finally:
+        await sync_to_async(stream.close, thread_sensitive=False)()
+
+
+# 로컬 파일 시스템 저장소
+@deconstructible(path='posts.storage.LocalAttachmentStorage')
+class LocalAttachmentStorage(FileSystemStorage):
+    # 크기와 수정 시각 (없으면 None)
+    def stat(self, name):
+        try:
+            result = os.stat(self.path(name))
+        except FileNotFoundError:
+            return None
+        return FileStat(result.st_size, self._datetime_from_timestamp(result.st_mtime))
+
+    # 스트리밍 읽기
+    def open_stream(self, name, start=0, length=None, chunk_size=CHUNK_SIZE):
+        return RangeFileWrapper(open(self.path(name), 'rb'), start, length, chunk_size)
+
+    # 스트리밍 쓰기 (같은 이름이 있으면 덮어씀)
+    def save_stream(self, name, chunks):
+        path = self.path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            for chunk in chunks:
+                f.write(chunk)
+        return name
+
+    # 이름 변경 (같은 저장소 안에서 이동)
+    def move(self, old_name, new_name):
+        new_path = self.path(new_name)
+        os.makedirs(os.path.dirname(new_path), exist_ok=True)
+        os.replace(self.path(old_name), new_path)
+
+    def _multipart_dir(self, upload_id):
+        return self.path(os.path.join('.multipart', upload_id))
+
+    # 멀티파트 업로드: 조각을 따로 저장했다가 완료 시 합침
+    def create_multipart(self, name):
+        upload_id = uuid.uuid4().hex
+        os.makedirs(self._multipart_dir(upload_id))
+        return upload_id
+
+    def upload_part(self, name, upload_id, part_number, data):
+        part_path = os.path.join(self._multipart_dir(upload_id), f'{part_number:05d}')
+        with open(part_path, 'wb') as f:
+            f.write(data)
+
+    def complete_multipart(self, name, upload_id, part_numbers):
+        part_dir = self._multipart_dir(upload_id)
+        path = self.path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            for part_number in sorted(part_numbers):
+                with open(os.path.join(part_dir, f'{part_number:05d}'), 'rb') as part:
+                    shutil.copyfileobj(part, f, CHUNK_SIZE)
+        shutil.rmtree(part_dir, ignore_errors=True)
+        return name
+
+    def abort_multipart(self, name, upload_id):
+        shutil.rmtree(self._multipart_dir(upload_id), ignore_errors=True)
+
+
+# S3 호환 저장소 (AWS S3, MinIO 등, boto3 필요)
+@deconstructible(path='posts.storage.S3AttachmentStorage')
+class S3AttachmentStorage(Storage):
+    def __init__(self, bucket_name, endpoint_url=None, region_name=None,
+                 access_key=None, secret_key=None, prefix='', querystring_expire=300):
+        self.bucket_name = bucket_name
+        self.endpoint_url = endpoint_url
+        self.region_name = region_name
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.prefix = prefix
+        self.querystring_expire = querystring_expire
+
+    @cached_property
+    def client(self):
+        try:
+            import boto3
+        except ImportError as e:
+            raise ImproperlyConfigured('S3 첨부 파일 저장소를 사용하려면 boto3를 설치해주세요.') from e
+        return boto3.client(
+            's3',
+            endpoint_url=self.endpoint_url,
+            region_name=self.region_name,
+            aws_access_key_id=self.access_key,
+            aws_secret_access_key=self.secret_key,
+        )
+
+    def _key(self, name):
+        return self.prefix + name.replace('\\', '/')
+
+    def _head(self, name):
+        return self.client.head_object(Bucket=self.bucket_name, Key=self._key(name))
+
+    def _open(self, name, mode='rb'):
+        file = tempfile.SpooledTemporaryFile(max_size=PART_SIZE)
+        self.client.download_fileobj(self.bucket_name, self._key(name), file)
+        file.seek(0)
+        return File(file, name)
+
+    def _save(self, name, content):
+        content.seek(0)
+        self.client.upload_fileobj(content, self.bucket_name, self._key(name))
+        return name
+
+    def delete(self, name):
+        self.client.delete_object(Bucket=self.bucket_name, Key=self._key(name))
+
+    # 크기와 수정 시각을 HEAD 요청 한 번으로 조회 (없으면 None)
+    def stat(self, name):
+        from botocore.exceptions import ClientError
+        try:
+            head = self._head(name)
+        except ClientError as e:
+            if e.response['Error']['Code'] in ('404', 'NoSuchKey', 'NotFound'):
+                return None
+            raise
+        return FileStat(head['ContentLength'], self._modified_time(head))
+
+    def exists(self, name):
+        return self.stat(name) is not None
+
+    def listdir(self, path):
+        prefix = self._key(path).rstrip('/') + '/' if path else self.prefix
+        directories, files = [], []
+        paginator = self.client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket_name, Prefix=prefix, Delimiter='/'):
+            directories.extend(item['Prefix'][len(prefix):].rstrip('/') for item in page.get('CommonPrefixes', []))
+            files.extend(item['Key'][len(prefix):] for item in page.get('Contents', []))
+        return directories, files
+
+    def size(self, name):
+        return self._head(name)['ContentLength']
+
+    def get_modified_time(self, name):
+        return self._modified_time(self._head(name))
+
+    def _modified_time(self, head):
+        modified = head['LastModified']
+        return modified if settings.USE_TZ else timezone.make_naive(modified, dt_timezone.utc)
+
+    # 짧은 시간 동안 유효한 서명된 주소
+    def url(self, name):
+        return self.client.generate_presigned_url(
+            'get_object',
+            Params={'Bucket': self.bucket_name, 'Key': self._key(name)},
+            ExpiresIn=self.querystring_expire,
+        )
+
+    # 스트리밍 읽기 (Range 요청)
+    def open_stream(self, name, start=0, length=None, chunk_size=CHUNK_SIZE):
+        params = {'Bucket': self.bucket_name, 'Key': self._key(name)}
+        if start or length is not None:
+            end = '' if length is None else start + length - 1
+            params['Range'] = f'bytes={start}-{end}'
+        body = self.client.get_object(**params)['Body']
+        return S3StreamWrapper(body, chunk_size)
+
+    # 스트리밍 쓰기 (PART_SIZE 단위 멀티파트 업로드)
+    def save_stream(self, name, chunks):
+        upload_id = self.create_multipart(name)
+        part_numbers = []
+        buffer = bytearray()
+        try:
+            for chunk in chunks:
+                buffer.extend(chunk)
+                if len(buffer) >= PART_SIZE:
+                    part_numbers.append(len(part_numbers) + 1)
+                    self.upload_part(name, upload_id, part_numbers[-1], bytes(buffer))
+                    buffer.clear()
+            if buffer or not part_numbers:
+                part_numbers.append(len(part_numbers) + 1)
+                self.upload_part(name, upload_id, part_numbers[-1], bytes(buffer))
+            return self.complete_multipart(name, upload_id, part_numbers)
+        except Exception:
+            self.abort_multipart(name, upload_id)
+            raise
+
+    def move(self, old_name, new_name):
+        self.client.copy_object(
+            Bucket=self.bucket_name,
+            Key=self._key(new_name),
+            CopySource={'Bucket': self.bucket_name, 'Key': self._key(old_name)},
+        )
+        self.delete(old_name)
+
+    def create_multipart(self, name):
+        return self.client.create_multipart_upload(Bucket=self.bucket_name, Key=self._key(name))['UploadId']
+
+    def upload_part(self, name, upload_id, part_number, data):
+        self.client.upload_part(
+            Bucket=self.bucket_name, Key=self._key(name),
+            UploadId=upload_id, PartNumber=part_number, Body=data,
+        )
+
+    def complete_multipart(self, name, upload_id, part_numbers):
+        parts = self.client.list_parts(Bucket=self.bucket_name, Key=self._key(name), UploadId=upload_id)
+        etags = {part['PartNumber']: part['ETag'] for part in parts.get('Parts', [])}
+        self.client.complete_multipart_upload(
+            Bucket=self.bucket_name, Key=self._key(name), UploadId=upload_id,
+            MultipartUpload={'Parts': [
+                {'PartNumber': part_number, 'ETag': etags[part_number]} for part_number in sorted(part_numbers)
+            ]},
+        )
+        return name
+
+    def abort_multipart(self, name, upload_id):
+        self.client.abort_multipart_upload(Bucket=self.bucket_name, Key=self._key(name), UploadId=upload_id)
+
+
+# S3 응답 본문을 조각 단위로 전달
+class S3StreamWrapper:
+    def __init__(self, body, chunk_size=CHUNK_SIZE):
+        self.body = body
+        self.chunk_size = chunk_size
+
+    def __iter__(self):
+        return self.body.iter_chunks(self.chunk_size)
+
+    def close(self):
+        self.body.close()
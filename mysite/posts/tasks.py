@@ -0,0 +1,181 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils.dateparse import parse_datetime
+
+from jobs.queue import checkpoint, enqueue, task
+
+from . import attachments, cache, search, thumbnails
+from .models import Posts, UploadSession
+
+# 게시글 저장/삭제 후 처리 (백그라운드 작업, manage.py jobs_worker가 실행)
+# 요청에서는 작업만 추가하고, 작업은 게시글 변경과 같은 트랜잭션으로 커밋됨
+
+
+# 게시글 저장 후: 검색 색인, 이전 보기 캐시 삭제
+def post_saved(post, previous_updated_at=None):
+    enqueue(
+        'posts.index_post',
+        {
+            'post_id': post.id,
+            'previous_updated_at': previous_updated_at.isoformat() if previous_updated_at else None,
+        },
+        key=f'posts.index_post:{post.id}:{post.updated_at.isoformat()}',
+    )
+
+
+# 게시글 삭제 후: 검색 인덱스, 보기 캐시, 첨부 파일 참조 해제
+def post_deleted(post):
+    enqueue(
+        'posts.remove_post',
+        {'post_id': post.id, 'updated_at': post.updated_at.isoformat(), 'filename': post.filename},
+        key=f'posts.remove_post:{post.id}',
+    )
+
+
+# 업로드 파일은 임시 이름으로만 저장(attachments.stage)하고 해시 계산, 중복 확인, 기존 파일 해제는 작업에서 처리
+def store_attachment(post, tmp_name, filename):
+    enqueue(
+        'posts.store_attachment',
+        {'post_id': post.id, 'tmp_name': tmp_name, 'filename': filename},
+        key=f'posts.store_attachment:{post.id}:{tmp_name}',
+    )
+
+
+def release_attachment(post):
+    if post.filename:
+        enqueue('posts.release_attachment', {'post_id': post.id, 'filename': post.filename})
+
+
+# 새 이미지 첨부 파일: 미리보기 이미지 생성 (같은 파일은 한 번만)
+# 키에 첨부 파일 id를 넣어서, 참조가 모두 해제되어 삭제된 파일을 다시 올리면 (완료 작업 보관 기간 안이라도) 다시 생성
+def generate_thumbnails(attachment):
+    enqueue(
+        'posts.generate_thumbnails',
+        {'digest': attachment.digest},
+        key=f'posts.generate_thumbnails:{attachment.digest}:{attachment.id}',
+    )
+
+
+# 분할 업로드 완료: 조각 합치기, 해시 계산, 해시 이름으로 이동 (post: 완료되면 연결할 게시글)
+def complete_upload(session, post=None):
+    enqueue(
+        'posts.complete_upload',
+        {'upload_id': str(session.id), 'post_id': post.id if post else None},
+        key=f'posts.complete_upload:{session.id}',
+    )
+
+
+# 만료된 분할 업로드 정리 예약 (시각을 한 시간 단위로 올려서 같은 시간대의 예약은 하나만 추가)
+def expire_uploads(at):
+    at = at.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+    enqueue('posts.expire_uploads', key=f'posts.expire_uploads:{at:%Y%m%d%H}', run_at=at)
+
+
+# 작성자 이름 변경 후: 작성한 게시글 재색인, 보기 캐시 삭제
+def author_renamed(user):
+    enqueue('posts.reindex_author', {'user_id': user.id})
+
+
+@task('posts.index_post')
+def index_post_task(post_id, previous_updated_at=None):
+    post = Posts.objects.select_related('created_by').filter(id=post_id).first()
+    if post is None:
+        return
+    search.index_post(post)
+    if previous_updated_at:
+        cache.invalidate_read([(post_id, parse_datetime(previous_updated_at))])
+
+
+@task('posts.remove_post')
+def remove_post_task(post_id, updated_at, filename=None):
+    search.remove_post(post_id)
+    cache.invalidate_read([(post_id, parse_datetime(updated_at))])
+    if filename:
+        attachments.release(Posts(id=post_id, filename=filename))
+
+
+# 해시 계산과 파일 이동은 트랜잭션 밖에서 실행 (큰 파일을 읽는 동안 쓰기 잠금을 잡지 않음)
+# 단계마다 checkpoint로 진행 상태를 저장해서 다시 실행하면 끝난 단계를 건너뜀
+@task('posts.store_attachment', atomic=False)
+def store_attachment_task(post_id, tmp_name, filename, digest=None, size=None, referenced=False, attached=False):
+    if attached:
+        return
+    if digest is None:
+        digest, size = attachments.hash_stored(tmp_name)
+        checkpoint(digest=digest, size=size)
+
+    # 참조 수를 먼저 늘려서 파일을 옮기는 동안 같은 파일의 참조 해제가 파일을 지우지 못하게 함
+    if not referenced:
+        with transaction.atomic():
+            attachments.add_ref(digest, size, attachments.sniff_stored(tmp_name))
+            checkpoint(referenced=True)
+    attachments.place_file(tmp_name, digest)
+
+    with transaction.atomic():
+        post = Posts.objects.filter(id=post_id).first()
+        if post is None:
+            # 작업 전에 게시글이 삭제됨
+            attachments.release_digest(digest)
+        else:
+            # 현재 첨부 파일 참조 해제 후 새 파일 연결
+            attachments.release(post)
+            post.filename = digest
+            post.original_filename = filename
+            post.save(update_fields=['filename', 'original_filename', 'updated_at'])
+        checkpoint(attached=True)
+
+
+@task('posts.release_attachment')
+def release_attachment_task(post_id, filename):
+    attachments.release(Posts(id=post_id, filename=filename))
+
+
+@task('posts.generate_thumbnails', atomic=False)
+def generate_thumbnails_task(digest):
+    thumbnails.generate(digest)
+
+
+# 큰 파일을 읽는 단계는 트랜잭션 밖에서 실행하고 checkpoint로 진행 상태 저장
+@task('posts.complete_upload', atomic=False)
+def complete_upload_task(upload_id, post_id=None, assembled=False, digest=None, size=None):
+    from . import uploads
+
+    session = UploadSession.objects.filter(id=upload_id, status='processing').first()
+    if session is None:
+        return
+    if not assembled:
+        uploads.assemble(session)
+        checkpoint(assembled=True)
+    if digest is None:
+        digest, size = attachments.hash_stored(session.storage_name)
+        checkpoint(digest=digest, size=size)
+    uploads.finish_upload(session, digest, size)
+
+    post = Posts.objects.filter(id=post_id).first() if post_id else None
+    if post is not None and session.status == 'completed':
+        try:
+            uploads.attach(session, post)
+        except uploads.UploadError:
+            # 그 사이 만료/취소된 업로드
+            pass
+
+
+# 만료된 업로드를 정리하고, 남은 업로드 중 가장 먼저 만료되는 시각에 다시 실행 (조각을 받으면 만료 시각이 늘어남)
+@task('posts.expire_uploads', atomic=False)
+def expire_uploads_task():
+    from . import uploads
+
+    uploads.expire_sessions()
+    next_expiry = uploads.next_expiry()
+    if next_expiry is not None:
+        expire_uploads(next_expiry)
+
+
+@task('posts.reindex_author')
+def reindex_author_task(user_id):
+    posts = Posts.objects.filter(created_by_id=user_id)
+    for post in posts.select_related('created_by').iterator():
+        search.index_post(post)
+    cache.invalidate_read(posts.values_list('id', 'updated_at'))
+    cache.bump_list_generation()
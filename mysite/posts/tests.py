@@ -1,3 +1,820 @@
-from django.test import TestCase
+import csv
+import os
+import tempfile
+from io import BytesIO, StringIO
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.core.paginator import Paginator
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import include, path
+from django.utils import timezone
+
+from jobs.models import Job
+from jobs.queue import run_pending
+from mysite.testing import QueryBudgetExceeded, QueryBudgetMixin
+from posts import async_views, attachments, content, downloads, pagination, search, thumbnails, urls
+from posts.models import Attachment, Posts
+from posts.storage import PART_SIZE, S3AttachmentStorage, get_attachment_storage
+
+# S3 저장소 테스트는 moto가 설치된 경우에만 실행 (pip install moto[s3])
+try:
+    import boto3
+    from moto import mock_aws
+except ImportError:
+    mock_aws = None
+
+S3_STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+    'attachments': {
+        'BACKEND': 'posts.storage.S3AttachmentStorage',
+        'OPTIONS': {'bucket_name': 'attachments', 'region_name': 'us-east-1', 'prefix': 'media/'},
+    },
+}
+
+# 비동기 화면(async_views)을 사용하는 URL 설정 (AsyncViewTests에서 ROOT_URLCONF로 사용)
+# 실제 URL 설정은 모듈을 불러올 때 POSTS_ASYNC_VIEWS로 한 번 정하므로 테스트에서는 직접 구성
+urlpatterns = [
+    path('posts/', include((urls.patterns(async_views), 'posts'))),
+    path('auth/', include('accounts.urls')),
+    path('tinymce/', include('tinymce.urls')),
+]
+
+
+# 화면별 쿼리 수 예산 (mysite.testing.QUERY_BUDGETS) 확인
+# 캐시가 비어 있는 첫 요청 기준으로 확인하고, 캐시가 채워진 뒤 요청도 예산 안인지 함께 확인
+class QueryBudgetTests(QueryBudgetMixin, TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('tester1', password='Passw0rd!', first_name='홍길동')
+        cls.posts = [
+            Posts.objects.create(title=f'제목{index}', content=f'<p>내용{index}</p>', created_by=cls.user)
+            for index in range(25)
+        ]
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def test_list(self):
+        for page in ('1', '2', '1'):
+            response = self.assertQueryBudget('posts:list', data={'page': page})
+            self.assertContains(response, '홍길동')
+
+    # 게시글이 많을 때 사용하는 커서 페이지네이션: 첫 페이지와 다음 페이지
+    def test_list_cursor(self):
+        with mock.patch.object(pagination, 'CURSOR_THRESHOLD', 10):
+            response = self.assertQueryBudget('posts:list')
+            self.assertTrue(response.context['cursor_mode'])
+            cursor = response.context['posts'].next_cursor
+            self.assertIsNotNone(cursor)
+
+            response = self.assertQueryBudget('posts:list', data={'cursor': cursor})
+            self.assertContains(response, '제목14')
+
+    def test_search(self):
+        data = {'searchType': 'title', 'searchKeyword': '제목'}
+        for _ in range(2):
+            response = self.assertQueryBudget('posts:list', data=data)
+            self.assertContains(response, '홍길동')
+
+    def test_read(self):
+        post = self.posts[-1]
+        for _ in range(2):
+            response = self.assertQueryBudget('posts:read', kwargs={'post_id': post.id})
+            self.assertContains(response, post.title)
+
+    def test_budget_exceeded(self):
+        with self.assertRaises(QueryBudgetExceeded):
+            self.assertQueryBudget('posts:list', budget=0)
+
+
+# 가짜 S3(moto)에서 S3AttachmentStorage의 스트리밍, 이동, 멀티파트 업로드, 다운로드 응답 확인
+@skipUnless(mock_aws, 'moto가 설치되어 있지 않습니다.')
+@override_settings(STORAGES=S3_STORAGES)
+class S3AttachmentStorageTests(TestCase):
+
+    def setUp(self):
+        patcher = mock.patch.dict(os.environ, {'AWS_ACCESS_KEY_ID': 'testing', 'AWS_SECRET_ACCESS_KEY': 'testing'})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        aws = mock_aws()
+        aws.start()
+        self.addCleanup(aws.stop)
+
+        self.s3 = boto3.client('s3', region_name='us-east-1')
+        self.s3.create_bucket(Bucket='attachments')
+        self.storage = get_attachment_storage()
+        self.assertIsInstance(self.storage, S3AttachmentStorage)
+
+    def chunks(self, data, size=64 * 1024):
+        return (data[index:index + size] for index in range(0, len(data), size))
+
+    # 조각 크기를 넘는 파일은 멀티파트로 나눠 올리고, Range로 일부만 읽음
+    def test_save_and_open_stream(self):
+        data = os.urandom(PART_SIZE + 100)
+        self.storage.save_stream('a/file', self.chunks(data))
+
+        self.assertEqual(self.s3.head_object(Bucket='attachments', Key='media/a/file')['ContentLength'], len(data))
+        self.assertEqual(self.storage.stat('a/file').size, len(data))
+        self.assertEqual(b''.join(self.storage.open_stream('a/file')), data)
+        self.assertEqual(b''.join(self.storage.open_stream('a/file', PART_SIZE - 5, 10)), data[PART_SIZE - 5:PART_SIZE + 5])
+        self.assertEqual(b''.join(self.storage.open_stream('a/file', PART_SIZE)), data[PART_SIZE:])
+
+        self.storage.save_stream('a/empty', [])
+        self.assertEqual(self.storage.stat('a/empty').size, 0)
+
+    def test_move_and_delete(self):
+        self.storage.save_stream('a/old', [b'hello'])
+        self.storage.move('a/old', 'b/new')
+        self.assertFalse(self.storage.exists('a/old'))
+        self.assertEqual(b''.join(self.storage.open_stream('b/new')), b'hello')
+
+        self.storage.delete('b/new')
+        self.assertIsNone(self.storage.stat('b/new'))
+
+    def test_multipart(self):
+        parts = [os.urandom(PART_SIZE), b'last']
+        upload_id = self.storage.create_multipart('tmp/upload')
+        # 조각을 순서와 다르게 올려도 번호 순서로 합침
+        self.storage.upload_part('tmp/upload', upload_id, 2, parts[1])
+        self.storage.upload_part('tmp/upload', upload_id, 1, parts[0])
+        self.storage.complete_multipart('tmp/upload', upload_id, [1, 2])
+        self.assertEqual(b''.join(self.storage.open_stream('tmp/upload')), b''.join(parts))
+
+        upload_id = self.storage.create_multipart('tmp/aborted')
+        self.storage.upload_part('tmp/aborted', upload_id, 1, b'data')
+        self.storage.abort_multipart('tmp/aborted', upload_id)
+        self.assertNotIn('Uploads', self.s3.list_multipart_uploads(Bucket='attachments'))
+        self.assertFalse(self.storage.exists('tmp/aborted'))
+
+    # 다운로드는 HEAD 요청 한 번으로 파일 확인, 크기, 수정 시각을 모두 조회
+    def test_download(self):
+        user = User.objects.create_user('tester1', password='Passw0rd!', first_name='홍길동')
+        self.client.force_login(user)
+        data = os.urandom(1000)
+        digest = attachments.store_chunks([data])
+        post = Posts.objects.create(
+            title='제목', content='<p>내용</p>', created_by=user, filename=digest, original_filename='file.bin',
+        )
+
+        with mock.patch.object(self.storage.client, 'head_object', wraps=self.storage.client.head_object) as head:
+            response = self.client.get(f'/posts/download/{post.id}/')
+            self.assertEqual(b''.join(response), data)
+            self.assertEqual(head.call_count, 1)
+
+            response = self.client.get(f'/posts/download/{post.id}/', HTTP_RANGE='bytes=10-19')
+            self.assertEqual(response.status_code, 206)
+            self.assertEqual(response['Content-Range'], f'bytes 10-19/{len(data)}')
+            self.assertEqual(b''.join(response), data[10:20])
+            self.assertEqual(head.call_count, 2)
+
+        Posts.objects.filter(id=post.id).update(filename='0' * 64)
+        self.assertEqual(self.client.get(f'/posts/download/{post.id}/').status_code, 404)
+
+
+# 게시글 내용 정리 (보기 화면은 content_html을 이스케이프하지 않고 출력하므로 허용 목록 밖은 모두 제거되어야 함)
+class ContentSanitizerTests(SimpleTestCase):
+
+    def html(self, value):
+        return content.sanitize(value)[0]
+
+    def test_drops_script_and_embedded_content(self):
+        html = self.html('<p>앞<script>alert(1)</script>뒤</p><iframe src="https://example.com">x</iframe><svg><script>alert(2)</script></svg>')
+        self.assertEqual(html, '<p>앞뒤</p>')
+
+    def test_strips_event_handlers_and_unknown_attributes(self):
+        html = self.html('<p onclick="alert(1)" class="x">a</p><img src="/a.png" onerror="alert(1)" alt="그림">')
+        self.assertEqual(html, '<p>a</p><img src="/a.png" alt="그림">')
+
+    def test_strips_unsafe_urls(self):
+        for href in (
+            'javascript:alert(1)',
+            'JaVaScRiPt:alert(1)',
+            'java\tscript:alert(1)',
+            '&#106;avascript:alert(1)',
+            '&#x6A;&#x61;vascript:alert(1)',
+            'jav&#x09;ascript:alert(1)',
+            ' javascript:alert(1)',
+            'vbscript:msgbox(1)',
+            'data:text/html;base64,PHNjcmlwdD4=',
+        ):
+            with self.subTest(href=href):
+                self.assertEqual(self.html(f'<a href="{href}">링크</a>'), '<a>링크</a>')
+
+        self.assertEqual(self.html('<a href="https://example.com/?a=1&amp;b=2">링크</a>'), '<a href="https://example.com/?a=1&amp;b=2">링크</a>')
+        self.assertEqual(
+            self.html('<a href="/posts/" target="_blank">목록</a>'),
+            '<a href="/posts/" target="_blank" rel="noopener noreferrer">목록</a>',
+        )
+
+    def test_escapes_text_and_attributes(self):
+        self.assertEqual(self.html('<p title="x">&lt;b&gt; "따옴표"</p>'), '<p>&lt;b&gt; "따옴표"</p>')
+        self.assertEqual(self.html('<img src="/a.png" alt=\'"><script>\'>'), '<img src="/a.png" alt="&quot;&gt;&lt;script&gt;">')
+
+    def test_style_allowlist(self):
+        self.assertEqual(
+            self.html('<p style="text-align: center; color: rgb(255, 0, 0); position: fixed">a</p>'),
+            '<p style="text-align: center; color: rgb(255, 0, 0)">a</p>',
+        )
+        for style in (
+            'background-color: url(javascript:alert(1))',
+            'width: expression(alert(1))',
+            'color: red; background-color: url("https://example.com/a.png")',
+            'color: \\72 ed',
+            'color: red /* 주석 */',
+        ):
+            with self.subTest(style=style):
+                self.assertNotIn('url(', self.html(f'<span style=\'{style}\'>a</span>'))
+                self.assertNotIn('expression', self.html(f'<span style=\'{style}\'>a</span>'))
+        self.assertEqual(self.html('<span style="width: expression(alert(1))">a</span>'), '<span>a</span>')
+        self.assertEqual(content.clean_style('COLOR: #fff; font-size:  12px'), 'color: #fff; font-size: 12px')
+
+    def test_data_image_urls(self):
+        png = 'data:image/png;base64,iVBORw0KGgo='
+        self.assertEqual(self.html(f'<img src="{png}">'), f'<img src="{png}">')
+        self.assertEqual(self.html('<img src="data:image/svg+xml;base64,PHN2Zz48L3N2Zz4=">'), '<img>')
+        self.assertEqual(self.html('<img src="data:image/png,<svg onload=alert(1)>">'), '<img>')
+        # 이미지 외 태그에는 data: 주소를 허용하지 않음
+        self.assertEqual(self.html(f'<a href="{png}">a</a>'), '<a>a</a>')
+
+    def test_closes_unclosed_tags(self):
+        self.assertEqual(self.html('<p><b>굵게<i>기울임</p>'), '<p><b>굵게<i>기울임</i></b></p>')
+        self.assertEqual(self.html('</div>닫기만'), '닫기만')
+
+    def test_derive_counts(self):
+        derived = content.derive('<p>안녕하세요 <b>세계</b></p><p>둘째&nbsp;줄</p><script>숨김</script>')
+        # &nbsp;도 공백 하나로 합침
+        self.assertEqual(derived['excerpt'], '안녕하세요 세계 둘째 줄')
+        self.assertEqual(derived['word_count'], 4)
+        self.assertEqual(derived['char_count'], 13)
+
+        derived = content.derive('<p>' + '가' * 200 + '</p>')
+        self.assertEqual(derived['excerpt'], '가' * content.EXCERPT_LENGTH + '…')
+        self.assertEqual(derived['char_count'], 200)
+        self.assertEqual(content.derive(''), {'content_html': '', 'excerpt': '', 'word_count': 0, 'char_count': 0})
+
+
+# backfill_post_content: 계산하지 않은 게시글만 채우고, --all이면 모두 다시 계산 (수정일시는 그대로)
+class BackfillPostContentTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('tester1', password='Passw0rd!', first_name='홍길동')
+        cls.posts = [
+            Posts.objects.create(title=f'제목{index}', content=f'<p onclick="x">내용 {index}</p>', created_by=cls.user)
+            for index in range(5)
+        ]
+
+    def backfill(self, *args):
+        call_command('backfill_post_content', '--batch-size', '2', *args, stdout=StringIO())
+
+    def test_fills_missing(self):
+        Posts.objects.filter(id__in=[post.id for post in self.posts[:3]]).update(
+            content_html=None, excerpt='', word_count=0, char_count=0,
+        )
+        Posts.objects.filter(id=self.posts[3].id).update(excerpt='이전 요약')
+        updated_at = dict(Posts.objects.values_list('id', 'updated_at'))
+
+        self.backfill()
+        for index, post in enumerate(self.posts[:3]):
+            post.refresh_from_db()
+            self.assertEqual(post.content_html, f'<p>내용 {index}</p>')
+            self.assertEqual(post.excerpt, f'내용 {index}')
+            self.assertEqual((post.word_count, post.char_count), (2, 4))
+        self.assertEqual(Posts.objects.get(id=self.posts[3].id).excerpt, '이전 요약')
+        self.assertEqual(dict(Posts.objects.values_list('id', 'updated_at')), updated_at)
+
+        self.backfill('--all')
+        self.assertEqual(Posts.objects.get(id=self.posts[3].id).excerpt, '내용 3')
+
+
+# 검색 토큰화: 한글은 2-gram(색인은 마지막 글자까지), 그 외는 단어 단위
+class SearchTokenizeTests(SimpleTestCase):
+
+    def test_tokenize(self):
+        self.assertEqual(search.tokenize('한국어 검색'), ['한국', '국어', '어', '검색', '색'])
+        self.assertEqual(search.tokenize('Django 5.2와 파이썬'), ['django', '5', '2', '와', '파이', '이썬', '썬'])
+        self.assertEqual(search.tokenize('漢字'), ['漢字', '字'])
+        self.assertEqual(search.tokenize(''), [])
+
+    def test_query_tokens(self):
+        self.assertEqual(search.query_tokens('한국어'), [('한국', False), ('국어', False)])
+        # 한 글자와 영문/숫자는 접두어 검색
+        self.assertEqual(search.query_tokens('한 Dja'), [('한', True), ('dja', True)])
+        self.assertEqual(search.query_tokens('  !! '), [])
+
+
+# 게시글 저장/수정/삭제 후 작업으로 검색 인덱스 갱신, 검색 결과 페이지 조회
+@skipUnless(search.is_enabled(), '전문 검색을 지원하지 않는 데이터베이스입니다.')
+class SearchIndexTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('tester1', password='Passw0rd!', first_name='홍길동')
+
+    def ids(self, searchType, keyword):
+        return list(search.search_results(searchType, keyword, per_page=100)[:100])
+
+    def test_index_sync(self):
+        post = Posts.objects.create(title='한국어 검색', content='<p>전문 <b>검색</b> 내용</p>', created_by=self.user)
+        run_pending()
+        self.assertEqual(self.ids('title', '한국어'), [post.id])
+        self.assertEqual(self.ids('content', '내용'), [post.id])
+        self.assertEqual(self.ids('full_name', '길동'), [post.id])
+        self.assertEqual(self.ids('all', '한'), [post.id])
+        self.assertEqual(self.ids('title', '내용'), [])
+
+        post.title = '바뀐 제목'
+        post.save()
+        run_pending()
+        self.assertEqual(self.ids('title', '한국어'), [])
+        self.assertEqual(self.ids('title', '바뀐'), [post.id])
+
+        post.delete()
+        run_pending()
+        self.assertEqual(self.ids('all', '바뀐'), [])
+
+    # 미리 조회한 페이지는 마지막 페이지(요청 수가 전체 결과 수에 맞춰 줄어듦)도 다시 조회하지 않음
+    def test_prefetched_page(self):
+        posts = [Posts.objects.create(title=f'검색 {index}', content='<p>내용</p>', created_by=self.user) for index in range(13)]
+        run_pending()
+
+        for page, expected in (('1', posts[:-11:-1]), ('2', posts[2::-1])):
+            with self.subTest(page=page):
+                with self.assertNumQueries(1):
+                    results = search.search_results('title', '검색', page, 10)
+                with self.assertNumQueries(0):
+                    page_obj = Paginator(results, 10).get_page(page)
+                    self.assertEqual(list(page_obj.object_list), [post.id for post in expected])
+                self.assertEqual(page_obj.paginator.count, 13)
+
+        # 범위를 벗어난 페이지는 결과 수를 조회한 뒤 마지막 페이지
+        results = search.search_results('title', '검색', '5', 10)
+        page_obj = Paginator(results, 10).get_page('5')
+        self.assertEqual(page_obj.number, 2)
+        self.assertEqual(len(page_obj.object_list), 3)
+
+
+# 미리보기 이미지 생성 작업은 첨부 파일마다 한 번 (삭제된 뒤 같은 파일을 다시 올리면 다시 생성)
+@skipUnless(thumbnails.is_enabled(), 'Pillow가 설치되어 있지 않습니다.')
+class ThumbnailJobTests(TestCase):
+
+    def test_reuploaded_file_gets_new_job(self):
+        digest = 'a' * 64
+        attachment = Attachment.objects.create(digest=digest, size=10, ref_count=1, content_type='image/png')
+        Attachment.objects.filter(id=attachment.id).update(ref_count=2)
+        self.assertEqual(Job.objects.filter(name='posts.generate_thumbnails').count(), 1)
+
+        Job.objects.filter(name='posts.generate_thumbnails').update(status='done')
+        attachment.delete()
+        Attachment.objects.create(digest=digest, size=10, ref_count=1, content_type='image/png')
+        jobs = Job.objects.filter(name='posts.generate_thumbnails')
+        self.assertEqual(jobs.count(), 2)
+        self.assertEqual({job.payload['digest'] for job in jobs}, {digest})
+
+
+# 비동기 화면: 목록, 검색, 보기, 다운로드(Range), 등록
+@override_settings(ROOT_URLCONF='posts.tests')
+class AsyncViewTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('tester1', password='Passw0rd!', first_name='홍길동')
+        cls.post = Posts.objects.create(title='비동기 제목', content='<p>비동기 <b>내용</b></p>', created_by=cls.user)
+
+    def setUp(self):
+        cache.clear()
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        media = override_settings(MEDIA_ROOT=media_root.name)
+        media.enable()
+        self.addCleanup(media.disable)
+        self.async_client.force_login(self.user)
+
+    def test_views_are_async(self):
+        resolved = self.client.get('/posts/').resolver_match
+        self.assertIs(resolved.func, async_views.posts_list)
+
+    async def test_list(self):
+        response = await self.async_client.get('/posts/')
+        self.assertContains(response, '비동기 제목')
+        self.assertContains(response, '홍길동')
+
+    async def test_search(self):
+        await sync_to_async(run_pending)()
+        response = await self.async_client.get('/posts/', {'searchType': 'title', 'searchKeyword': '비동기'})
+        self.assertContains(response, '비동기 제목')
+        response = await self.async_client.get('/posts/', {'searchType': 'title', 'searchKeyword': '없는말'})
+        self.assertNotContains(response, '비동기 제목')
+
+    async def test_read(self):
+        for _ in range(2):
+            response = await self.async_client.get(f'/posts/read/{self.post.id}/')
+            self.assertContains(response, '<b>내용</b>', html=True)
+        response = await self.async_client.get('/posts/read/0/')
+        self.assertEqual(response.status_code, 404)
+
+    async def test_download_range(self):
+        data = os.urandom(100000)
+        digest = await sync_to_async(attachments.store_chunks)([data])
+        await Posts.objects.filter(id=self.post.id).aupdate(filename=digest, original_filename='파일.bin')
+
+        response = await self.async_client.get(f'/posts/download/{self.post.id}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join([chunk async for chunk in response.streaming_content]), data)
+
+        response = await self.async_client.get(f'/posts/download/{self.post.id}/', headers={'Range': 'bytes=10-19'})
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], f'bytes 10-19/{len(data)}')
+        self.assertEqual(b''.join([chunk async for chunk in response.streaming_content]), data[10:20])
+
+        response = await self.async_client.get(f'/posts/download/{self.post.id}/{"0" * 64}/')
+        self.assertEqual(response.status_code, 404)
+
+    async def test_create(self):
+        response = await self.async_client.post('/posts/create/', {
+            'title': '새 글', 'content': '<p>새 내용</p>', 'uploadFile': SimpleUploadedFile('a.txt', b'hello' * 1000),
+        })
+        post = await Posts.objects.alatest('id')
+        self.assertRedirects(response, f'/posts/read/{post.id}/', fetch_redirect_response=False)
+        self.assertEqual((post.title, post.created_by_id), ('새 글', self.user.id))
+
+        # 첨부 파일은 작업에서 해시 이름으로 이동
+        await sync_to_async(run_pending)()
+        await post.arefresh_from_db()
+        self.assertEqual(post.original_filename, 'a.txt')
+        response = await self.async_client.get(f'/posts/download/{post.id}/')
+        self.assertEqual(b''.join([chunk async for chunk in response.streaming_content]), b'hello' * 1000)
+
+        response = await self.async_client.post('/posts/create/', {'title': '', 'content': ''})
+        self.assertEqual(response.status_code, 200)
+
+
+# 첨부 파일 다운로드: Range, If-Range, 조건부 요청(304), 만족할 수 없는 범위(416)
+class DownloadTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('tester1', password='Passw0rd!', first_name='홍길동')
+
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        media = override_settings(MEDIA_ROOT=media_root.name)
+        media.enable()
+        self.addCleanup(media.disable)
+
+        self.data = os.urandom(1000)
+        digest = attachments.store_chunks([self.data])
+        self.post = Posts.objects.create(
+            title='제목', content='<p>내용</p>', created_by=self.user, filename=digest, original_filename='파일.bin',
+        )
+        self.etag = f'"{digest}"'
+        self.url = f'/posts/download/{self.post.id}/'
+        self.client.force_login(self.user)
+
+    # get(If_Range=...) → If-Range 헤더
+    def get(self, **headers):
+        return self.client.get(self.url, headers={name.replace('_', '-'): value for name, value in headers.items()})
+
+    def test_full(self):
+        response = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), self.data)
+        self.assertEqual(response['Content-Length'], '1000')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertEqual(response['ETag'], self.etag)
+        self.assertEqual(response['Content-Disposition'], "attachment; filename*=UTF-8''%ED%8C%8C%EC%9D%BC.bin")
+
+    def test_single_range(self):
+        response = self.get(Range='bytes=100-199')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], 'bytes 100-199/1000')
+        self.assertEqual(response['Content-Length'], '100')
+        self.assertEqual(b''.join(response.streaming_content), self.data[100:200])
+
+        # 끝을 넘는 범위는 파일 끝까지
+        response = self.get(Range='bytes=990-2000')
+        self.assertEqual(response['Content-Range'], 'bytes 990-999/1000')
+        self.assertEqual(b''.join(response.streaming_content), self.data[990:])
+
+    def test_suffix_range(self):
+        response = self.get(Range='bytes=-10')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], 'bytes 990-999/1000')
+        self.assertEqual(b''.join(response.streaming_content), self.data[-10:])
+
+    def test_unsatisfiable_range(self):
+        for header in ('bytes=1000-', 'bytes=500-400', 'bytes=-0'):
+            with self.subTest(header=header):
+                response = self.get(Range=header)
+                self.assertEqual(response.status_code, 416)
+                self.assertEqual(response['Content-Range'], 'bytes */1000')
+
+        # 해석할 수 없는 Range(여러 구간 등)는 무시하고 전체 전송
+        response = self.get(Range='bytes=0-1,5-6')
+        self.assertEqual(response.status_code, 200)
+
+    def test_if_range(self):
+        response = self.get(Range='bytes=0-9', If_Range=self.etag)
+        self.assertEqual(response.status_code, 206)
+
+        # 파일이 바뀌었으면(ETag 불일치) 전체 전송
+        response = self.get(Range='bytes=0-9', If_Range='"other"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), self.data)
+
+        last_modified = self.get()['Last-Modified']
+        self.assertEqual(self.get(Range='bytes=0-9', If_Range=last_modified).status_code, 206)
+        self.assertEqual(self.get(Range='bytes=0-9', If_Range='Mon, 01 Jan 2001 00:00:00 GMT').status_code, 200)
+
+    def test_conditional_get(self):
+        response = self.get(If_None_Match=self.etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], self.etag)
+        self.assertEqual(response.content, b'')
+
+        self.assertEqual(self.get(If_None_Match='"other"').status_code, 200)
+        last_modified = self.get()['Last-Modified']
+        self.assertEqual(self.get(If_Modified_Since=last_modified).status_code, 304)
+
+    def test_parse_range(self):
+        self.assertEqual(downloads.parse_range('bytes=0-0', 10), (0, 0))
+        self.assertEqual(downloads.parse_range('bytes=5-', 10), (5, 9))
+        self.assertEqual(downloads.parse_range('bytes=-20', 10), (0, 9))
+        self.assertIsNone(downloads.parse_range('bytes=-', 10))
+        self.assertIsNone(downloads.parse_range('items=0-1', 10))
+        self.assertIsNone(downloads.parse_range(None, 10))
+        self.assertIs(downloads.parse_range('bytes=0-', 0), False)
+
+
+# 같은 내용의 첨부 파일은 한 번만 저장하고 참조 수로 관리 (마지막 참조가 해제되면 원본과 미리보기 삭제)
+class AttachmentRefCountTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('tester1', password='Passw0rd!', first_name='홍길동')
+
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        media = override_settings(MEDIA_ROOT=media_root.name)
+        media.enable()
+        self.addCleanup(media.disable)
+        self.storage = get_attachment_storage()
+        self.client.force_login(self.user)
+
+    # 참조 해제 후 파일 삭제는 커밋 후 콜백에서 실행
+    def run_jobs(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            run_pending()
+
+    def image(self):
+        if not thumbnails.is_enabled():
+            return b'not an image' * 100
+        from PIL import Image
+
+        output = BytesIO()
+        Image.new('RGB', (800, 600), 'red').save(output, 'PNG')
+        return output.getvalue()
+
+    def create_post(self, data, filename):
+        self.client.post('/posts/create/', {
+            'title': '제목', 'content': '<p>내용</p>', 'uploadFile': SimpleUploadedFile(filename, data),
+        })
+        return Posts.objects.latest('id')
+
+    def test_dedup_and_release(self):
+        data = self.image()
+        first = self.create_post(data, 'a.png')
+        second = self.create_post(data, 'b.png')
+        self.run_jobs()
+        first.refresh_from_db()
+        second.refresh_from_db()
+
+        self.assertEqual(first.filename, second.filename)
+        self.assertEqual((first.original_filename, second.original_filename), ('a.png', 'b.png'))
+        attachment = Attachment.objects.get()
+        self.assertEqual((attachment.digest, attachment.size, attachment.ref_count), (first.filename, len(data), 2))
+        names = attachments.attachment_names(attachment)
+        if thumbnails.is_enabled():
+            self.assertGreater(len(names), 1)
+        for name in names:
+            self.assertTrue(self.storage.exists(name), name)
+        # 임시 파일은 남지 않음
+        self.assertEqual(os.listdir(self.storage.path('attachments/tmp')), [])
+
+        self.client.post(f'/posts/delete/{first.id}/')
+        self.run_jobs()
+        self.assertEqual(Attachment.objects.get().ref_count, 1)
+        self.assertTrue(self.storage.exists(names[0]))
+
+        self.client.post(f'/posts/delete/{second.id}/')
+        self.run_jobs()
+        self.assertFalse(Attachment.objects.exists())
+        for name in names:
+            self.assertFalse(self.storage.exists(name), name)
+
+    # 첨부 파일을 바꾸면 이전 파일의 참조 해제
+    def test_replace_releases_previous(self):
+        post = self.create_post(b'first', 'a.txt')
+        self.run_jobs()
+        previous = Posts.objects.get(id=post.id).filename
+
+        self.client.post(f'/posts/update/{post.id}/', {
+            'title': '제목', 'content': '<p>내용</p>', 'uploadFile': SimpleUploadedFile('b.txt', b'second'),
+        })
+        self.run_jobs()
+        post.refresh_from_db()
+        self.assertNotEqual(post.filename, previous)
+        self.assertEqual(list(Attachment.objects.values_list('digest', 'ref_count')), [(post.filename, 1)])
+        self.assertFalse(self.storage.exists(attachments.digest_name(previous)))
+
+    def test_add_ref(self):
+        attachments.add_ref('b' * 64, 10, '')
+        attachments.add_ref('b' * 64, 10, '')
+        self.assertEqual(Attachment.objects.get().ref_count, 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            attachments.release_digest('b' * 64)
+        self.assertEqual(Attachment.objects.get().ref_count, 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            attachments.release_digest('b' * 64)
+        self.assertFalse(Attachment.objects.exists())
+
+
+# 내보내기(JSONL/CSV + 첨부 파일 tar) → 빈 데이터베이스로 가져오기
+class TransferRoundTripTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user('author1', password='Passw0rd!', first_name='작성자')
+        cls.editor = User.objects.create_user('editor1', password='Passw0rd!', first_name='수정자')
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.use_media('export')
+
+    def use_media(self, name):
+        media = override_settings(MEDIA_ROOT=os.path.join(self.tmp.name, name))
+        media.enable()
+        self.addCleanup(media.disable)
+
+    def create_posts(self):
+        shared = attachments.store_chunks([b'shared file'])
+        Attachment.objects.filter(digest=shared).update(ref_count=2)
+        created_at = timezone.now().replace(microsecond=0) - timezone.timedelta(days=3)
+        posts = [
+            Posts.objects.create(title='첫 번째 글', content='<p>한국어 <b>내용</b></p>', created_by=self.author,
+                                 filename=shared, original_filename='공유.txt'),
+            Posts.objects.create(title='두 번째 글', content='<p>' + '긴 내용 ' * 30000 + '</p>', created_by=self.author,
+                                 updated_by=self.editor, filename=shared, original_filename='같은 파일.txt'),
+            Posts.objects.create(title='이전 방식 첨부', content='<p>x</p>', created_by=self.editor, filename='legacy.txt',
+                                 original_filename='legacy.txt'),
+            Posts.objects.create(title='첨부 없음', content='<p>y</p>', created_by=self.editor),
+        ]
+        get_attachment_storage().save_stream(f'posts/{posts[2].id}/legacy.txt', [b'legacy file'])
+        Posts.objects.filter(id=posts[0].id).update(created_at=created_at, updated_at=created_at)
+        return shared, created_at
+
+    # 게시글, 첨부 파일, 검색 인덱스를 모두 지우고 새 저장소 사용 (사용자는 그대로)
+    def empty_database(self):
+        Posts.objects.all().delete()
+        Attachment.objects.all().delete()
+        Job.objects.all().delete()
+        search.rebuild_index(Posts.objects.none())
+        self.use_media('import')
+
+    def round_trip(self, fmt):
+        shared, created_at = self.create_posts()
+        records = os.path.join(self.tmp.name, f'posts.{fmt}')
+        tar = os.path.join(self.tmp.name, 'attachments.tar')
+        call_command('posts_export', records, '--attachments', tar, stdout=StringIO())
+
+        self.empty_database()
+        output = StringIO()
+        call_command('posts_import', records, '--attachments', tar, '--batch-size', '2', stdout=output)
+        self.assertIn('게시글 4개를 가져왔습니다.', output.getvalue())
+
+        posts = {post.title: post for post in Posts.objects.select_related('created_by', 'updated_by')}
+        self.assertEqual(len(posts), 4)
+        first, second, legacy, plain = (posts[title] for title in ('첫 번째 글', '두 번째 글', '이전 방식 첨부', '첨부 없음'))
+        self.assertEqual((first.created_by.username, second.updated_by.username, plain.created_by.username),
+                         ('author1', 'editor1', 'editor1'))
+        self.assertEqual((first.created_at, first.updated_at), (created_at, created_at))
+        self.assertEqual(first.content_html, '<p>한국어 <b>내용</b></p>')
+        self.assertEqual(len(second.content), len('<p>' + '긴 내용 ' * 30000 + '</p>'))
+
+        # 같은 파일은 하나로 저장하고 참조 수는 가져온 게시글 수, 이전 방식 파일은 해시 이름으로 저장
+        storage = get_attachment_storage()
+        self.assertEqual((first.filename, second.filename), (shared, shared))
+        self.assertEqual((first.original_filename, plain.filename), ('공유.txt', None))
+        self.assertTrue(attachments.is_digest(legacy.filename))
+        self.assertEqual(
+            dict(Attachment.objects.values_list('digest', 'ref_count')), {shared: 2, legacy.filename: 1},
+        )
+        with storage.open(attachments.digest_name(legacy.filename), 'rb') as f:
+            self.assertEqual(f.read(), b'legacy file')
+        self.assertEqual(os.listdir(storage.path('attachments/tmp')), [])
+
+        if search.is_enabled():
+            self.assertCountEqual(search.search_results('title', '번째', per_page=10)[:10], [first.id, second.id])
+            self.assertCountEqual(search.search_results('full_name', '수정자', per_page=10)[:10], [legacy.id, plain.id])
+
+    def test_jsonl(self):
+        self.round_trip('jsonl')
+
+    # CSV 기본 필드 크기 제한(128KB)보다 큰 내용도 가져옴
+    def test_csv(self):
+        limit = csv.field_size_limit(128 * 1024)
+        self.addCleanup(csv.field_size_limit, limit)
+        self.round_trip('csv')
+
+
+# attachments_gc: 고아 파일, --grace 안의 파일, 끊어진 참조, 참조 수 불일치 / 확인만 하기와 --delete
+class AttachmentsGcTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('tester1', password='Passw0rd!')
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        media = override_settings(MEDIA_ROOT=tmp.name)
+        media.enable()
+        self.addCleanup(media.disable)
+        self.storage = get_attachment_storage()
+
+    def save(self, name, data, age=0):
+        self.storage.save_stream(name, [data])
+        if age:
+            mtime = os.path.getmtime(self.storage.path(name)) - age
+            os.utime(self.storage.path(name), (mtime, mtime))
+        return name
+
+    def gc(self, *args):
+        output = StringIO()
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('attachments_gc', '--grace', '3600', '--verbosity', '2', *args, stdout=output)
+        return output.getvalue()
+
+    def test_gc(self):
+        created_at = timezone.now() - timezone.timedelta(hours=2)
+        # 게시글 하나가 참조하지만 참조 수가 3, 아무도 참조하지 않지만 참조 수가 1
+        used = attachments.store_chunks([b'used'])
+        unused = attachments.store_chunks([b'unused'])
+        Attachment.objects.filter(digest=used).update(ref_count=3, created_at=created_at)
+        Attachment.objects.filter(digest=unused).update(ref_count=1, created_at=created_at)
+        post = Posts.objects.create(title='첨부', content='x', created_by=self.user, filename=used, original_filename='a.txt')
+        dangling = Posts.objects.create(title='끊어진 참조', content='x', created_by=self.user, filename='c' * 64,
+                                        original_filename='c.txt')
+        legacy = Posts.objects.create(title='이전 방식', content='x', created_by=self.user, filename='gone.txt',
+                                      original_filename='gone.txt')
+
+        orphan = self.save(attachments.digest_name('d' * 64), b'orphan', age=7200)
+        old_tmp = self.save('attachments/tmp/old', b'old', age=7200)
+        new_tmp = self.save('attachments/tmp/new', b'new')
+        new_orphan = self.save(attachments.digest_name('e' * 64), b'new orphan')
+
+        output = self.gc()
+        self.assertIn(f'고아 파일: {orphan}', output)
+        self.assertIn(f'고아 파일: {old_tmp}', output)
+        self.assertNotIn(new_tmp, output)
+        self.assertNotIn(new_orphan, output)
+        self.assertIn(f'끊어진 참조: 게시글 #{dangling.id}', output)
+        self.assertIn(f'끊어진 참조: 게시글 #{legacy.id}', output)
+        self.assertIn(f'참조 수 불일치: 첨부 파일 {used} (3 → 1)', output)
+        self.assertIn(f'참조 수 불일치: 첨부 파일 {unused} (1 → 0)', output)
+        self.assertIn('고아 파일 2개 (0.0MB) 발견, 끊어진 참조 2개 발견, 참조 수가 어긋난 첨부 파일 2개 발견', output)
+        self.assertIn('--delete', output)
+
+        # 확인만 하면 아무것도 바꾸지 않음
+        for name in (orphan, old_tmp, new_tmp, new_orphan, attachments.digest_name(unused)):
+            self.assertTrue(self.storage.exists(name), name)
+        self.assertEqual(dict(Attachment.objects.values_list('digest', 'ref_count')), {used: 3, unused: 1})
+        self.assertEqual(Posts.objects.filter(filename__isnull=False).count(), 3)
+
+        output = self.gc('--delete')
+        self.assertIn('고아 파일 2개 (0.0MB) 삭제, 끊어진 참조 2개 정리, 참조 수가 어긋난 첨부 파일 2개 정리', output)
+        self.assertFalse(self.storage.exists(orphan))
+        self.assertFalse(self.storage.exists(old_tmp))
+        self.assertTrue(self.storage.exists(new_tmp))
+        self.assertTrue(self.storage.exists(new_orphan))
+
+        # 참조 수를 다시 세고, 참조가 없어진 첨부 파일은 파일까지 삭제
+        self.assertEqual(dict(Attachment.objects.values_list('digest', 'ref_count')), {used: 1})
+        self.assertTrue(self.storage.exists(attachments.digest_name(used)))
+        self.assertFalse(self.storage.exists(attachments.digest_name(unused)))
+        self.assertEqual(list(Posts.objects.filter(filename__isnull=False).values_list('id', flat=True)), [post.id])
+        self.assertEqual(Posts.objects.get(id=dangling.id).original_filename, None)
+
+        self.assertIn('고아 파일 0개 (0.0MB) 발견, 끊어진 참조 0개 발견, 참조 수가 어긋난 첨부 파일 0개 발견', self.gc())
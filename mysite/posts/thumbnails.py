@@ -0,0 +1,135 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.urls import reverse
+
+from . import attachments, cache, imaging
+from .models import Attachment, Posts
+from .storage import get_attachment_storage
+
+# 미리보기 이미지 이름 → 최대 너비/높이 (px)
+SIZES = getattr(settings, 'POSTS_THUMBNAIL_SIZES', {'thumb': 320, 'preview': 1280})
+# 이미지 변환 프로세스 수 (None: CPU 수)
+PROCESSES = getattr(settings, 'POSTS_THUMBNAIL_PROCESSES', None)
+# 이보다 큰 원본은 미리보기 이미지를 만들지 않음 (바이트)
+MAX_SOURCE_SIZE = getattr(settings, 'POSTS_THUMBNAIL_MAX_SOURCE_SIZE', 50 * 1024 * 1024)
+QUALITY = getattr(settings, 'POSTS_THUMBNAIL_QUALITY', 80)
+
+# 확장자 → Content-Type (브라우저가 WebP를 지원하지 않으면 JPEG 사용)
+FORMATS = {'webp': 'image/webp', 'jpeg': 'image/jpeg'}
+
+# 이미지 변환은 CPU를 많이 사용하므로 별도 프로세스에서 실행 (작업자 프로세스마다 하나씩 생성)
+_pool = None
+
+
+def get_pool(processes=None):
+    global _pool
+    if _pool is None:
+        # fork는 스레드와 데이터베이스 연결을 복사하므로 spawn 사용
+        _pool = ProcessPoolExecutor(max_workers=processes or PROCESSES, mp_context=multiprocessing.get_context('spawn'))
+    return _pool
+
+
+def shutdown_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown()
+        _pool = None
+
+
+def is_enabled():
+    return bool(SIZES) and imaging.is_available()
+
+
+def require_pillow():
+    if not imaging.is_available():
+        raise ImproperlyConfigured('미리보기 이미지를 만들려면 Pillow를 설치해주세요.')
+
+
+def is_image(attachment):
+    return attachment.content_type in imaging.CONTENT_TYPES
+
+
+# 원본 파일 내용 (너무 크면 None)
+def load_source(attachment):
+    if attachment.size > MAX_SOURCE_SIZE:
+        return None
+    stream = get_attachment_storage().open_stream(attachments.digest_name(attachment.digest))
+    try:
+        return b''.join(stream)
+    finally:
+        stream.close()
+
+
+# 변환 결과 저장 후 첨부 파일 정보 갱신, 게시글 보기 캐시 삭제
+# result가 None이면 이미지로 열 수 없는 파일이므로 다시 시도하지 않도록 형식 변경
+# 파일 저장은 트랜잭션 밖에서 하고 첨부 파일 정보만 짧은 트랜잭션으로 갱신
+def save_variants(attachment, result):
+    if result is None:
+        Attachment.objects.filter(id=attachment.id).update(content_type='application/octet-stream', variants={})
+    else:
+        storage = get_attachment_storage()
+        variants = {}
+        names = []
+        for variant, info in result['variants'].items():
+            for fmt in FORMATS:
+                names.append(attachments.variant_name(attachment.digest, variant, fmt))
+                storage.save_stream(names[-1], [info[fmt]])
+            variants[variant] = {'width': info['width'], 'height': info['height'], 'formats': list(FORMATS)}
+        with transaction.atomic():
+            updated = Attachment.objects.filter(id=attachment.id, ref_count__gt=0).update(
+                width=result['width'], height=result['height'], variants=variants,
+            )
+        if not updated:
+            # 변환하는 동안 첨부 파일이 삭제됨
+            attachments.delete_files(names)
+            return
+
+    cache.invalidate_read(Posts.objects.filter(filename=attachment.digest).values_list('id', 'updated_at'))
+
+
+# 미리보기 이미지 생성 (백그라운드 작업, 원본 읽기와 변환은 트랜잭션 밖에서 실행)
+def generate(digest):
+    require_pillow()
+    attachment = Attachment.objects.filter(digest=digest).first()
+    if attachment is None or not is_image(attachment):
+        return False
+
+    data = load_source(attachment)
+    if data is None:
+        save_variants(attachment, None)
+        return False
+    try:
+        result = get_pool().submit(imaging.render_variants, data, SIZES, QUALITY).result()
+    except BrokenProcessPool:
+        # 변환 프로세스가 비정상 종료됨: 다음 시도에서 새로 생성
+        shutdown_pool()
+        raise
+    save_variants(attachment, result)
+    return result is not None
+
+
+# 게시글 보기 화면의 <picture> 정보 (미리보기가 없으면 None)
+def picture(post, attachment):
+    if attachment is None or not attachment.variants:
+        return None
+
+    def srcset(fmt):
+        return ', '.join(
+            f'{reverse("posts:thumbnail", args=[post.id, attachment.digest, variant, fmt])} {info["width"]}w'
+            for variant, info in sorted(attachment.variants.items(), key=lambda item: item[1]['width'])
+        )
+
+    # 가장 큰 미리보기를 기본 이미지로 사용
+    variant, info = max(attachment.variants.items(), key=lambda item: item[1]['width'])
+    return {
+        'webp_srcset': srcset('webp'),
+        'jpeg_srcset': srcset('jpeg'),
+        'src': reverse('posts:thumbnail', args=[post.id, attachment.digest, variant, 'jpeg']),
+        'width': info['width'],
+        'height': info['height'],
+    }
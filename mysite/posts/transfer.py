@@ -0,0 +1,255 @@
+import csv
+import itertools
+import json
+import sys
+import tarfile
+from collections import Counter as Tally
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db.models import F
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from . import attachments, content, search
+from .models import Attachment, Posts
+from .storage import PART_SIZE, get_attachment_storage
+from .writes import run_serialized
+
+# 게시글 가져오기/내보내기 (manage.py posts_import / posts_export)
+# 한 줄에 게시글 하나 (JSONL 또는 CSV), 첨부 파일은 별도 tar 파일
+
+FORMATS = ['jsonl', 'csv']
+FIELDS = [
+    'id', 'title', 'content', 'created_by', 'updated_by', 'created_at', 'updated_at',
+    'original_filename', 'attachment',
+]
+EXPORT_VALUES = [
+    'id', 'title', 'content', 'created_by__username', 'updated_by__username', 'created_at', 'updated_at',
+    'filename', 'original_filename',
+]
+USER_FIELDS = ['id', 'username', 'first_name']
+
+
+# 파일 확장자로 형식 판단 (stdin/stdout은 jsonl)
+def detect_format(path, fmt=None):
+    if fmt:
+        return fmt
+    return 'csv' if path.lower().endswith('.csv') else 'jsonl'
+
+
+# 첨부 파일의 tar 안 이름 (내용 해시 파일은 해시, 이전 방식 파일은 저장 경로)
+def member_name(post_id, filename):
+    if attachments.is_digest(filename):
+        return f'attachments/{filename}'
+    return f'posts/{post_id}/{filename}'
+
+
+# 게시글을 id 순서로 조금씩 읽어서 반환 (서버 측 커서, 메모리 사용량 일정)
+def export_records(chunk_size=2000):
+    rows = Posts.objects.order_by('id').values(*EXPORT_VALUES).iterator(chunk_size=chunk_size)
+    for row in rows:
+        yield {
+            'id': row['id'],
+            'title': row['title'],
+            'content': row['content'],
+            'created_by': row['created_by__username'] or '',
+            'updated_by': row['updated_by__username'] or '',
+            'created_at': row['created_at'].isoformat(),
+            'updated_at': row['updated_at'].isoformat(),
+            'original_filename': row['original_filename'] or '',
+            'attachment': member_name(row['id'], row['filename']) if row['filename'] else '',
+        }
+
+
+# 게시글을 한 줄씩 쓰면서 그대로 반환 (진행 상황 표시용)
+def write_records(records, stream, fmt):
+    if fmt == 'csv':
+        writer = csv.DictWriter(stream, fieldnames=FIELDS)
+        writer.writeheader()
+        for record in records:
+            writer.writerow(record)
+            yield record
+    else:
+        for record in records:
+            stream.write(json.dumps(record, ensure_ascii=False))
+            stream.write('\n')
+            yield record
+
+
+def read_records(stream, fmt):
+    if fmt == 'csv':
+        # 게시글 내용은 기본 필드 크기 제한(128KB)보다 클 수 있음
+        csv.field_size_limit(sys.maxsize)
+        yield from csv.DictReader(stream)
+    else:
+        for line in stream:
+            if line.strip():
+                yield json.loads(line)
+
+
+# 첨부 파일을 tar로 내보내기 (같은 파일은 한 번만, 파일 하나씩 전송)
+def export_attachments(fileobj, chunk_size=2000):
+    digests = (
+        Attachment.objects.filter(ref_count__gt=0).order_by('id')
+        .values_list('digest', flat=True).iterator(chunk_size=chunk_size)
+    )
+    legacy = (
+        Posts.objects.exclude(filename__isnull=True).exclude(filename='')
+        .exclude(filename__regex=attachments.DIGEST_RE.pattern).order_by('id')
+        .values_list('id', 'filename').iterator(chunk_size=chunk_size)
+    )
+    names = itertools.chain(
+        ((attachments.digest_name(digest), member_name(None, digest)) for digest in digests),
+        ((f'posts/{post_id}/{filename}', member_name(post_id, filename)) for post_id, filename in legacy),
+    )
+
+    storage = get_attachment_storage()
+    count = size = 0
+    with tarfile.open(fileobj=fileobj, mode='w|') as tar:
+        for name, member in names:
+            stat = storage.stat(name)
+            if stat is None:
+                continue
+            info = tarfile.TarInfo(member)
+            info.size = stat.size
+            info.mtime = int(stat.modified_time.timestamp())
+            with storage.open(name, 'rb') as f:
+                tar.addfile(info, f)
+            count += 1
+            size += info.size
+    return count, size
+
+
+def parse_time(value):
+    if not value:
+        return None
+    parsed = parse_datetime(value)
+    if parsed is not None and settings.USE_TZ and timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+# 게시글 가져오기: 묶음마다 하나의 트랜잭션으로 bulk_create
+# bulk_create는 시그널을 거치지 않으므로 정리된 내용, 검색 색인, 첨부 파일 참조 수를 직접 처리
+class Importer:
+    def __init__(self, batch_size=1000, default_user=None):
+        self.batch_size = batch_size
+        self.default_user = default_user
+        self.users = {}
+        # tar 안 이름 → 해시 (이전 방식 파일만, 해시 파일은 이름에 해시가 있음)
+        self.members = {}
+        # tar에서 저장한 파일 (가져오기가 끝나면 저장할 때 늘린 참조 수를 되돌림)
+        self.staged = set()
+        self.created = 0
+        self.skipped = 0
+        self.missing_attachments = 0
+
+    # 첨부 파일 tar를 읽으면서 파일마다 해시 이름으로 저장
+    def import_attachments(self, fileobj):
+        count = size = 0
+        with tarfile.open(fileobj=fileobj, mode='r|*') as tar:
+            for info in tar:
+                if not info.isfile():
+                    continue
+                f = tar.extractfile(info)
+                digest = attachments.store_chunks(iter(lambda: f.read(PART_SIZE), b''))
+                if info.name != member_name(None, digest):
+                    self.members[info.name] = digest
+                self.staged.add(digest)
+                count += 1
+                size += info.size
+        return count, size
+
+    def digest_for(self, member):
+        if not member:
+            return None
+        if member in self.members:
+            return self.members[member]
+        name = member.rsplit('/', 1)[-1]
+        return name if member.startswith('attachments/') and attachments.is_digest(name) else None
+
+    # 작성자 아이디 → 사용자 (묶음마다 모르는 아이디만 한 번에 조회)
+    def resolve_users(self, records):
+        usernames = {
+            username for record in records
+            for username in (record.get('created_by'), record.get('updated_by'))
+            if username and username not in self.users
+        }
+        if usernames:
+            for user in User.objects.filter(username__in=usernames).only(*USER_FIELDS):
+                self.users[user.username] = user
+            for username in usernames - self.users.keys():
+                self.users[username] = None
+
+    def user_for(self, username):
+        return self.users.get(username) if username else None
+
+    def import_records(self, records, progress=None):
+        for batch in itertools.zip_longest(*[iter(records)] * self.batch_size):
+            batch = [record for record in batch if record is not None]
+            created, skipped, missing = run_serialized(self.save_batch, batch)
+            # 트랜잭션이 커밋된 뒤에 집계 (잠금 때문에 다시 실행해도 한 번만 계산)
+            self.created += created
+            self.skipped += skipped
+            self.missing_attachments += missing
+            if progress:
+                progress(self)
+
+    def save_batch(self, records):
+        self.resolve_users(records)
+        existing = set(Attachment.objects.filter(
+            digest__in={self.digest_for(record.get('attachment')) for record in records} - {None},
+        ).values_list('digest', flat=True))
+
+        posts, timestamps, refs = [], [], Tally()
+        skipped = missing = 0
+        for record in records:
+            created_by = self.user_for(record.get('created_by')) or self.default_user
+            if created_by is None:
+                skipped += 1
+                continue
+            post = Posts(
+                title=record['title'],
+                content=record['content'],
+                created_by=created_by,
+                updated_by=self.user_for(record.get('updated_by')) or created_by,
+                original_filename=record.get('original_filename') or None,
+            )
+            content.apply(post)
+
+            digest = self.digest_for(record.get('attachment'))
+            if digest in existing:
+                post.filename = digest
+                refs[digest] += 1
+            elif record.get('attachment'):
+                missing += 1
+            if not post.filename:
+                post.original_filename = None
+
+            posts.append(post)
+            timestamps.append((parse_time(record.get('created_at')), parse_time(record.get('updated_at'))))
+
+        Posts.objects.bulk_create(posts)
+
+        # bulk_create는 auto_now/auto_now_add 값으로 덮어쓰므로 원래 작성/수정일시를 다시 저장
+        restored = []
+        for post, (created_at, updated_at) in zip(posts, timestamps):
+            if created_at or updated_at:
+                post.created_at = created_at or post.created_at
+                post.updated_at = updated_at or created_at or post.updated_at
+                restored.append(post)
+        if restored:
+            Posts.objects.bulk_update(restored, ['created_at', 'updated_at'])
+
+        for digest, count in refs.items():
+            Attachment.objects.filter(digest=digest).update(ref_count=F('ref_count') + count)
+        for post in posts:
+            search.index_post(post)
+        return len(posts), skipped, missing
+
+    # tar에서 저장할 때 늘어난 참조 수 되돌림 (게시글이 참조하지 않는 파일은 삭제)
+    def release_staged(self):
+        for digest in self.staged:
+            run_serialized(attachments.release_digest, digest)
+        self.staged.clear()
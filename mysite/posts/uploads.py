@@ -0,0 +1,249 @@
+import hashlib
+import math
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+
+from . import attachments, tasks
+from .models import UploadSession
+from .storage import CHUNK_SIZE, PART_SIZE, get_attachment_storage
+from .writes import run_serialized
+
+MAX_SIZE = getattr(settings, 'POSTS_UPLOAD_MAX_SIZE', 2 * 1024 * 1024 * 1024)
+# 마지막으로 조각을 받거나 완료한 뒤 이 시간(초) 안에 이어 올리거나 게시글에 연결하지 않으면 취소
+SESSION_TTL = getattr(settings, 'POSTS_UPLOAD_SESSION_TTL', 60 * 60 * 24)
+# 만료 확인이 필요한 상태 (조각이 남아 있거나 첨부 파일 참조를 잡고 있음)
+# 처리 중('processing')인 업로드는 작업(posts.complete_upload)이 끝내므로 만료시키지 않음
+OPEN_STATUSES = ('uploading', 'completed')
+
+
+def new_expires_at():
+    return timezone.now() + timedelta(seconds=SESSION_TTL)
+
+
+# 분할 업로드 오류 (HTTP 상태 코드 포함)
+class UploadError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+
+# 업로드 상태 (클라이언트가 이어 올릴 위치 확인)
+def session_state(session):
+    return {
+        'upload_id': str(session.id),
+        'filename': session.filename,
+        'size': session.size,
+        'chunk_size': session.chunk_size,
+        'offset': session.received,
+        'status': session.status,
+        'digest': session.digest,
+    }
+
+
+# 폼에서 넘어온 업로드 ID로 완료된 업로드 조회
+def completed_session(user, upload_id):
+    if not upload_id:
+        return None
+    try:
+        return UploadSession.objects.filter(id=upload_id, created_by=user, status='completed').first()
+    except ValidationError:
+        return None
+
+
+# 분할 업로드 시작
+def init_upload(user, filename, size):
+    if not filename or len(filename) > 100:
+        raise UploadError('파일명은 1자 이상 100자 이하로 입력해주세요.')
+    if size is None or size < 0:
+        raise UploadError('파일 크기가 올바르지 않습니다.')
+    if size > MAX_SIZE:
+        raise UploadError('업로드할 수 있는 최대 크기를 초과했습니다.', status=413)
+
+    session = UploadSession(
+        filename=filename, size=size, chunk_size=PART_SIZE, created_by=user, expires_at=new_expires_at(),
+    )
+    session.storage_upload_id = get_attachment_storage().create_multipart(session.storage_name)
+    session.save()
+    tasks.expire_uploads(session.expires_at)
+    return session
+
+
+# 조각 저장: offset은 조각 크기의 배수, 이미 받은 위치 이후로는 건너뛸 수 없음
+# 요청 본문 읽기와 저장소 업로드는 트랜잭션 밖에서 하고 받은 위치만 조건부 UPDATE로 기록
+# (클라이언트가 조각을 보내는 동안 쓰기 잠금을 잡지 않음)
+def write_chunk(session, offset, stream, length, checksum=None):
+    if session.status != 'uploading':
+        raise UploadError('이미 완료되었거나 취소된 업로드입니다.', status=409)
+    if offset is None or offset % session.chunk_size or offset > session.received:
+        raise UploadError('조각 위치가 올바르지 않습니다.', status=409)
+
+    expected = min(session.chunk_size, session.size - offset)
+    if length != expected:
+        raise UploadError('조각 크기가 올바르지 않습니다.')
+
+    # 요청 본문을 나눠 읽으면서 체크섬 계산
+    sha256 = hashlib.sha256()
+    data = bytearray()
+    while len(data) < length:
+        piece = stream.read(min(CHUNK_SIZE, length - len(data)))
+        if not piece:
+            break
+        sha256.update(piece)
+        data.extend(piece)
+    if len(data) != length:
+        raise UploadError('조각을 모두 받지 못했습니다.')
+    if checksum and checksum.lower() != sha256.hexdigest():
+        raise UploadError('조각의 체크섬이 일치하지 않습니다.', status=422)
+
+    part_number = offset // session.chunk_size + 1
+    get_attachment_storage().upload_part(session.storage_name, session.storage_upload_id, part_number, bytes(data))
+    recorded = run_serialized(record_chunk, session, offset, length)
+    session.refresh_from_db()
+    if not recorded:
+        if session.status != 'uploading':
+            raise UploadError('이미 완료되었거나 취소된 업로드입니다.', status=409)
+        # 같은 조각을 다른 요청이 먼저 기록한 경우는 성공
+        if session.received < offset + length:
+            raise UploadError('조각 위치가 올바르지 않습니다.', status=409)
+    return session
+
+
+# 받은 위치와 만료 시각 기록 (읽은 뒤 다른 요청이 기록했거나 완료/취소된 업로드면 0)
+def record_chunk(session, offset, length):
+    sessions = UploadSession.objects.filter(id=session.id, status='uploading')
+    values = {'expires_at': new_expires_at(), 'updated_at': timezone.now()}
+    if offset == session.received:
+        return sessions.filter(received=offset).update(received=offset + length, **values)
+    # 이미 받은 조각을 다시 보낸 경우
+    return sessions.filter(received__gte=offset + length).update(**values)
+
+
+# 업로드 완료 요청: 처리 중으로 표시하고 조각 합치기와 해시 계산은 작업(posts.complete_upload)에서 처리
+# (최대 크기의 파일을 요청 중에 읽지 않음, 클라이언트는 상태가 completed가 될 때까지 조회)
+# post: 완료되면 바로 연결할 게시글
+def complete_upload(session, post=None):
+    if session.status in ('processing', 'completed', 'attached'):
+        return session
+    if session.status != 'uploading':
+        raise UploadError('취소된 업로드입니다.', status=409)
+    if session.received != session.size:
+        raise UploadError('아직 받지 못한 조각이 있습니다.', status=409)
+
+    run_serialized(start_processing, session, post)
+    session.refresh_from_db()
+    return session
+
+
+def start_processing(session, post=None):
+    updated = UploadSession.objects.filter(id=session.id, status='uploading', received=session.size).update(
+        status='processing', updated_at=timezone.now(),
+    )
+    if not updated:
+        raise UploadError('취소된 업로드입니다.', status=409)
+    tasks.complete_upload(session, post)
+
+
+# 조각 합치기 (작업에서 호출)
+def assemble(session):
+    part_count = max(1, math.ceil(session.size / session.chunk_size))
+    get_attachment_storage().complete_multipart(session.storage_name, session.storage_upload_id, range(1, part_count + 1))
+
+
+# 합친 파일을 해시 이름으로 이동 (참조 수 1 증가, 작업에서 호출)
+def finish_upload(session, digest, size):
+    storage = get_attachment_storage()
+    try:
+        # 참조 수 증가와 완료 표시를 한 트랜잭션으로 커밋 (attachments_gc는 완료된 업로드를 참조로 셈)
+        # 상태를 조건부로 바꿔서 그 사이 취소된 업로드면 참조 수도 늘리지 않음
+        with transaction.atomic():
+            updated = UploadSession.objects.filter(id=session.id, status='processing').update(
+                digest=digest, status='completed', expires_at=new_expires_at(), updated_at=timezone.now(),
+            )
+            if not updated:
+                return session
+            attachments.add_ref(digest, size, attachments.sniff_stored(session.storage_name))
+        session.refresh_from_db()
+        try:
+            attachments.place_file(session.storage_name, digest)
+        except Exception:
+            run_serialized(cancel_session, session)
+            raise
+    finally:
+        if storage.exists(session.storage_name):
+            storage.delete(session.storage_name)
+    return session
+
+
+# 완료된 업로드를 게시글 첨부 파일로 연결 (기존 첨부 파일은 참조 해제)
+def attach(session, post):
+    if session.status != 'completed':
+        raise UploadError('완료되지 않은 업로드입니다.', status=409)
+
+    with transaction.atomic():
+        # 상태를 조건부로 바꿔서 같은 시각에 만료 처리된 업로드는 연결하지 않음
+        updated = UploadSession.objects.filter(id=session.id, status='completed').update(
+            post=post, status='attached', updated_at=timezone.now(),
+        )
+        if not updated:
+            raise UploadError('만료되었거나 취소된 업로드입니다.', status=409)
+        session.post = post
+        session.status = 'attached'
+
+        tasks.release_attachment(post)
+        post.filename = session.digest
+        post.original_filename = session.filename
+        post.save()
+    return post
+
+
+# 업로드 취소
+def abort_upload(session):
+    if session.status in OPEN_STATUSES:
+        run_serialized(cancel_session, session)
+        session.refresh_from_db()
+    return session
+
+
+# 업로드 중이면 받은 조각 삭제, 완료됐으면 게시글에 연결하지 않은 파일의 참조 해제
+# 상태를 조건부로 바꿔서 동시에 취소/만료/연결된 업로드는 한 번만 처리, 처리했으면 True
+def cancel_session(session, **conditions):
+    now = timezone.now()
+    updated = UploadSession.objects.filter(id=session.id, status=session.status, **conditions).update(
+        status='aborted', updated_at=now,
+    )
+    if not updated:
+        return False
+    if session.status == 'uploading':
+        storage = get_attachment_storage()
+        transaction.on_commit(lambda: storage.abort_multipart(session.storage_name, session.storage_upload_id))
+    else:
+        attachments.release_digest(session.digest)
+    return True
+
+
+# 만료된 업로드 취소 (그 사이 이어 올려서 만료 시각이 늘어난 업로드는 건너뜀)
+def expire_sessions(now=None, batch_size=100):
+    now = now or timezone.now()
+    expired = 0
+    while True:
+        sessions = list(
+            UploadSession.objects.filter(status__in=OPEN_STATUSES, expires_at__lt=now)
+            .order_by('expires_at')[:batch_size]
+        )
+        if not sessions:
+            return expired
+        for session in sessions:
+            expired += run_serialized(cancel_session, session, expires_at__lt=now)
+
+
+# 다음으로 만료될 업로드 시각 (없으면 None)
+def next_expiry():
+    return (
+        UploadSession.objects.filter(status__in=OPEN_STATUSES, expires_at__isnull=False)
+        .order_by('expires_at').values_list('expires_at', flat=True).first()
+    )
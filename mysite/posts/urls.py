@@ -1,13 +1,27 @@
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import async_views, views
 
 app_name = 'posts'
 
-urlpatterns = [
-    path('create/', views.posts_create, name='create'),
-    path('read/<int:post_id>/', views.posts_read, name='read'),
-    path('update/<int:post_id>/', views.posts_update, name='update'),
-    path('delete/<int:post_id>/', views.posts_delete, name='delete'),
-    path('', views.posts_list, name='list'),
-    path('download/<int:post_id>/', views.posts_download, name='download'),
-]
\ No newline at end of file
+
+# 목록/보기/다운로드/미리보기/등록 화면은 handlers 모듈(views 또는 async_views)에서 가져옴
+def patterns(handlers):
+    return [
+        path('create/', handlers.posts_create, name='create'),
+        path('read/<int:post_id>/', handlers.posts_read, name='read'),
+        path('update/<int:post_id>/', views.posts_update, name='update'),
+        path('delete/<int:post_id>/', views.posts_delete, name='delete'),
+        path('', handlers.posts_list, name='list'),
+        path('download/<int:post_id>/', handlers.posts_download, name='download'),
+        path('download/<int:post_id>/<str:digest>/', handlers.posts_download, name='download_digest'),
+        path('thumbnail/<int:post_id>/<str:digest>/<slug:variant>.<slug:fmt>', handlers.posts_thumbnail, name='thumbnail'),
+        path('uploads/', views.uploads_init, name='uploads_init'),
+        path('uploads/<uuid:upload_id>/', views.uploads_detail, name='uploads_detail'),
+        path('uploads/<uuid:upload_id>/chunk/', views.uploads_chunk, name='uploads_chunk'),
+        path('uploads/<uuid:upload_id>/complete/', views.uploads_complete, name='uploads_complete'),
+    ]
+
+
+# ASGI로 실행하면 비동기 화면 사용 (테스트는 posts.tests의 URL 설정으로 두 화면을 모두 확인)
+urlpatterns = patterns(async_views if getattr(settings, 'POSTS_ASYNC_VIEWS', False) else views)
@@ -1,19 +1,118 @@
-import os
-import uuid
-from urllib.parse import quote
+from urllib.parse import urlencode
 
-from django.http import HttpResponse
-from mysite import settings
+import json
+
+from django.http import HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
 from django.contrib import messages
 from django.core.paginator import Paginator
 from django.db.models import Q
 from django.contrib.auth.decorators import login_required
+from django.views.decorators.http import require_http_methods, require_POST
 
-from .models import Posts
+from .models import LIST_FIELDS, Attachment, Posts, UploadSession
+from . import attachments, cache, content, counters, downloads, search, tasks, thumbnails, uploads
+from .writes import run_serialized
 from .forms import PostCreateForm, PostUpdateForm
+from .storage import get_attachment_storage
+from .pagination import PER_PAGE, CachedCountPaginator, CursorPaginator, cached_count, count_cache_key, use_cursor_pagination
+
+# 보기 화면에서 조회하는 컬럼 (목록 컬럼 + 정리된 내용, 첨부 파일)
+READ_FIELDS = LIST_FIELDS + ['content_html', 'filename', 'original_filename']
+# 보기 화면의 미리보기 이미지 정보
+ATTACHMENT_FIELDS = ['id', 'digest', 'variants']
+
+# 검색 조건 쿼리스트링 (커서 링크에 유지)
+def search_query(searchType, searchKeyword):
+    if searchType in [None, ''] or searchKeyword in [None, '']:
+        return ''
+    return '&' + urlencode({'searchType': searchType, 'searchKeyword': searchKeyword})
+
+# 업로드 파일을 쓰기 잠금 밖에서 임시 이름으로 저장 → (임시 이름, 원본 파일명), 파일이 없으면 None
+def stage_upload(request):
+    file = request.FILES.get('uploadFile')
+    if not file:
+        return None
+    return attachments.stage(file), file.name
+
+# 게시글 저장 (첨부 파일 포함, 비동기 화면과 같이 사용)
+# run_serialized로 실행하며 잠금 때문에 실패하면 다시 실행되므로 매번 새 게시글 객체를 만듦
+def create_post(request, form, staged=None):
+    post = Posts(
+        title=form.cleaned_data['title'],
+        content=form.cleaned_data['content'],
+        created_by=request.user,
+        updated_by=request.user,
+    )
+    if staged:
+        post.original_filename = staged[1]
+    post.save()
+    
+    # 파일 업로드 (해시 계산, 저장은 백그라운드 작업에서 처리)
+    upload_session = uploads.completed_session(request.user, request.POST.get('uploadId'))
+    if staged:
+        tasks.store_attachment(post, *staged)
+    
+    # 분할 업로드된 파일 연결
+    elif upload_session:
+        uploads.attach(upload_session, post)
+    return post
+
+# 게시글 수정 (run_serialized로 실행, 잠금을 잡은 뒤 게시글을 다시 조회)
+def update_post(request, post_id, form, staged=None):
+    post = get_object_or_404(Posts, id=post_id)
+    post.title = form.cleaned_data['title']
+    post.content = form.cleaned_data['content']
+    post.updated_by = request.user
+    post.save()
+    
+    # 파일 삭제
+    if request.POST.get('deleteFile'):
+        if post.filename:
+            tasks.release_attachment(post)
+            post.filename = None
+            post.original_filename = None
+            post.save()
+
+    # 파일 업로드 (새 파일 저장 후 기존 파일 참조 해제는 백그라운드 작업에서 처리)
+    upload_session = uploads.completed_session(request.user, request.POST.get('uploadId'))
+    if staged:
+        tasks.store_attachment(post, *staged)
+    
+    # 분할 업로드된 파일 연결
+    elif upload_session:
+        uploads.attach(upload_session, post)
+    return post
 
-# 게시글 등록
+# 게시글 삭제 (run_serialized로 실행, 첨부 파일은 삭제 후 백그라운드 작업에서 참조 해제)
+def delete_post(post_id):
+    get_object_or_404(Posts, id=post_id).delete()
+
+# 검색 인덱스를 사용할 수 없을 때 LIKE 검색 조건
+def search_filter(posts, searchType, searchKeyword):
+    if searchType == 'all':
+        return posts.filter(
+            Q(title__contains=searchKeyword) | 
+            Q(content__contains=searchKeyword) | 
+            Q(created_by__first_name__contains=searchKeyword)
+        )
+    elif searchType == 'title':
+        return posts.filter(
+            Q(title__contains=searchKeyword)
+        )
+    elif searchType == 'content':
+        return posts.filter(
+            Q(content__contains=searchKeyword)
+        )
+    elif searchType == 'full_name':
+        return posts.filter(
+            Q(created_by__first_name__contains=searchKeyword)
+        )
+    return posts
+
+# 게시글 등록 (검증과 파일 임시 저장은 잠금 밖에서, 데이터베이스 쓰기만 차례로 실행)
 @login_required(login_url='auth:login')
 def posts_create(request):
     form = PostCreateForm()
@@ -22,30 +121,7 @@ def posts_create(request):
         form = PostCreateForm(request.POST)
         
         if form.is_valid():
-            post = form.save(commit=False)
-            post.created_by = request.user
-            post.updated_by = request.user
-            post.save()
-            
-            # 파일 업로드
-            if request.FILES.get('uploadFile'):
-                filename = uuid.uuid4().hex
-                file = request.FILES.get('uploadFile')
-                
-                # 파일 저장 경로
-                file_path = os.path.join(settings.MEDIA_ROOT, 'posts', str(post.id), str(filename))
-                if not os.path.exists(os.path.dirname(file_path)):
-                    os.makedirs(os.path.dirname(file_path))
-                
-                # 파일 저장
-                with open(file_path, 'wb') as f:
-                    for chunk in file.chunks():
-                        f.write(chunk)
-                
-                post.filename = filename
-                post.original_filename = file.name
-                post.save()
-            
+            post = run_serialized(create_post, request, form, stage_upload(request))
             messages.success(request, '게시글이 등록되었습니다.')
             return redirect("posts:read", post_id=post.id)
         else:
@@ -56,8 +132,25 @@ def posts_create(request):
 # 게시글 보기
 @login_required(login_url='auth:login')
 def posts_read(request, post_id):
-    post = get_object_or_404(Posts, id=post_id)
-    return render(request, 'posts/read.html', {'post': post})
+    post = get_object_or_404(Posts.objects.only('id', 'created_by', 'updated_at'), id=post_id)
+    
+    # 게시글 내용은 캐시된 화면 조각 사용 (수정/삭제 버튼은 사용자별로 따로 표시)
+    post_body = cache.get_read_fragment(post.id, post.updated_at)
+    if post_body is None:
+        full_post = Posts.objects.select_related('created_by').only(*READ_FIELDS).get(id=post.id)
+        if full_post.content_html is None:
+            # 정리된 HTML을 계산하기 전 게시글 (manage.py backfill_post_content)
+            full_post.content_html = content.sanitize(Posts.objects.values_list('content', flat=True).get(id=post.id))[0]
+        attachment = None
+        if attachments.is_digest(full_post.filename):
+            attachment = Attachment.objects.only(*ATTACHMENT_FIELDS).filter(digest=full_post.filename).first()
+        post_body = render_to_string('posts/read_body.html', {
+            'post': full_post,
+            'picture': thumbnails.picture(full_post, attachment),
+        })
+        cache.set_read_fragment(post.id, post.updated_at, post_body)
+    
+    return render(request, 'posts/read.html', {'post': post, 'post_body': mark_safe(post_body)})
 
 # 게시글 수정
 @login_required(login_url='auth:login')
@@ -72,48 +165,7 @@ def posts_update(request, post_id):
         form = PostUpdateForm(request.POST)
         
         if form.is_valid():
-            post.title = form.cleaned_data['title']
-            post.content = form.cleaned_data['content']
-            post.updated_by = request.user
-            post.save()
-            
-            # 파일 삭제
-            if request.POST.get('deleteFile'):
-                if post.filename:
-                    # 파일 삭제
-                    file_path = os.path.join(settings.MEDIA_ROOT, 'posts', str(post.id), str(post.filename))    
-                    if os.path.exists(file_path):
-                        os.remove(file_path)
-                    
-                    post.filename = None
-                    post.original_filename = None
-                    post.save()
-
-            # 파일 업로드
-            if request.FILES.get('uploadFile'):
-                if post.filename:
-                    # 파일 삭제
-                    file_path = os.path.join(settings.MEDIA_ROOT, 'posts', str(post.id), str(post.filename))    
-                    if os.path.exists(file_path):
-                        os.remove(file_path)
-                    
-                filename = uuid.uuid4().hex
-                file = request.FILES.get('uploadFile')
-                
-                # 파일 저장 경로
-                file_path = os.path.join(settings.MEDIA_ROOT, 'posts', str(post.id), str(filename))
-                if not os.path.exists(os.path.dirname(file_path)):
-                    os.makedirs(os.path.dirname(file_path))
-                
-                # 파일 저장
-                with open(file_path, 'wb') as f:
-                    for chunk in file.chunks():
-                        f.write(chunk)
-                        
-                post.filename = filename
-                post.original_filename = file.name
-                post.save()
-                
+            post = run_serialized(update_post, request, post.id, form, stage_upload(request))
             messages.success(request, '게시글이 수정되었습니다.')
             return redirect('posts:read', post_id=post.id)
         else:
@@ -130,13 +182,7 @@ def posts_delete(request, post_id):
         return redirect('posts:read', post_id=post.id)
     
     if request.method == 'POST':
-        # 파일 삭제
-        if post.filename:
-            file_path = os.path.join(settings.MEDIA_ROOT, 'posts', str(post.id), str(post.filename))    
-            if os.path.exists(file_path):
-                os.remove(file_path)
-        
-        post.delete()
+        run_serialized(delete_post, post.id)
         messages.success(request, '게시글이 삭제되었습니다.')
         return redirect('posts:list')
 
@@ -146,33 +192,67 @@ def posts_list(request):
     page = request.GET.get('page', '1') 
     searchType = request.GET.get('searchType')
     searchKeyword = request.GET.get('searchKeyword')
-    posts = Posts.objects.all().order_by('-created_at')
+    posts = Posts.objects.for_listing().order_by('-created_at')
+    count_key = None
     
     # 검색 조건 처리
     if searchType not in [None, ''] and searchKeyword not in [None, '']:
-        if searchType == 'all':
-            posts = posts.filter(
-                Q(title__contains=searchKeyword) | 
-                Q(content__contains=searchKeyword) | 
-                Q(created_by__first_name__contains=searchKeyword)
-            )
-        elif searchType == 'title':
-            posts = posts.filter(
-                Q(title__contains=searchKeyword)
-            )
-        elif searchType == 'content':
-            posts = posts.filter(
-                Q(content__contains=searchKeyword)
-            )
-        elif searchType == 'full_name':
-            posts = posts.filter(
-                Q(created_by__first_name__contains=searchKeyword)
-            )
+        # 전문 검색 인덱스 사용 (검색 순위순 정렬)
+        if search.is_enabled():
+            paginator = Paginator(search.search_results(searchType, searchKeyword, page, PER_PAGE), PER_PAGE)
+            page_obj = paginator.get_page(page)
+            posts = Posts.objects.for_listing().in_bulk(page_obj.object_list)
+            page_obj.object_list = [posts[post_id] for post_id in page_obj.object_list if post_id in posts]
+            
+            # 순번 계산하여 게시글 리스트에 추가
+            start_index = paginator.count - (paginator.per_page * (page_obj.number - 1))
+            for index, post in enumerate(page_obj):
+                post.index_number = start_index - index
+            
+            return render(request, 'posts/list.html', {
+                'posts': page_obj,
+                'searchType': searchType,
+                'searchKeyword': searchKeyword,
+                'search_query': search_query(searchType, searchKeyword),
+            })
+        
+        count_key = count_cache_key('search', searchType, searchKeyword)
+        posts = search_filter(posts, searchType, searchKeyword)
+    
+    # 전체 게시글 수는 카운터, 검색 결과 수는 캐시에서 조회
+    if count_key is None:
+        count_func = counters.get_count
+        row_cache = cache.cached_list_rows
+    else:
+        count_func = lambda: cached_count(posts, count_key)
+        row_cache = None
     
     # 페이지네이션
-    paginator = Paginator(posts, 10)
+    paginator = CachedCountPaginator(posts, PER_PAGE, count_func)
+    
+    # 게시글이 많으면 커서(키셋) 페이지네이션 사용
+    if use_cursor_pagination(request, paginator.count):
+        cursor_paginator = CursorPaginator(posts, PER_PAGE, count_func, count_key or 'posts:count:list', row_cache)
+        if request.GET.get('date'):
+            page_obj = cursor_paginator.get_page_for_date(request.GET.get('date'))
+        else:
+            page_obj = cursor_paginator.get_page(request.GET.get('cursor'))
+        
+        return render(request, 'posts/list.html', {
+            'posts': page_obj,
+            'cursor_mode': True,
+            'searchType': searchType,
+            'searchKeyword': searchKeyword,
+            'date': request.GET.get('date', ''),
+            'search_query': search_query(searchType, searchKeyword),
+        })
+    
     page_obj = paginator.get_page(page)
     
+    # 검색하지 않은 앞쪽 페이지는 캐시된 목록 사용
+    if row_cache and page_obj.number <= cache.LIST_CACHE_PAGES:
+        page_obj.object_list = row_cache(f'page:{PER_PAGE}:{page_obj.number}', lambda: list(page_obj.object_list))
+    
     # 현재 페이지의 첫 번째 게시글 번호 계산
     start_index = paginator.count - (paginator.per_page * (page_obj.number - 1))
     
@@ -183,20 +263,110 @@ def posts_list(request):
     return render(request, 'posts/list.html', {
         'posts': page_obj,
         'searchType': searchType,
-        'searchKeyword': searchKeyword
+        'searchKeyword': searchKeyword,
+        'search_query': search_query(searchType, searchKeyword),
     })
     
 # 첨부 파일 다운로드
 @login_required(login_url='auth:login')
-def posts_download(request, post_id):
-    post = get_object_or_404(Posts, id=post_id)
-    file_path = os.path.join(settings.MEDIA_ROOT, 'posts', str(post.id), str(post.filename))
+def posts_download(request, post_id, digest=None):
+    post = get_object_or_404(Posts.objects.only('id', 'filename', 'original_filename'), id=post_id)
+    if digest is not None and digest != post.filename:
+        return HttpResponse(status=404)
+    
+    storage = get_attachment_storage()
+    name = attachments.attachment_name(post)
+    stat = storage.stat(name) if post.filename else None
+    if stat is not None:
+        etag = f'"{post.filename}"' if attachments.is_digest(post.filename) else None
+        response = downloads.file_response(request, storage, name, post.original_filename, stat, etag=etag)
+        # 해시가 포함된 주소는 내용이 바뀌지 않으므로 계속 캐시
+        if digest is not None:
+            response['Cache-Control'] = 'private, max-age=31536000, immutable'
+        return response
+    
+    return HttpResponse(status=404)
+
+# 첨부 이미지 미리보기 (브라우저에서 바로 표시)
+@login_required(login_url='auth:login')
+def posts_thumbnail(request, post_id, digest, variant, fmt):
+    post = get_object_or_404(Posts.objects.only('id', 'filename'), id=post_id)
+    if digest != post.filename or variant not in thumbnails.SIZES or fmt not in thumbnails.FORMATS:
+        return HttpResponse(status=404)
+    
+    storage = get_attachment_storage()
+    name = attachments.variant_name(digest, variant, fmt)
+    stat = storage.stat(name)
+    if stat is not None:
+        response = downloads.file_response(
+            request, storage, name, f'{variant}.{fmt}', stat, etag=f'"{digest}.{variant}.{fmt}"',
+            content_type=thumbnails.FORMATS[fmt], inline=True,
+        )
+        response['Cache-Control'] = 'private, max-age=31536000, immutable'
+        return response
     
-    if os.path.exists(file_path):
-        with open(file_path, 'rb') as file:
-            response = HttpResponse(file.read(), content_type='application/octet-stream')
-            encoded_filename = quote(post.original_filename)
-            response['Content-Disposition'] = f'attachment; filename*=UTF-8\'\'{encoded_filename}'
-            return response
+    return HttpResponse(status=404)
+
+# 분할 업로드 시작
+@login_required(login_url='auth:login')
+@require_POST
+def uploads_init(request):
+    try:
+        data = json.loads(request.body)
+        session = uploads.init_upload(request.user, data.get('filename'), int(data.get('size')))
+    except (ValueError, TypeError):
+        return JsonResponse({'message': '요청 형식이 올바르지 않습니다.'}, status=400)
+    except uploads.UploadError as e:
+        return JsonResponse({'message': e.message}, status=e.status)
+    
+    return JsonResponse(uploads.session_state(session), status=201)
+
+# 분할 업로드 상태 조회 / 취소
+@login_required(login_url='auth:login')
+@require_http_methods(['GET', 'DELETE'])
+def uploads_detail(request, upload_id):
+    session = get_object_or_404(UploadSession, id=upload_id, created_by=request.user)
+    if request.method == 'DELETE':
+        uploads.abort_upload(session)
+    
+    return JsonResponse(uploads.session_state(session))
+
+# 분할 업로드 조각 저장
+@login_required(login_url='auth:login')
+@require_http_methods(['PUT'])
+def uploads_chunk(request, upload_id):
+    try:
+        offset = int(request.GET.get('offset'))
+        length = int(request.META.get('CONTENT_LENGTH'))
+    except (ValueError, TypeError):
+        return JsonResponse({'message': 'offset과 Content-Length가 필요합니다.'}, status=400)
+    
+    session = get_object_or_404(UploadSession, id=upload_id, created_by=request.user)
+    try:
+        uploads.write_chunk(session, offset, request, length, request.headers.get('X-Chunk-Checksum'))
+    except uploads.UploadError as e:
+        return JsonResponse({'message': e.message, **uploads.session_state(session)}, status=e.status)
+    
+    return JsonResponse(uploads.session_state(session))
+
+# 분할 업로드 완료 (post_id가 있으면 게시글에 바로 연결)
+# 파일 처리는 작업에서 하므로 202(처리 중)를 돌려주고, 클라이언트는 상태 조회로 완료를 확인
+@login_required(login_url='auth:login')
+@require_POST
+def uploads_complete(request, upload_id):
+    session = get_object_or_404(UploadSession, id=upload_id, created_by=request.user)
+    try:
+        data = json.loads(request.body or '{}')
+        post = None
+        if data.get('post_id'):
+            post = get_object_or_404(Posts, id=data.get('post_id'), created_by=request.user)
+        if session.status == 'completed' and post is not None:
+            uploads.attach(session, post)
+        else:
+            uploads.complete_upload(session, post)
+    except ValueError:
+        return JsonResponse({'message': '요청 형식이 올바르지 않습니다.'}, status=400)
+    except uploads.UploadError as e:
+        return JsonResponse({'message': e.message}, status=e.status)
     
-    return HttpResponse(status=404)
\ No newline at end of file
+    return JsonResponse(uploads.session_state(session), status=202 if session.status == 'processing' else 200)
@@ -0,0 +1,50 @@
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import OperationalError, connections, transaction
+
+WRITE_RETRIES = getattr(settings, 'POSTS_WRITE_RETRIES', 5)
+WRITE_RETRY_DELAY = getattr(settings, 'POSTS_WRITE_RETRY_DELAY', 0.05)
+
+# SQLite는 쓰기를 한 번에 하나만 처리하므로 같은 프로세스 안의 쓰기는 차례로 실행
+_write_lock = threading.Lock()
+
+
+# SQLite 결과 코드 (확장 코드는 하위 8비트가 기본 코드: SQLITE_BUSY_SNAPSHOT 등)
+SQLITE_BUSY = 5
+
+
+# 다른 연결이 쓰기 잠금을 잡고 있어서 실패한 경우 (SQLITE_BUSY, "database is locked")
+def is_locked_error(error):
+    code = getattr(error.__cause__, 'sqlite_errorcode', None)
+    if code is not None:
+        return code & 0xff == SQLITE_BUSY
+    return 'database is locked' in str(error).lower()
+
+
+@contextmanager
+def write_lock(using='default'):
+    if connections[using].vendor == 'sqlite':
+        with _write_lock:
+            yield
+    else:
+        yield
+
+
+# 트랜잭션 안에서 실행하고, 잠금 때문에 실패하면 잠시 기다렸다가 다시 실행
+def run_serialized(func, *args, using='default', **kwargs):
+    # 바깥 트랜잭션 안에서는 다시 실행할 수 없으므로 그대로 실행
+    if connections[using].in_atomic_block:
+        return func(*args, **kwargs)
+
+    for attempt in range(WRITE_RETRIES + 1):
+        try:
+            with write_lock(using), transaction.atomic(using=using):
+                return func(*args, **kwargs)
+        except OperationalError as e:
+            if attempt >= WRITE_RETRIES or not is_locked_error(e):
+                raise
+        time.sleep(WRITE_RETRY_DELAY * (2 ** attempt) * random.uniform(0.5, 1.5))
@@ -1 +1,146 @@
-/* 자바스크립트 */
\ No newline at end of file
+/* 자바스크립트 */
+
+// 쿠키 값 조회 (CSRF 토큰)
+function getCookie(name) {
+    var cookies = document.cookie ? document.cookie.split('; ') : [];
+    for (var i = 0; i < cookies.length; i++) {
+        var parts = cookies[i].split('=');
+        if (parts[0] === name) {
+            return decodeURIComponent(parts.slice(1).join('='));
+        }
+    }
+    return null;
+}
+
+// 분할 업로드 (끊겨도 이어서 올리기)
+// <input type="file" data-chunked-upload="/posts/uploads/" data-upload-target="#uploadId" data-upload-progress="#uploadProgress">
+var ChunkedUpload = {
+    maxRetries: 5,
+
+    // 요청 (JSON 응답)
+    request: function(method, url, data, headers) {
+        return $.ajax({
+            url: url,
+            method: method,
+            data: data,
+            processData: false,
+            contentType: data instanceof Blob ? 'application/octet-stream' : 'application/json',
+            headers: $.extend({'X-CSRFToken': getCookie('csrftoken')}, headers || {}),
+            dataType: 'json'
+        });
+    },
+
+    // 조각 SHA-256 (보안 컨텍스트에서만 사용 가능)
+    checksum: async function(blob) {
+        if (!window.crypto || !window.crypto.subtle) {
+            return null;
+        }
+        var buffer = await window.crypto.subtle.digest('SHA-256', await blob.arrayBuffer());
+        return Array.from(new Uint8Array(buffer)).map(function(b) {
+            return b.toString(16).padStart(2, '0');
+        }).join('');
+    },
+
+    storageKey: function(file) {
+        return 'chunked-upload:' + file.name + ':' + file.size + ':' + file.lastModified;
+    },
+
+    // 이전에 끊긴 업로드가 있으면 이어서, 없으면 새로 시작
+    start: async function(baseUrl, file) {
+        var savedId = localStorage.getItem(this.storageKey(file));
+        if (savedId) {
+            try {
+                var state = await this.request('GET', baseUrl + savedId + '/');
+                if (state.status === 'uploading' || state.status === 'processing' || state.status === 'completed') {
+                    return state;
+                }
+            } catch (e) {
+                // 만료되었거나 찾을 수 없는 업로드는 새로 시작
+            }
+        }
+        var created = await this.request('POST', baseUrl, JSON.stringify({filename: file.name, size: file.size}));
+        localStorage.setItem(this.storageKey(file), created.upload_id);
+        return created;
+    },
+
+    upload: async function(baseUrl, file, onProgress) {
+        var state = await this.start(baseUrl, file);
+        var url = baseUrl + state.upload_id + '/';
+        var offset = state.offset;
+        var retries = 0;
+
+        while (state.status === 'uploading' && offset < file.size) {
+            var chunk = file.slice(offset, offset + state.chunk_size);
+            var headers = {};
+            var checksum = await this.checksum(chunk);
+            if (checksum) {
+                headers['X-Chunk-Checksum'] = checksum;
+            }
+            try {
+                var result = await this.request('PUT', url + 'chunk/?offset=' + offset, chunk, headers);
+                offset = result.offset;
+                retries = 0;
+                onProgress(offset, file.size);
+            } catch (xhr) {
+                // 서버가 알려준 위치부터 다시 올리기
+                if (xhr.responseJSON && xhr.responseJSON.offset !== undefined) {
+                    offset = xhr.responseJSON.offset;
+                }
+                if (++retries > this.maxRetries) {
+                    throw xhr;
+                }
+                await new Promise(function(resolve) { setTimeout(resolve, 1000 * retries); });
+            }
+        }
+
+        var completed = state.status === 'uploading' ? await this.request('POST', url + 'complete/', JSON.stringify({})) : state;
+        completed = await this.waitForProcessing(url, completed);
+        localStorage.removeItem(this.storageKey(file));
+        return completed;
+    },
+
+    // 서버가 조각을 합치고 해시를 계산하는 동안(processing) 상태 조회
+    waitForProcessing: async function(url, state) {
+        var delay = 500;
+        while (state.status === 'processing') {
+            await new Promise(function(resolve) { setTimeout(resolve, delay); });
+            delay = Math.min(delay * 2, 5000);
+            state = await this.request('GET', url);
+        }
+        if (state.status !== 'completed' && state.status !== 'attached') {
+            throw new Error('업로드를 처리하지 못했습니다.');
+        }
+        return state;
+    }
+};
+
+$(document).ready(function() {
+    $('input[type=file][data-chunked-upload]').on('change', async function() {
+        var input = this;
+        var file = input.files[0];
+        var $form = $(input).closest('form');
+        var $target = $($(input).data('upload-target'));
+        var $progress = $($(input).data('upload-progress'));
+        $target.val('');
+        if (!file) {
+            return;
+        }
+
+        $form.find('[type=submit]').prop('disabled', true);
+        $progress.removeClass('d-none').find('.progress-bar').css('width', '0%').text('0%');
+        try {
+            var result = await ChunkedUpload.upload($(input).data('chunked-upload'), file, function(loaded, total) {
+                var percent = total ? Math.floor(loaded * 100 / total) : 100;
+                $progress.find('.progress-bar').css('width', percent + '%').text(percent + '%');
+            });
+            // 파일은 이미 올라갔으므로 폼에서는 업로드 ID만 전송
+            $target.val(result.upload_id);
+            $(input).val('');
+            $progress.find('.progress-bar').css('width', '100%').text(file.name + ' 업로드 완료');
+        } catch (e) {
+            $progress.find('.progress-bar').addClass('bg-danger').text('업로드에 실패했습니다. 파일을 다시 선택하면 이어서 올립니다.');
+        } finally {
+            $form.find('[type=submit]').prop('disabled', false);
+        }
+    });
+});